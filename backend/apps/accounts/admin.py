@@ -1,6 +1,10 @@
 from django.contrib import admin
-from .models import Profile
+from .models import Profile, Follow
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
-    list_display = ("user",)
+    list_display = ("user", "followers_count", "following_count")
+
+@admin.register(Follow)
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ("id", "follower", "followee", "created_at")
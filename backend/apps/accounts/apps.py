@@ -0,0 +1,10 @@
+# backend/apps/accounts/apps.py
+from django.apps import AppConfig
+
+
+class AccountsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.accounts"
+
+    def ready(self):
+        import apps.accounts.signals  # noqa
@@ -0,0 +1,71 @@
+# backend/apps/accounts/backends.py
+"""
+Authentication backend that keeps resolved users in process memory.
+
+On every request with a session, AuthenticationMiddleware asks the backend
+for ``get_user(user_id)``, and ModelBackend answers with an ``auth_user``
+SELECT. CachedModelBackend remembers the loaded user for
+AUTH_USER_CACHE_TTL seconds and hands out copies, so a view can't leak
+changes into the next request.
+
+Entries are dropped in apps.accounts.signals when the user is saved or
+deleted (which covers password changes and deactivation) and on logout.
+The next request then reloads the user, and after a password change
+Django's session auth hash check ends the user's other sessions. Other
+worker processes only see a save once their entry expires. The same delay
+applies to ``User.objects.update()``, which sends no signals.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+MAX_ENTRIES = 10000
+
+
+class UserCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return copy.copy(entry[0])
+
+    def set(self, user):
+        expires = time.monotonic() + getattr(settings, "AUTH_USER_CACHE_TTL", 30)
+        with self._lock:
+            self._entries.pop(user.pk, None)
+            if len(self._entries) >= self.max_entries:
+                # insertion order: drop the entry loaded longest ago
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[user.pk] = (copy.copy(user), expires)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+USER_CACHE = UserCache()
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not getattr(settings, "AUTH_USER_CACHE_TTL", 30):
+            return super().get_user(user_id)
+        user = USER_CACHE.get(user_id)
+        if user is None:
+            user = super().get_user(user_id)  # None for unknown and inactive users
+            if user is not None:
+                USER_CACHE.set(user)
+        return user
@@ -5,6 +5,26 @@ class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     bio = models.TextField(blank=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
+    avatar_asset = models.ForeignKey(
+        "images.ImageAsset", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    # denormalized, maintained by FollowAPIView
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"profile:{self.user.username}"
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(User, on_delete=models.CASCADE, related_name="following")
+    followee = models.ForeignKey(User, on_delete=models.CASCADE, related_name="followers")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["follower", "followee"], name="unique_follow"),
+        ]
+
+    def __str__(self):
+        return f"{self.follower_id} -> {self.followee_id}"
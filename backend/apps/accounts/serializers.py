@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from apps.images.serializers import ImageUploadMixin, ImageVariantsField
+from config.sparse import SparseFieldsMixin
 from .models import Profile
 
 class UserSerializer(serializers.ModelSerializer):
@@ -29,8 +31,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         Profile.objects.get_or_create(user=user)
         return user
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsMixin, ImageUploadMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    avatar_variants = ImageVariantsField(source="avatar_asset")
+    image_asset_fields = {"avatar": "avatar_asset"}
+
     class Meta:
         model = Profile
-        fields = ("id", "user", "bio", "avatar")
+        fields = ("id", "user", "bio", "avatar", "avatar_variants", "followers_count", "following_count")
+        read_only_fields = ("followers_count", "following_count")
@@ -0,0 +1,106 @@
+# backend/apps/accounts/signals.py
+"""
+Invalidate cached public profiles and the posts that render their user
+(config/response_cache.py), and the in-process user cache (backends.py),
+when they change.
+"""
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.images.signals import variants_ready
+from apps.posts.models import Comment, Post
+from config.response_cache import bump
+from .backends import USER_CACHE
+from .models import Follow, Profile
+
+
+# rendered with posts: the username everywhere, the names with ?expand=author
+POST_AUTHOR_FIELDS = ("username", "first_name", "last_name")
+
+
+def post_resources(user, commented=False):
+    """The cached post responses that render ``user``, and those they commented on if ``commented``."""
+    post_ids = set(Post.objects.filter(author=user).values_list("pk", flat=True))
+    if commented:
+        post_ids.update(Comment.objects.filter(author=user).values_list("post_id", flat=True))
+    return [("posts",), *[("post", pk) for pk in post_ids]]
+
+
+@receiver(pre_save, sender=User)
+def remember_post_author_fields(sender, instance, update_fields=None, **kwargs):
+    # login saves only last_login
+    if instance.pk is None or (update_fields is not None and not set(update_fields) & set(POST_AUTHOR_FIELDS)):
+        return
+    instance._saved_fields = User.objects.filter(pk=instance.pk).values(*POST_AUTHOR_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    resources = [("profile", instance.username)]
+    old = vars(instance).pop("_saved_fields", None)
+    if old is not None:
+        changed = {field for field in POST_AUTHOR_FIELDS if old[field] != getattr(instance, field)}
+        if "username" in changed:
+            resources.append(("profile", old["username"]))
+        if changed:
+            # comments render the username too
+            resources += post_resources(instance, commented="username" in changed)
+    bump(*resources)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    # again on commit, in case a request cached the old row in between
+    USER_CACHE.discard(instance.pk)
+    transaction.on_commit(lambda: USER_CACHE.discard(instance.pk))
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        USER_CACHE.discard(user.pk)
+
+
+@receiver(pre_save, sender=Profile)
+def remember_avatar(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "avatar_asset" not in update_fields:
+        instance._saved_avatar_asset_id = instance.avatar_asset_id
+    elif instance.pk is None:
+        instance._saved_avatar_asset_id = None
+    else:
+        instance._saved_avatar_asset_id = (
+            Profile.objects.filter(pk=instance.pk).values_list("avatar_asset_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    resources = [("profile", instance.user.username)]
+    old = vars(instance).pop("_saved_avatar_asset_id", None)
+    if old != instance.avatar_asset_id:
+        # the avatar shows on the user's posts with ?expand=author
+        resources += post_resources(instance.user)
+    bump(*resources)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_changed(sender, instance, **kwargs):
+    # both follower/following counters move
+    usernames = User.objects.filter(pk__in=[instance.follower_id, instance.followee_id]).values_list("username", flat=True)
+    bump(*[("profile", name) for name in usernames])
+
+
+@receiver(variants_ready)
+def avatar_ready(sender, asset, **kwargs):
+    profiles = Profile.objects.filter(avatar_asset=asset).select_related("user")
+    resources = [("profile", profile.user.username) for profile in profiles]
+    for profile in profiles:
+        resources += post_resources(profile.user)
+    bump(*dict.fromkeys(resources))
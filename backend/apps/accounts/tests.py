@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+
+from .backends import USER_CACHE
+
+
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        USER_CACHE.clear()
+        caches["sessions"].clear()
+        self.user = User.objects.create_user("alice", password="pw123456")
+        self.client.login(username="alice", password="pw123456")
+        self.client.get("/api/accounts/me/")  # loads the user once
+
+    def test_authenticated_request_needs_no_queries(self):
+        with self.assertNumQueries(0):
+            res = self.client.get("/api/accounts/me/")
+        self.assertEqual(res.json()["username"], "alice")
+
+    def test_password_change_ends_session(self):
+        self.user.set_password("changed123")
+        self.user.save()
+        self.assertEqual(self.client.get("/api/accounts/me/").status_code, 401)
+
+    def test_deactivation_ends_session(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/accounts/me/").status_code, 401)
+
+    def test_logout(self):
+        self.assertEqual(self.client.post("/api/accounts/logout/").status_code, 200)
+        self.assertIsNone(USER_CACHE.get(self.user.pk))
+        self.assertEqual(self.client.get("/api/accounts/me/").status_code, 401)
+
+    def test_cached_user_is_a_copy(self):
+        USER_CACHE.get(self.user.pk).first_name = "Mallory"
+        self.assertEqual(USER_CACHE.get(self.user.pk).first_name, "")
@@ -10,5 +10,6 @@ urlpatterns = [
     path("me/", views.CurrentUserAPIView.as_view(), name="current-user"),
     path("profile/", views.ProfileRetrieveUpdateAPIView.as_view(), name="my-profile"),
     path("debug-session/", views.debug_session, name="debug-session"),
+    path("follow/<str:username>/", views.FollowAPIView.as_view(), name="follow"),
     path("profile/<str:username>/", views.ProfileRetrieveUpdateAPIView.as_view(), name="profile-by-username"),
 ]
@@ -1,6 +1,9 @@
 # backend/apps/accounts/views.py
 import traceback
 from django.contrib.auth import authenticate, login, logout
+from django.db import transaction
+from django.db.models import F
+from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
@@ -12,8 +15,13 @@ from django.http import JsonResponse
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from .serializers import RegisterSerializer, UserSerializer, ProfileSerializer
-from .models import Profile
+from .models import Profile, Follow
 from django.contrib.auth.models import User
+from apps.posts import timeline
+from config.conditional import ConditionalGetMixin
+from config.response_cache import ResponseCacheMixin
+from config.sparse import narrow
+from config.throttling import bucket_throttles
 
 # ---- basic helpers ----
 
@@ -64,6 +72,8 @@ class RegisterAPIView(APIView):
 
 class LoginAPIView(APIView):
     permission_classes = (permissions.AllowAny,)
+    # password guessing is limited per client address
+    throttle_classes = bucket_throttles("login")
 
     def post(self, request):
         username = request.data.get("username")
@@ -118,7 +128,7 @@ def current_profile(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProfileRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
+class ProfileRetrieveUpdateAPIView(ResponseCacheMixin, ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """
     Retrieve/update a profile by username (or current user's profile if no username).
     This view returns 404 if a username is provided and profile does not exist.
@@ -132,7 +142,8 @@ class ProfileRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
         if username:
             # If a username is provided, try to fetch that profile (404 if not found)
             try:
-                return Profile.objects.get(user__username=username)
+                profiles = Profile.objects.select_related("user", "avatar_asset")
+                return narrow(profiles, self.get_serializer()).get(user__username=username)
             except Profile.DoesNotExist:
                 from django.http import Http404
                 raise Http404("Profile not found")
@@ -140,6 +151,69 @@ class ProfileRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
         profile, _ = Profile.objects.get_or_create(user=self.request.user)
         return profile
 
+    def retrieve(self, request, *args, **kwargs):
+        username = kwargs.get("username")
+        if username:
+            # a public profile looks the same to every reader
+            return self.cached_response(
+                request, [("profile", username)], lambda: self.get_serializer(self.get_object()).data
+            )
+        profile = self.get_object()
+        user = profile.user
+        # Profile has no timestamp, and the fields are small enough to fingerprint directly
+        version = (
+            profile.pk, profile.bio, profile.avatar.name, profile.followers_count, profile.following_count,
+            profile.avatar_asset.status if profile.avatar_asset_id else None,
+            user.username, user.email, user.first_name, user.last_name,
+        )
+        return self.not_modified(request, version) or Response(self.get_serializer(profile).data)
+
+
+# ---- follow graph ----
+
+class FollowAPIView(APIView):
+    """
+    GET    /follow/<username>/  -> whether the current user follows them
+    POST   /follow/<username>/  -> follow that user
+    DELETE /follow/<username>/  -> unfollow
+    POST and DELETE are idempotent and keep Profile.followers_count / following_count in sync.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, username):
+        # not part of the public profile, which is cached for every reader
+        other = get_object_or_404(User, username=username)
+        return Response({"following": Follow.objects.filter(follower=request.user, followee=other).exists()})
+
+    def post(self, request, username):
+        other = get_object_or_404(User, username=username)
+        if other.pk == request.user.pk:
+            return Response({"detail": "You cannot follow yourself."}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            _, created = Follow.objects.get_or_create(follower=request.user, followee=other)
+            if created:
+                self._adjust_counts(request.user, other, 1)
+        if created:
+            timeline.on_follow(request.user, other)
+        return Response({"following": True}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    def delete(self, request, username):
+        other = get_object_or_404(User, username=username)
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower=request.user, followee=other).delete()
+            if deleted:
+                self._adjust_counts(request.user, other, -1)
+        if deleted:
+            timeline.on_unfollow(request.user, other)
+        return Response({"following": False})
+
+    @staticmethod
+    def _adjust_counts(follower, followee, delta):
+        Profile.objects.get_or_create(user=follower)
+        Profile.objects.get_or_create(user=followee)
+        Profile.objects.filter(user=follower).update(following_count=F("following_count") + delta)
+        Profile.objects.filter(user=followee).update(followers_count=F("followers_count") + delta)
+
 
 # Optional admin-only stats endpoint (example)
 @api_view(["GET"])
@@ -0,0 +1,7 @@
+# backend/apps/bench/apps.py
+from django.apps import AppConfig
+
+
+class BenchConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.bench"
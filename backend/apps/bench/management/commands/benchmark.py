@@ -0,0 +1,64 @@
+# backend/apps/bench/management/commands/benchmark.py
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.bench.runner import NoDataset, compare as compare_runs, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Request each API endpoint against the seeded dataset and report p50/p95 latency, "
+        "SQL queries and payload size. Results are written as JSON for comparing commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--endpoint", action="append", default=[], dest="only",
+            help="Only endpoints whose name starts with this (repeatable).",
+        )
+        parser.add_argument("--output", help="JSON file to write (default: benchmarks/<time>-<commit>.json).")
+        parser.add_argument("--compare", help="Earlier results file to diff against.")
+
+    def handle(self, *args, iterations, warmup, only, output, compare, **options):
+        if iterations < 1:
+            raise CommandError("--iterations must be at least 1")
+        baseline = None
+        if compare:
+            try:
+                baseline = json.loads(Path(compare).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Can't read {compare}: {exc}")
+        try:
+            results = run(iterations=iterations, warmup=warmup, only=only)
+        except NoDataset as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f"{'endpoint':32} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'bytes':>9}  status")
+        for name, r in results["endpoints"].items():
+            status = ",".join(str(code) for code in r["status"])
+            flag = "  N+1" if r["n_plus_one"] else ""
+            self.stdout.write(
+                f"{name:32} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['queries_p50']:>8g} "
+                f"{r['bytes_p50']:>9g}  {status}{flag}"
+            )
+
+        if baseline is not None:
+            self.stdout.write(f"\nChanges against {baseline.get('meta', {}).get('commit') or compare}:")
+            for name, metric, old, new, change in compare_runs(results, baseline):
+                pct = "n/a" if change is None else f"{change:+.1f}%"
+                self.stdout.write(f"  {name:32} {metric:12} {old:>10g} -> {new:<10g} {pct}")
+
+        path = Path(output) if output else (
+            Path(settings.BASE_DIR) / "benchmarks"
+            / f"{timezone.now():%Y%m%d-%H%M%S}-{results['meta']['commit'] or 'unknown'}.json"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
+
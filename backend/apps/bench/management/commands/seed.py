@@ -0,0 +1,43 @@
+# backend/apps/bench/management/commands/seed.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bench import seeding
+from apps.bench.seeding import DEFAULT_PASSWORD, PREFIX, Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate skewed synthetic users, posts, comments, likes, conversations, messages and "
+        "notifications with bulk inserts. Lower TIMELINE_FANOUT_THRESHOLD below the celebrities' "
+        "follower counts to exercise the fan-out-on-read feed path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--posts", type=int, default=4000)
+        parser.add_argument("--comments", type=int, default=12000)
+        parser.add_argument("--likes", type=int, default=40000, help="Like attempts; duplicates are dropped.")
+        parser.add_argument("--conversations", type=int, default=800, help="1:1 conversations to attempt.")
+        parser.add_argument("--messages", type=int, default=20000)
+        parser.add_argument("--celebrities", type=int, default=5, help="Accounts followed by ~70%% of users.")
+        parser.add_argument("--group-chats", type=int, default=3)
+        parser.add_argument("--days", type=int, default=30, help="Spread timestamps over this many days.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible datasets.")
+        parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of every seeded account.")
+        parser.add_argument("--clear", action="store_true", help=f"Delete existing {PREFIX}* accounts first.")
+
+    def handle(self, *args, clear, **options):
+        if options["users"] < 2:
+            raise CommandError("--users must be at least 2")
+        if clear:
+            deleted = seeding.clear()
+            self.stdout.write(f"Deleted {deleted} rows of earlier seed data.")
+        elif User.objects.filter(username__startswith=PREFIX).exists():
+            raise CommandError(f"{PREFIX}* accounts already exist; pass --clear to replace them.")
+
+        keys = ("users", "posts", "comments", "likes", "conversations", "messages",
+                "celebrities", "group_chats", "days", "seed", "password")
+        counts = Seeder(**{k: options[k] for k in keys}).run()
+        summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary}."))
@@ -0,0 +1,175 @@
+# backend/apps/bench/runner.py
+"""
+Endpoint benchmark over the seeded dataset.
+
+Each endpoint is requested in-process through Django's test ``Client`` (the
+full middleware stack, no network), after a few warm-up requests. For every
+request the runner records wall time, the number of SQL queries on all
+connections (with the same ``execute_wrapper`` recorder the metrics
+middleware uses) and the response size. ``run()`` returns per-endpoint
+p50/p95 latency, query counts and payload bytes plus enough metadata (git
+commit, database vendor, dataset size) to compare two runs.
+
+Paths point at the heavy ends of the dataset: the celebrity with the most
+followers, the most-liked post and the largest group chat.
+"""
+import math
+import statistics
+import subprocess
+import time
+from collections import Counter, namedtuple
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.utils import timezone
+
+from apps.accounts.models import Profile
+from apps.messaging.models import Conversation
+from apps.posts.models import Post
+from config.metrics import QueryRecorder, n_plus_one_threshold
+from .seeding import PREFIX, WORDS, counts
+
+Endpoint = namedtuple("Endpoint", "name method path anonymous", defaults=(False,))
+Fixtures = namedtuple("Fixtures", "reader celebrity viral_post group_chat")
+
+
+class NoDataset(Exception):
+    pass
+
+
+def fixtures():
+    group = (
+        Conversation.objects.filter(direct_key__isnull=True, participants__username__startswith=PREFIX)
+        .annotate(size=Count("participants"))
+        .order_by("-size", "pk")
+        .first()
+    )
+    celebrity = Profile.objects.filter(user__username__startswith=PREFIX).order_by("-followers_count", "pk").first()
+    viral = Post.objects.filter(author__username__startswith=PREFIX).order_by("-likes_count", "pk").first()
+    if not (group and celebrity and viral):
+        raise NoDataset("No seeded data found; run `manage.py seed` first.")
+    # the member of the biggest group with the fullest home feed
+    reader = group.participants.order_by("-profile__following_count", "pk").first()
+    return Fixtures(reader, celebrity.user, viral, group)
+
+
+def endpoints(fx):
+    post = f"/api/posts/{fx.viral_post.pk}/"
+    return [
+        Endpoint("posts.list.anonymous", "GET", "/api/posts/", anonymous=True),
+        Endpoint("posts.list", "GET", "/api/posts/"),
+        Endpoint("posts.by_celebrity", "GET", f"/api/posts/?author={fx.celebrity.pk}"),
+        Endpoint("posts.detail.viral", "GET", post),
+        Endpoint("posts.search", "GET", f"/api/posts/search/?q={WORDS[0]}"),
+        Endpoint("feed", "GET", "/api/feed/"),
+        Endpoint("feed.latest_comments", "GET", "/api/feed/?expand=latest_comments"),
+        Endpoint("comments.viral", "GET", f"/api/comments/?post={fx.viral_post.pk}"),
+        Endpoint("profile.celebrity", "GET", f"/api/accounts/profile/{fx.celebrity.username}/"),
+        Endpoint("notifications", "GET", "/api/messaging/notifications/"),
+        Endpoint("notifications.unread_count", "GET", "/api/messaging/notifications/unread_count/"),
+        Endpoint("conversations", "GET", "/api/messaging/conversations/"),
+        Endpoint("messages.group_chat", "GET", f"/api/messaging/conversations/{fx.group_chat.pk}/messages/"),
+        # writes go last so they can't change what the reads above return
+        Endpoint("posts.like", "PUT", f"{post}like/"),
+    ]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure(client, endpoint):
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(recorder))
+        start = time.perf_counter()
+        response = client.generic(endpoint.method, endpoint.path)
+        elapsed = time.perf_counter() - start
+    return elapsed, recorder, response
+
+
+def summarize(endpoint, samples):
+    seconds = [s for s, _, _ in samples]
+    queries = [r.count for _, r, _ in samples]
+    sizes = [len(resp.content) for _, _, resp in samples]
+    statuses = Counter(resp.status_code for _, _, resp in samples)
+    repeated = {shape for _, r, _ in samples for shape, _ in r.repeated(n_plus_one_threshold())}
+    return {
+        "method": endpoint.method,
+        "path": endpoint.path,
+        "anonymous": endpoint.anonymous,
+        "status": dict(sorted(statuses.items())),
+        "p50_ms": round(statistics.median(seconds) * 1000, 3),
+        "p95_ms": round(percentile(seconds, 95) * 1000, 3),
+        "mean_ms": round(statistics.fmean(seconds) * 1000, 3),
+        "queries_p50": statistics.median(queries),
+        "queries_max": max(queries),
+        "bytes_p50": statistics.median(sizes),
+        "n_plus_one": sorted(repeated),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5, check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(iterations=20, warmup=2, only=()):
+    """Benchmark every endpoint (or those whose name starts with one of ``only``)."""
+    fx = fixtures()
+    # "testserver" is only allowed under the test runner
+    anonymous = Client(HTTP_HOST="localhost")
+    reader = Client(HTTP_HOST="localhost")
+    reader.force_login(fx.reader)
+
+    results = {}
+    for endpoint in endpoints(fx):
+        if only and not endpoint.name.startswith(tuple(only)):
+            continue
+        client = anonymous if endpoint.anonymous else reader
+        for _ in range(warmup):
+            client.generic(endpoint.method, endpoint.path)
+        samples = [measure(client, endpoint) for _ in range(iterations)]
+        results[endpoint.name] = summarize(endpoint, samples)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "iterations": iterations,
+            "warmup": warmup,
+            "reader": fx.reader.username,
+            "dataset": counts(),
+        },
+        "endpoints": results,
+    }
+
+
+def compare(current, baseline):
+    """Rows of (endpoint, metric, baseline, current, change %) for endpoints in both runs."""
+    rows = []
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "queries_p50", "bytes_p50"):
+            old, new = before.get(metric), now[metric]
+            if old is None:
+                continue
+            change = round((new - old) / old * 100, 1) if old else None
+            rows.append((name, metric, old, new, change))
+    return rows
+
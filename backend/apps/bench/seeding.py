@@ -0,0 +1,323 @@
+# backend/apps/bench/seeding.py
+"""
+Synthetic, production-shaped data for local profiling.
+
+Activity is drawn from Zipf-like weights so the tails look like the real
+thing: a handful of celebrity accounts followed by most users, a few viral
+posts that collect most likes and comments, and a few large group chats
+next to many small 1:1 conversations.
+
+Everything is written with ``bulk_create``, so no model signals run. The
+derived state those signals normally maintain is rebuilt at the end:
+post counters, the search index, home timelines, conversation inbox
+summaries and members' read watermarks. Seeded accounts are named
+``seed_*``, which is how ``clear()`` finds them again.
+"""
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Substr
+from django.utils import timezone
+
+from apps.accounts.models import Follow, Profile
+from apps.messaging.models import (
+    Conversation, Message, Notification, NotificationActor, NotificationCounter, Participant,
+)
+from apps.posts.models import Comment, Post
+from apps.posts.search import rebuild_index
+from apps.posts.timeline import rebuild_timeline
+from config.response_cache import bump
+
+PREFIX = "seed_"
+BATCH_SIZE = 1000
+DEFAULT_PASSWORD = "seedpass123"
+
+WORDS = (
+    "coffee morning city music photo travel weekend friends sunset code python django "
+    "react launch release coding design tea team office running marathon training "
+    "mountain hiking beach summer winter snow rain garden dinner recipe pasta pizza "
+    "book reading movie series concert guitar festival football match goal win news "
+    "startup product feedback bug deploy database cache latency review idea question"
+).split()
+
+
+def zipf_weights(n, s=1.1):
+    """Weight of rank ``i`` is 1 / i**s: rank 1 dominates, the tail is long."""
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+WORD_WEIGHTS = zipf_weights(len(WORDS), 0.8)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at / updated_at values we assign."""
+    fields = [
+        f for model in models for f in model._meta.concrete_fields
+        if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+    ]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class Seeder:
+    def __init__(self, users=500, posts=4000, comments=12000, likes=40000, conversations=800,
+                 messages=20000, celebrities=5, group_chats=3, days=30, seed=0, password=DEFAULT_PASSWORD):
+        self.n_users = users
+        self.n_posts = posts
+        self.n_comments = comments
+        self.n_likes = likes
+        self.n_conversations = conversations
+        self.n_messages = messages
+        self.n_celebrities = min(celebrities, users)
+        self.n_group_chats = group_chats
+        self.days = days
+        self.password = password
+        self.rng = random.Random(seed)
+        self.now = timezone.now()
+        self._viral = None
+
+    def text(self, low, high):
+        return " ".join(self.rng.choices(WORDS, weights=WORD_WEIGHTS, k=self.rng.randint(low, high)))
+
+    def moment(self, after=None):
+        """A random time in the seeded window (after ``after`` when given)."""
+        start = after or self.now - timedelta(days=self.days)
+        return start + (self.now - start) * self.rng.random()
+
+    def run(self):
+        with transaction.atomic():
+            users = self.seed_users()
+            self.seed_follows(users)
+            posts = self.seed_posts(users)
+            likes = self.seed_likes(users, posts)
+            comments = self.seed_comments(users, posts)
+            self.seed_notifications(posts, likes, comments)
+            conversations = self.seed_conversations(users)
+            self.seed_messages(conversations)
+            self.rebuild_derived(users, [conv for conv, _ in conversations])
+        return counts()
+
+    def seed_users(self):
+        # hashing is deliberately slow, so every seeded account shares one hash
+        password = make_password(self.password)
+        names = [f"{PREFIX}celeb_{i:02d}" for i in range(1, self.n_celebrities + 1)]
+        names += [f"{PREFIX}{i:05d}" for i in range(1, self.n_users - self.n_celebrities + 1)]
+        return User.objects.bulk_create(
+            [User(username=name, email=f"{name}@example.com", password=password,
+                  date_joined=self.moment()) for name in names],
+            batch_size=BATCH_SIZE,
+        )
+
+    def seed_follows(self, users):
+        ids = [u.pk for u in users]
+        celebs = ids[: self.n_celebrities]
+        # popularity by rank: celebrities first, then a long tail
+        weights = zipf_weights(len(ids), 0.9)
+        pairs = set()
+        for follower in ids:
+            for followee in celebs:
+                if follower != followee and self.rng.random() < 0.7:
+                    pairs.add((follower, followee))
+            for followee in self.rng.choices(ids, weights=weights, k=self.rng.randint(3, 40)):
+                if follower != followee:
+                    pairs.add((follower, followee))
+
+        followers = dict.fromkeys(ids, 0)
+        following = dict.fromkeys(ids, 0)
+        for follower, followee in pairs:
+            following[follower] += 1
+            followers[followee] += 1
+        Profile.objects.bulk_create(
+            [Profile(user_id=uid, bio=self.text(0, 12), followers_count=followers[uid],
+                     following_count=following[uid]) for uid in ids],
+            batch_size=BATCH_SIZE,
+        )
+        Follow.objects.bulk_create(
+            [Follow(follower_id=a, followee_id=b) for a, b in pairs], batch_size=BATCH_SIZE
+        )
+
+    def seed_posts(self, users):
+        # a few prolific accounts write most posts
+        authors = self.rng.choices(users, weights=zipf_weights(len(users), 0.8), k=self.n_posts)
+        posts = []
+        for author in authors:
+            created = self.moment()
+            posts.append(Post(author_id=author.pk, content=self.text(4, 60), created_at=created, updated_at=created))
+        with explicit_timestamps(Post):
+            return Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+
+    def viral_ranking(self, posts):
+        # independent of author and age, and shared by likes and comments
+        if self._viral is None:
+            order = list(posts)
+            self.rng.shuffle(order)
+            self._viral = (order, zipf_weights(len(order), 1.0))
+        return self._viral
+
+    def seed_likes(self, users, posts):
+        order, weights = self.viral_ranking(posts)
+        pairs = set()
+        for post in self.rng.choices(order, weights=weights, k=self.n_likes):
+            pairs.add((post.pk, self.rng.choice(users).pk))
+        Through = Post.likes.through
+        Through.objects.bulk_create(
+            [Through(post_id=post_id, user_id=user_id) for post_id, user_id in pairs],
+            batch_size=BATCH_SIZE, ignore_conflicts=True,
+        )
+        return pairs
+
+    def seed_comments(self, users, posts):
+        order, weights = self.viral_ranking(posts)
+        comments = [
+            Comment(post_id=post.pk, author_id=self.rng.choice(users).pk, content=self.text(2, 30),
+                    created_at=self.moment(after=post.created_at))
+            for post in self.rng.choices(order, weights=weights, k=self.n_comments)
+        ]
+        with explicit_timestamps(Comment):
+            return Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+
+    def seed_notifications(self, posts, likes, comments):
+        """One coalesced row per (post, verb), the shape notify_many() converges to."""
+        owner = {p.pk: p.author_id for p in posts}
+        events = {}
+        for post_id, actor_id in likes:
+            events.setdefault((post_id, Notification.VERB_LIKE), []).append(actor_id)
+        for c in comments:
+            events.setdefault((c.post_id, Notification.VERB_COMMENT), []).append(c.author_id)
+
+        post_type = ContentType.objects.get_for_model(Post)
+        rows, folded = [], []
+        for (post_id, verb), actors in events.items():
+            actors = [a for a in dict.fromkeys(actors) if a != owner[post_id]]
+            if not actors:
+                continue
+            touched = self.moment()
+            rows.append(Notification(
+                user_id=owner[post_id], actor_id=actors[-1], actor_count=len(actors), verb=verb,
+                target_content_type=post_type, target_object_id=post_id,
+                url=f"/posts/{post_id}", read=touched < self.now - timedelta(days=3),
+                created_at=touched, updated_at=touched,
+            ))
+            folded.append(actors)
+        with explicit_timestamps(Notification):
+            Notification.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        NotificationActor.objects.bulk_create(
+            [NotificationActor(notification_id=n.pk, actor_id=a) for n, actors in zip(rows, folded) for a in actors],
+            batch_size=BATCH_SIZE,
+        )
+        unread = Counter(n.user_id for n in rows if not n.read)
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=uid, unread=n) for uid, n in unread.items()],
+            update_conflicts=True, unique_fields=["user"], update_fields=["unread"], batch_size=BATCH_SIZE,
+        )
+
+    def seed_conversations(self, users):
+        """Many 1:1 threads plus ``group_chats`` groups of 10-40% of all users."""
+        ids = [u.pk for u in users]
+        direct = set()
+        for _ in range(self.n_conversations):
+            a, b = self.rng.sample(ids, 2)
+            direct.add((min(a, b), max(a, b)))
+
+        members = [list(pair) for pair in direct]
+        convs = [Conversation(direct_key=f"{a}:{b}") for a, b in direct]
+        for i in range(self.n_group_chats):
+            size = max(3, int(len(ids) * self.rng.uniform(0.1, 0.4)))
+            members.append(self.rng.sample(ids, min(size, len(ids))))
+            convs.append(Conversation(title=f"Group chat {i + 1}"))
+
+        convs = Conversation.objects.bulk_create(convs, batch_size=BATCH_SIZE)
+        Through = Conversation.participants.through
+        Through.objects.bulk_create(
+            [Through(conversation_id=conv.pk, user_id=uid) for conv, people in zip(convs, members) for uid in people],
+            batch_size=BATCH_SIZE,
+        )
+        return list(zip(convs, members))
+
+    def seed_messages(self, conversations):
+        # group chats are the busiest threads, so they take the top Zipf ranks
+        ranked = sorted(conversations, key=lambda pair: -len(pair[1]))
+        picks = self.rng.choices(ranked, weights=zipf_weights(len(ranked), 0.9), k=self.n_messages)
+        picks += ranked  # every conversation gets at least one message
+        messages = [
+            Message(conversation_id=conv.pk, sender_id=self.rng.choice(people), text=self.text(1, 25),
+                    created_at=self.moment())
+            for conv, people in picks
+        ]
+        # ids grow with time, as they do live; read watermarks rely on it
+        messages.sort(key=lambda m: m.created_at)
+        with explicit_timestamps(Message):
+            Message.objects.bulk_create(messages, batch_size=BATCH_SIZE)
+
+    def rebuild_derived(self, users, conversations):
+        """State the skipped signals would have maintained."""
+        call_command("recount_post_counters", stdout=StringIO())
+
+        latest = Message.objects.filter(conversation=OuterRef("pk")).order_by("-created_at", "-id")
+        Conversation.objects.filter(pk__in=[c.pk for c in conversations]).update(
+            last_message=Subquery(latest.values("pk")[:1]),
+            last_message_preview=Substr(Subquery(latest.values("text")[:1]), 1, Conversation.PREVIEW_LENGTH),
+            last_message_at=Subquery(latest.values("created_at")[:1]),
+            updated_at=Subquery(latest.values("created_at")[:1]),
+        )
+        # everyone has read their threads up to a day ago (and their own messages)
+        members = Participant.objects.filter(conversation__in=[c.pk for c in conversations])
+        read = (
+            Message.objects.filter(conversation=OuterRef("conversation_id"))
+            .filter(Q(created_at__lt=self.now - timedelta(days=1)) | Q(sender=OuterRef("user_id")))
+            .order_by("-id").values("pk")[:1]
+        )
+        members.update(last_read_id=Coalesce(Subquery(read), 0))
+        unread = (
+            Message.objects.filter(conversation=OuterRef("conversation_id"), pk__gt=OuterRef("last_read_id"))
+            .exclude(sender=OuterRef("user_id"))
+            .order_by().values("conversation").annotate(n=Count("*")).values("n")
+        )
+        members.update(unread_count=Coalesce(Subquery(unread), 0))
+
+        rebuild_index()
+        for user in users:
+            rebuild_timeline(user)
+        bump(("posts",))
+
+
+def counts():
+    """Row counts of the seeded dataset, by kind."""
+    seeded = User.objects.filter(username__startswith=PREFIX)
+    return {
+        "users": seeded.count(),
+        "follows": Follow.objects.filter(follower__in=seeded).count(),
+        "posts": Post.objects.filter(author__in=seeded).count(),
+        "comments": Comment.objects.filter(author__in=seeded).count(),
+        "likes": Post.likes.through.objects.filter(user__in=seeded).count(),
+        "conversations": Conversation.objects.filter(participants__in=seeded).distinct().count(),
+        "messages": Message.objects.filter(sender__in=seeded).count(),
+        "notifications": Notification.objects.filter(user__in=seeded).count(),
+    }
+
+
+def clear():
+    """Delete every seeded account and everything hanging off it."""
+    seeded = User.objects.filter(username__startswith=PREFIX)
+    with transaction.atomic():
+        Conversation.objects.filter(pk__in=seeded.values("conversations")).delete()
+        deleted, _ = seeded.delete()
+        rebuild_index()
+        bump(("posts",))
+    return deleted
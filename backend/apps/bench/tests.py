@@ -0,0 +1,66 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from apps.accounts.models import Follow, Profile
+from apps.messaging.models import Conversation
+from apps.posts.models import Post, TimelineEntry
+from .runner import compare, percentile, run
+from .seeding import Seeder
+
+
+class SeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Seeder(users=30, posts=120, comments=200, likes=400, conversations=20, messages=150,
+               celebrities=2, group_chats=1, seed=7).run()
+
+    def test_derived_state_matches_rows(self):
+        for post in Post.objects.annotate(n_likes=Count("likes", distinct=True), n_comments=Count("comments", distinct=True)):
+            self.assertEqual((post.likes_count, post.comments_count), (post.n_likes, post.n_comments))
+        for profile in Profile.objects.all():
+            self.assertEqual(profile.followers_count, Follow.objects.filter(followee=profile.user).count())
+        self.assertFalse(Conversation.objects.filter(last_message__isnull=True).exists())
+        self.assertTrue(TimelineEntry.objects.exists())
+
+    def test_skewed(self):
+        top = Profile.objects.order_by("-followers_count").first()
+        self.assertTrue(top.user.username.startswith("seed_celeb_"))
+        counts = list(Post.objects.order_by("-likes_count").values_list("likes_count", flat=True))
+        self.assertGreater(counts[0], 5 * counts[len(counts) // 2])
+
+    def test_search_index_rebuilt(self):
+        res = self.client.get("/api/posts/search/?q=coffee")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.json()["results"])
+
+    def test_refuses_to_seed_twice(self):
+        with self.assertRaises(CommandError):
+            call_command("seed", users=5, stdout=StringIO())
+
+
+class BenchmarkTests(TestCase):
+    def test_percentile(self):
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 50), 3)
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+
+    def test_run_writes_comparable_json(self):
+        Seeder(users=12, posts=40, comments=60, likes=80, conversations=6, messages=40,
+               celebrities=1, group_chats=1).run()
+        results = run(iterations=2, warmup=1)
+        for name, row in results["endpoints"].items():
+            self.assertTrue(all(200 <= code < 300 for code in row["status"]), name)
+        self.assertEqual(results["endpoints"]["posts.list.anonymous"]["queries_p50"], 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "run.json"
+            call_command("benchmark", iterations=1, warmup=0, endpoint=["posts.list"], output=str(out),
+                         stdout=StringIO())
+            saved = json.loads(out.read_text())
+        self.assertEqual(set(saved["endpoints"]), {"posts.list", "posts.list.anonymous"})
+        self.assertTrue(compare(saved, saved))
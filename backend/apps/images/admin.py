@@ -0,0 +1,9 @@
+# backend/apps/images/admin.py
+from django.contrib import admin
+from .models import ImageAsset
+
+@admin.register(ImageAsset)
+class ImageAssetAdmin(admin.ModelAdmin):
+    list_display = ("id", "sha256", "format", "width", "height", "size", "status", "created_at")
+    list_filter = ("status", "format")
+    search_fields = ("sha256",)
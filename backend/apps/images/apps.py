@@ -0,0 +1,7 @@
+# backend/apps/images/apps.py
+from django.apps import AppConfig
+
+
+class ImagesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.images"
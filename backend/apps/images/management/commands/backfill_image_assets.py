@@ -0,0 +1,40 @@
+# backend/apps/images/management/commands/backfill_image_assets.py
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from apps.accounts.models import Profile
+from apps.images.pipeline import ingest
+from apps.posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Run post images and avatars uploaded before the image pipeline through it, in primary-key chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=200)
+
+    def handle(self, *args, chunk_size, **options):
+        for model, field, asset_field in ((Post, "image", "image_asset"), (Profile, "avatar", "avatar_asset")):
+            pending = model.objects.filter(**{f"{asset_field}__isnull": True}).exclude(**{field: ""}).exclude(
+                **{f"{field}__isnull": True}
+            )
+            last_pk = 0
+            done = skipped = 0
+            while True:
+                rows = list(pending.filter(pk__gt=last_pk).order_by("pk").values_list("pk", field)[:chunk_size])
+                if not rows:
+                    break
+                last_pk = rows[-1][0]
+                for pk, name in rows:
+                    try:
+                        with default_storage.open(name, "rb") as fh:
+                            asset = ingest(fh)
+                    except (OSError, ValidationError):
+                        skipped += 1
+                        continue
+                    model.objects.filter(pk=pk).update(**{asset_field: asset})
+                    done += 1
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.verbose_name}: linked {done} images, skipped {skipped} missing or invalid files."
+            ))
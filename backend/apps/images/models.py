@@ -0,0 +1,33 @@
+# backend/apps/images/models.py
+from django.db import models
+
+
+class ImageAsset(models.Model):
+    """
+    One uploaded image, stored once per distinct content (``sha256``), plus the
+    resized derivatives generated for it in the background.
+
+    ``variants`` maps a size name to its renditions once status is READY:
+        {"thumb": {"width": 160, "height": 120, "webp": "images/..", "jpeg": "images/.."}, ...}
+    """
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (READY, "Ready"),
+        (FAILED, "Failed"),
+    ]
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    original = models.ImageField(upload_to="images/originals/", max_length=255)
+    format = models.CharField(max_length=10)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.PositiveBigIntegerField()
+    variants = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"ImageAsset {self.id} {self.sha256[:12]} ({self.status})"
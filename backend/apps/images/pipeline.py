@@ -0,0 +1,137 @@
+# backend/apps/images/pipeline.py
+"""
+Image upload pipeline.
+
+``ingest(file)`` validates an upload, stores it under a content-addressed
+path and returns its ImageAsset. Identical bytes uploaded twice share one
+asset and one stored file. The resized derivatives (VARIANT_SIZES, each as
+WebP plus a JPEG fallback) are built by the "images.derive" job, so the
+upload request only pays for hashing and a single streamed write.
+
+Django's upload handlers spool anything above FILE_UPLOAD_MAX_MEMORY_SIZE
+to a temporary file. Everything here reads the upload in chunks (hashing,
+storage.save) or through Pillow's lazy header parsing, so a large upload is
+never held in memory whole.
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.jobs.queue import enqueue
+from .models import ImageAsset
+from .signals import variants_ready
+
+# longest side, in pixels; never upscaled
+VARIANT_SIZES = {"thumb": 160, "medium": 640, "large": 1280}
+ALLOWED_FORMATS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+RENDITIONS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+
+def max_upload_bytes():
+    return getattr(settings, "IMAGE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+
+
+def max_pixels():
+    return getattr(settings, "IMAGE_MAX_PIXELS", 40_000_000)
+
+
+def inspect(file):
+    """Validate ``file`` as an image upload and return (format, width, height)."""
+    if file.size > max_upload_bytes():
+        raise ValidationError(f"Images must be smaller than {max_upload_bytes() // (1024 * 1024)} MB.")
+    file.seek(0)
+    try:
+        # open() only parses the header; verify() checks the data without decoding pixels
+        with Image.open(file) as img:
+            fmt, (width, height) = img.format, img.size
+            if fmt not in ALLOWED_FORMATS:
+                raise ValidationError("Unsupported image format.")
+            if width * height > max_pixels():
+                raise ValidationError("Image dimensions are too large.")
+            img.verify()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise ValidationError("Upload a valid image.")
+    finally:
+        file.seek(0)
+    return fmt, width, height
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def ingest(file):
+    """Store ``file`` (once per distinct content) and queue its derivatives."""
+    fmt, width, height = inspect(file)
+    sha = content_hash(file)
+    asset = ImageAsset.objects.filter(sha256=sha).first()
+    if asset is not None:
+        return asset
+
+    name = default_storage.save(f"images/originals/{sha[:2]}/{sha}.{ALLOWED_FORMATS[fmt]}", file)
+    try:
+        with transaction.atomic():
+            asset = ImageAsset.objects.create(
+                sha256=sha, original=name, format=fmt, width=width, height=height, size=file.size,
+            )
+    except IntegrityError:
+        # a concurrent upload of the same bytes got there first
+        default_storage.delete(name)
+        return ImageAsset.objects.get(sha256=sha)
+    enqueue("images.derive", {"asset_id": asset.pk})
+    # picks up the variants when JOBS_EAGER rendered them inline
+    asset.refresh_from_db(fields=["variants", "status"])
+    return asset
+
+
+def _flatten(img):
+    """RGB copy of ``img`` for JPEG, with transparency composited onto white."""
+    if img.mode != "RGBA":
+        return img.convert("RGB")
+    background = Image.new("RGB", img.size, (255, 255, 255))
+    background.paste(img, mask=img.getchannel("A"))
+    return background
+
+
+def derive(asset):
+    """Render every variant of ``asset`` and mark it READY."""
+    sha = asset.sha256
+    variants = {}
+    rendered = {}  # box size -> entry, so small originals don't render the same size twice
+    try:
+        with default_storage.open(asset.original.name, "rb") as fh, Image.open(fh) as source:
+            img = ImageOps.exif_transpose(source)
+            has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+            img = img.convert("RGBA" if has_alpha else "RGB")
+            for name, size in VARIANT_SIZES.items():
+                box = min(size, max(img.size))
+                if box not in rendered:
+                    resized = img.copy()
+                    resized.thumbnail((box, box), Image.Resampling.LANCZOS)
+                    entry = {"width": resized.width, "height": resized.height}
+                    for key, fmt, options in RENDITIONS:
+                        out = BytesIO()
+                        (resized if fmt == "WEBP" else _flatten(resized)).save(out, fmt, **options)
+                        path = f"images/variants/{sha[:2]}/{sha}_{box}.{ALLOWED_FORMATS[fmt]}"
+                        entry[key] = default_storage.save(path, ContentFile(out.getvalue()))
+                    rendered[box] = entry
+                variants[name] = rendered[box]
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        # retrying won't help; clients keep using the original
+        ImageAsset.objects.filter(pk=asset.pk).update(status=ImageAsset.FAILED)
+        return
+    ImageAsset.objects.filter(pk=asset.pk).update(variants=variants, status=ImageAsset.READY)
+    variants_ready.send(sender=ImageAsset, asset=asset)
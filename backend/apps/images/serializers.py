@@ -0,0 +1,71 @@
+# backend/apps/images/serializers.py
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from .models import ImageAsset
+from .pipeline import ingest, inspect
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only URLs of an ImageAsset's derivatives:
+        {"thumb": {"width": .., "height": .., "webp": url, "jpeg": url}, "medium": {...}, ...}
+    Empty until the background job has rendered them; null when there is no image.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, asset):
+        if asset.status != ImageAsset.READY:
+            return {}
+        request = self.context.get("request")
+
+        def url(name):
+            value = default_storage.url(name)
+            return request.build_absolute_uri(value) if request is not None else value
+
+        return {
+            size: {"width": entry["width"], "height": entry["height"], "webp": url(entry["webp"]), "jpeg": url(entry["jpeg"])}
+            for size, entry in asset.variants.items()
+        }
+
+
+class ImageUploadMixin:
+    """
+    ModelSerializer mixin routing uploads through apps.images.pipeline.
+    ``image_asset_fields`` maps each image field to the ImageAsset FK that
+    records it, e.g. {"image": "image_asset"}.
+    """
+    image_asset_fields = {}
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        for field in self.image_asset_fields:
+            if attrs.get(field):
+                try:
+                    inspect(attrs[field])
+                except DjangoValidationError as exc:
+                    raise serializers.ValidationError({field: exc.messages})
+        return attrs
+
+    def _ingest_images(self, validated_data):
+        for field, asset_field in self.image_asset_fields.items():
+            if field not in validated_data:
+                continue
+            if validated_data[field]:
+                asset = ingest(validated_data[field])
+                # point the file field at the deduplicated copy instead of saving the upload again
+                validated_data[field] = asset.original.name
+                validated_data[asset_field] = asset
+            else:
+                validated_data[asset_field] = None
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self._ingest_images(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self._ingest_images(validated_data))
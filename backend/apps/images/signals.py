@@ -0,0 +1,5 @@
+# backend/apps/images/signals.py
+from django.dispatch import Signal
+
+# sent with asset=<ImageAsset> once its variants are stored and it is READY
+variants_ready = Signal()
@@ -0,0 +1,11 @@
+# backend/apps/images/tasks.py
+from apps.jobs.queue import task
+from .models import ImageAsset
+from .pipeline import derive
+
+
+@task("images.derive")
+def derive_variants(payload):
+    asset = ImageAsset.objects.filter(pk=payload["asset_id"]).first()
+    if asset is not None and asset.status == ImageAsset.PENDING:
+        derive(asset)
@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.posts.models import Post
+from .models import ImageAsset
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def png(width=2000, height=1000, color=(200, 30, 30)):
+    out = BytesIO()
+    Image.new("RGB", (width, height), color).save(out, "PNG")
+    return SimpleUploadedFile("photo.png", out.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, JOBS_EAGER=True)
+class ImagePipelineTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = User.objects.create_user("author", password="pw123456")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, image, content="hi"):
+        return self.client.post("/api/posts/", {"content": content, "image": image}, format="multipart")
+
+    def test_variants_are_generated_and_exposed(self):
+        res = self.upload(png())
+        self.assertEqual(res.status_code, 201)
+        variants = res.data["image_variants"]
+        self.assertEqual(set(variants), {"thumb", "medium", "large"})
+        self.assertEqual((variants["thumb"]["width"], variants["thumb"]["height"]), (160, 80))
+        self.assertEqual(variants["large"]["width"], 1280)
+        self.assertTrue(variants["medium"]["webp"].endswith(".webp"))
+
+        asset = ImageAsset.objects.get()
+        webp = asset.variants["medium"]["webp"]
+        self.assertLess(default_storage.size(webp), asset.size)
+        with default_storage.open(webp) as fh, Image.open(fh) as img:
+            self.assertEqual((img.format, img.width), ("WEBP", 640))
+
+    def test_identical_uploads_share_one_asset(self):
+        first = self.upload(png(300, 300))
+        second = self.upload(png(300, 300), content="again")
+        self.assertEqual(ImageAsset.objects.count(), 1)
+        self.assertEqual(first.data["image"], second.data["image"])
+        # smaller than every box: rendered once at the original size, never upscaled
+        variants = ImageAsset.objects.get().variants
+        self.assertEqual(variants["medium"], variants["large"])
+        self.assertEqual(variants["large"]["width"], 300)
+
+    def test_rejects_non_images_and_oversized_uploads(self):
+        fake = SimpleUploadedFile("evil.png", b"not an image", content_type="image/png")
+        self.assertEqual(self.upload(fake).status_code, 400)
+        with self.settings(IMAGE_MAX_PIXELS=100):
+            res = self.upload(png(20, 20))
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(ImageAsset.objects.exists())
+
+    def test_avatar_upload(self):
+        res = self.client.patch("/api/accounts/profile/", {"avatar": png(400, 400)}, format="multipart")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(res.data["avatar_variants"]["thumb"]["width"], 160)
+
+    def test_pending_variants_fall_back_to_original(self):
+        with self.settings(JOBS_EAGER=False):
+            res = self.upload(png(50, 50))
+        self.assertEqual(res.data["image_variants"], {})
+        self.assertTrue(res.data["image"])
+        self.client.force_authenticate(None)
+        with self.assertNumQueries(1):
+            self.client.get("/api/posts/")
@@ -0,0 +1,14 @@
+# backend/apps/jobs/admin.py
+from django.contrib import admin
+from django.utils import timezone
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after", "created_at")
+    list_filter = ("status", "name")
+    actions = ["retry"]
+
+    @admin.action(description="Re-queue selected jobs")
+    def retry(self, request, queryset):
+        queryset.update(status=Job.PENDING, attempts=0, run_after=timezone.now(), locked_at=None)
@@ -0,0 +1,12 @@
+# backend/apps/jobs/apps.py
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.jobs"
+
+    def ready(self):
+        # register @task handlers declared in each app's tasks.py
+        autodiscover_modules("tasks")
@@ -0,0 +1,32 @@
+# backend/apps/jobs/management/commands/run_workers.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import requeue_stale, run_batch
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs (notifications, timeline fan-out, ...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to idle when the queue is empty.")
+        parser.add_argument("--stale-after", type=int, default=300, help="Requeue jobs locked longer than this.")
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit.")
+
+    def handle(self, *args, batch_size, sleep, stale_after, once, **options):
+        self.stdout.write("Worker started")
+        try:
+            while True:
+                requeue_stale(stale_after)
+                processed = run_batch(batch_size)
+                if processed:
+                    self.stdout.write(f"processed {processed} jobs")
+                    continue
+                if once:
+                    break
+                time.sleep(sleep)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write("Worker stopped")
@@ -0,0 +1,33 @@
+# backend/apps/jobs/models.py
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DEAD = "dead"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DEAD, "Dead letter"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_ready"),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} {self.name} ({self.status})"
@@ -0,0 +1,161 @@
+# backend/apps/jobs/queue.py
+"""
+Minimal DB-backed job queue.
+
+    @task("messaging.notify", batch=True)
+    def deliver(payloads): ...
+
+    enqueue("messaging.notify", {...})
+
+Jobs are rows in the Job table, written in the caller's transaction so they
+only become visible once the request commits. ``manage.py run_workers``
+claims ready jobs, runs them (batch tasks get every claimed payload in one
+call), deletes them on success and retries failures with exponential
+backoff until ``max_attempts``, after which the row is kept as a dead letter.
+When a batch call raises, its payloads are re-run one at a time so only
+the ones that fail again are retried.
+
+With ``JOBS_EAGER = True`` enqueue() runs the handler inline instead; tests
+use this so side effects are visible immediately.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class Task:
+    def __init__(self, name, func, batch, max_attempts):
+        self.name = name
+        self.func = func
+        self.batch = batch
+        self.max_attempts = max_attempts
+
+    def run(self, payloads):
+        if self.batch:
+            self.func(payloads)
+        else:
+            for payload in payloads:
+                self.func(payload)
+
+
+def task(name, batch=False, max_attempts=5):
+    """Register ``func`` as the handler for jobs called ``name``."""
+    def decorator(func):
+        _registry[name] = Task(name, func, batch, max_attempts)
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"No job handler registered for '{name}'")
+
+
+def enqueue(name, payload, delay=0):
+    """Queue ``payload`` (JSON-serializable) for the ``name`` handler."""
+    t = get_task(name)
+    if getattr(settings, "JOBS_EAGER", False):
+        t.run([payload])
+        return None
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=t.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(2 ** attempts, 3600))
+
+
+def requeue_stale(timeout):
+    """Return jobs whose worker died mid-run (locked longer than ``timeout`` seconds) to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).update(status=Job.PENDING)
+
+
+def claim(limit):
+    """Atomically mark up to ``limit`` ready jobs as running and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.PENDING, run_after__lte=now)
+            .order_by("id")[:limit]
+        )
+        if jobs:
+            Job.objects.filter(pk__in=[j.pk for j in jobs]).update(
+                status=Job.RUNNING, locked_at=now, attempts=F("attempts") + 1
+            )
+    for job in jobs:
+        job.attempts += 1
+    return jobs
+
+
+def run_batch(limit=100):
+    """Claim and run one batch of jobs. Returns the number of jobs processed."""
+    jobs = claim(limit)
+    by_name = {}
+    for job in jobs:
+        by_name.setdefault(job.name, []).append(job)
+
+    for name, group in by_name.items():
+        try:
+            t = get_task(name)
+            with transaction.atomic():
+                t.run([job.payload for job in group])
+        except LookupError:
+            logger.warning("No handler for %d '%s' jobs", len(group), name)
+            _fail(group, traceback.format_exc())
+        except Exception:
+            logger.warning("Job batch %s failed (%d jobs)", name, len(group), exc_info=True)
+            if len(group) == 1:
+                _fail(group, traceback.format_exc())
+            else:
+                _run_each(t, group)
+        else:
+            Job.objects.filter(pk__in=[job.pk for job in group]).delete()
+    return len(jobs)
+
+
+def _run_each(t, jobs):
+    """Run a failed batch's payloads one by one; only those that raise again count as failed."""
+    done = []
+    for job in jobs:
+        try:
+            with transaction.atomic():
+                t.run([job.payload])
+        except Exception:
+            logger.warning("Job %s #%d failed", t.name, job.pk, exc_info=True)
+            _fail([job], traceback.format_exc())
+        else:
+            done.append(job.pk)
+    Job.objects.filter(pk__in=done).delete()
+
+
+def _fail(jobs, error):
+    now = timezone.now()
+    for job in jobs:
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(status=Job.DEAD, last_error=error, locked_at=None)
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.PENDING,
+                last_error=error,
+                locked_at=None,
+                run_after=now + backoff(job.attempts),
+            )
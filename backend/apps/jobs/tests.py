@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.messaging.models import Notification
+from apps.posts.models import Post
+from .models import Job
+from .queue import enqueue, run_batch, task
+
+calls = []
+
+
+@task("tests.flaky", max_attempts=2)
+def flaky(payload):
+    calls.append(payload)
+    raise RuntimeError("boom")
+
+
+@task("tests.picky", batch=True)
+def picky(payloads):
+    calls.append(len(payloads))
+    if any(p.get("bad") for p in payloads):
+        raise RuntimeError("bad payload")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_like_only_enqueues_then_worker_delivers(self):
+        author = User.objects.create_user("author", password="pw123456")
+        fans = [User.objects.create_user(f"fan{i}", password="pw123456") for i in range(3)]
+        post = Post.objects.create(author=author, content="hi")
+        for fan in fans:
+            client = APIClient()
+            client.force_authenticate(fan)
+            client.post(f"/api/posts/{post.pk}/like/")
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(Job.objects.filter(name="messaging.notify").count(), 3)
+
+        run_batch()
+        n = Notification.objects.get(user=author)
+        self.assertEqual(n.actor_count, 3)
+        self.assertFalse(Job.objects.filter(name="messaging.notify").exists())
+
+    def test_failures_retry_then_dead_letter(self):
+        job = enqueue("tests.flaky", {"x": 1})
+        with self.assertLogs("apps.jobs.queue", "WARNING"):
+            run_batch()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertIn("boom", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_at)  # skip the backoff
+        with self.assertLogs("apps.jobs.queue", "WARNING"):
+            run_batch()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.DEAD, 2))
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_batch_only_retries_the_bad_payload(self):
+        enqueue("tests.picky", {"n": 1})
+        bad = enqueue("tests.picky", {"bad": True})
+        enqueue("tests.picky", {"n": 2})
+        with self.assertLogs("apps.jobs.queue", "WARNING"):
+            run_batch()
+        self.assertEqual(calls, [3, 1, 1, 1])
+        self.assertEqual(list(Job.objects.values_list("pk", "status")), [(bad.pk, Job.PENDING)])
+        self.assertIn("bad payload", Job.objects.get().last_error)
@@ -1,17 +1,27 @@
 # backend/apps/messaging/admin.py
 from django.contrib import admin
-from .models import Conversation, Message, Notification
+from .models import ArchivedMessage, Conversation, Message, Notification, Participant
+
+class ParticipantInline(admin.TabularInline):
+    model = Participant
+    raw_id_fields = ("user",)
+    readonly_fields = ("last_read_id", "unread_count")
+    extra = 0
 
 @admin.register(Conversation)
 class ConversationAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "created_at", "updated_at")
-    filter_horizontal = ("participants",)
+    inlines = (ParticipantInline,)
 
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ("id", "conversation", "sender", "created_at")
 
+@admin.register(ArchivedMessage)
+class ArchivedMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "conversation", "sender", "created_at", "archived_at")
+
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "text", "read", "created_at")
+    list_display = ("id", "user", "verb", "actor_count", "read", "updated_at")
     list_filter = ("read",)
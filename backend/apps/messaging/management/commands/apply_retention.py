@@ -0,0 +1,34 @@
+# backend/apps/messaging/management/commands/apply_retention.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.messaging import retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete read notifications older than NOTIFICATION_RETENTION_DAYS and archive messages "
+        "older than MESSAGE_ARCHIVE_DAYS, in small batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.RETENTION_BATCH_SIZE)
+        parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches.")
+        parser.add_argument("--only", choices=("notifications", "messages"))
+        parser.add_argument("--dry-run", action="store_true", help="Count what would be removed without writing.")
+
+    def handle(self, *args, batch_size, pause, only, dry_run, **options):
+        if only != "messages":
+            if dry_run:
+                n = retention.expired_notifications().count()
+                self.stdout.write(f"Notifications: {n} read rows past retention.")
+            else:
+                n = retention.prune_notifications(batch_size, pause)
+                self.stdout.write(self.style.SUCCESS(f"Notifications: deleted {n}."))
+        if only != "notifications":
+            if dry_run:
+                n = retention.archivable_messages().count()
+                self.stdout.write(f"Messages: {n} rows to archive.")
+            else:
+                n = retention.archive_messages(batch_size, pause)
+                self.stdout.write(self.style.SUCCESS(f"Messages: archived {n}."))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_created_at(apps, schema_editor):
+    Notification = apps.get_model("messaging", "Notification")
+    Notification.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('messaging', '0002_message_is_read'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='notification',
+            options={'ordering': ['-updated_at']},
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='actor_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='target_content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='target_object_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='verb',
+            field=models.CharField(blank=True, choices=[('like', 'liked'), ('comment', 'commented on')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='text',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'verb', 'target_content_type', 'target_object_id'], name='notification_coalesce'),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
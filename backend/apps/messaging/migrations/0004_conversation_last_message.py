@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_last_message(apps, schema_editor):
+    Conversation = apps.get_model("messaging", "Conversation")
+    Message = apps.get_model("messaging", "Message")
+    for conv in Conversation.objects.iterator(chunk_size=500):
+        msg = Message.objects.filter(conversation_id=conv.pk).order_by("-created_at", "-id").first()
+        if msg is None:
+            continue
+        Conversation.objects.filter(pk=conv.pk).update(
+            last_message=msg,
+            last_message_preview=msg.text[:140],
+            last_message_at=msg.created_at,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_structured_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messaging.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_preview',
+            field=models.CharField(blank=True, max_length=140),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
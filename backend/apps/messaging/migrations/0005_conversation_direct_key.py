@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+def backfill_direct_keys(apps, schema_editor):
+    """
+    Key every untitled two-person conversation. If earlier races left
+    duplicates for the same pair, only the oldest gets the key.
+    """
+    Conversation = apps.get_model("messaging", "Conversation")
+    Through = Conversation.participants.through
+    seen = set()
+    pairs = {}
+    rows = Through.objects.order_by("conversation_id", "user_id").values_list("conversation_id", "user_id")
+    for conv_id, user_id in rows.iterator(chunk_size=2000):
+        pairs.setdefault(conv_id, []).append(user_id)
+
+    titled = set(
+        Conversation.objects.exclude(title__isnull=True).exclude(title="").values_list("pk", flat=True)
+    )
+    for conv_id in sorted(pairs):
+        users = pairs[conv_id]
+        if len(users) != 2 or conv_id in titled:
+            continue
+        key = f"{users[0]}:{users[1]}"
+        if key in seen:
+            continue
+        seen.add(key)
+        Conversation.objects.filter(pk=conv_id).update(direct_key=key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0004_conversation_last_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='direct_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_direct_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_watermarks(apps, schema_editor):
+    """Read up to the last message that was flagged read or written by the member."""
+    Participant = apps.get_model("messaging", "Participant")
+    Message = apps.get_model("messaging", "Message")
+    last_read = (
+        Message.objects.filter(conversation_id=OuterRef("conversation_id"))
+        .filter(Q(is_read=True) | Q(sender_id=OuterRef("user_id")))
+        .order_by("-id").values("id")[:1]
+    )
+    Participant.objects.update(last_read_id=Coalesce(Subquery(last_read), 0))
+    unread = (
+        Message.objects.filter(conversation_id=OuterRef("conversation_id"), id__gt=OuterRef("last_read_id"))
+        .exclude(sender_id=OuterRef("user_id"))
+        .order_by().values("conversation_id").annotate(n=Count("*")).values("n")
+    )
+    Participant.objects.update(unread_count=Coalesce(Subquery(unread), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messaging", "0007_retention"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # adopt the implicit many-to-many table as an explicit through model
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="Participant",
+                    fields=[
+                        ("id", models.AutoField(primary_key=True, serialize=False)),
+                        ("conversation", models.ForeignKey(
+                            on_delete=django.db.models.deletion.CASCADE, related_name="members",
+                            to="messaging.conversation",
+                        )),
+                        ("user", models.ForeignKey(
+                            on_delete=django.db.models.deletion.CASCADE, related_name="conversation_memberships",
+                            to=settings.AUTH_USER_MODEL,
+                        )),
+                    ],
+                    options={
+                        "db_table": "messaging_conversation_participants",
+                        "unique_together": {("conversation", "user")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="conversation",
+                    name="participants",
+                    field=models.ManyToManyField(
+                        related_name="conversations", through="messaging.Participant", to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            database_operations=[],
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="last_read_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="unread_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="participant",
+            name="read_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_watermarks, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="message",
+            name="is_read",
+        ),
+        migrations.RemoveField(
+            model_name="archivedmessage",
+            name="is_read",
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_actors(apps, schema_editor):
+    # only the latest actor of existing rows is known; later likes from others still add up
+    Notification = apps.get_model("messaging", "Notification")
+    NotificationActor = apps.get_model("messaging", "NotificationActor")
+    rows = Notification.objects.filter(actor__isnull=False).values_list("pk", "actor_id").iterator()
+    NotificationActor.objects.bulk_create(
+        (NotificationActor(notification_id=pk, actor_id=actor_id) for pk, actor_id in rows),
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0008_participant_read_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationActor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actors', to='messaging.notification')),
+            ],
+            options={
+                'unique_together': {('notification', 'actor')},
+            },
+        ),
+        migrations.RunPython(backfill_actors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Notification = apps.get_model("messaging", "Notification")
+    NotificationCounter = apps.get_model("messaging", "NotificationCounter")
+    counts = Notification.objects.filter(read=False).values("user_id").annotate(n=Count("*")).order_by()
+    NotificationCounter.objects.bulk_create(
+        (NotificationCounter(user_id=row["user_id"], unread=row["n"]) for row in counts.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('messaging', '0009_notification_actor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,105 @@
 # backend/apps/messaging/models.py
-from django.db import models
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.conf import settings
+from django.utils import timezone
 
 User = settings.AUTH_USER_MODEL
 
+
+def _adjust_unread(deltas):
+    """Add ``{user_id: delta}`` to the users' unread counters: one UPDATE per distinct delta."""
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        NotificationCounter.objects.filter(user_id__in=user_ids).update(unread=Greatest(F("unread") + delta, 0))
+
 class Conversation(models.Model):
     title = models.CharField(max_length=150, blank=True, null=True)
-    participants = models.ManyToManyField(User, related_name="conversations")
+    participants = models.ManyToManyField(User, related_name="conversations", through="Participant")
+    # "<low user id>:<high user id>" for 1:1 conversations, NULL for groups
+    direct_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+    # denormalized inbox summary, written by send_message
+    last_message = models.ForeignKey(
+        "Message", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    last_message_preview = models.CharField(max_length=140, blank=True)
+    last_message_at = models.DateTimeField(blank=True, null=True)
+    # when apply_retention last moved messages of this thread to ArchivedMessage
+    archived_at = models.DateTimeField(blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    PREVIEW_LENGTH = 140
+
+    @staticmethod
+    def direct_key_for(user_a, user_b):
+        low, high = sorted((user_a.pk, user_b.pk))
+        return f"{low}:{high}"
+
+    @classmethod
+    def get_or_create_direct(cls, user_a, user_b):
+        """
+        The 1:1 conversation between two users: one indexed lookup, and a
+        race-safe create guarded by the unique direct_key.
+        """
+        key = cls.direct_key_for(user_a, user_b)
+        try:
+            return cls.objects.get(direct_key=key), False
+        except cls.DoesNotExist:
+            pass
+        try:
+            with transaction.atomic():
+                conv = cls.objects.create(direct_key=key)
+                conv.participants.add(user_a, user_b)
+            return conv, True
+        except IntegrityError:
+            # a concurrent request created it first
+            return cls.objects.get(direct_key=key), False
+
+    def record_message(self, message):
+        """
+        Point the inbox summary at ``message`` (also bumps updated_at), and
+        count it as unread for everyone but the sender, whose watermark
+        moves past it. One UPDATE for the conversation and one for all its
+        members.
+
+        The summary only ever moves forward: when two sends commit out of
+        order, the UPDATE matches no row for the older message and the
+        newer one stays the conversation's last_message.
+        """
+        now = timezone.now()
+        moved = Conversation.objects.filter(
+            models.Q(last_message__isnull=True) | models.Q(last_message_id__lt=message.pk), pk=self.pk,
+        ).update(
+            last_message=message,
+            last_message_preview=message.text[: self.PREVIEW_LENGTH],
+            last_message_at=message.created_at,
+            updated_at=now,
+        )
+        if moved:
+            self.last_message = message
+            self.last_message_preview = message.text[: self.PREVIEW_LENGTH]
+            self.last_message_at = message.created_at
+            self.updated_at = now
+        is_sender = models.Q(user_id=message.sender_id)
+        Participant.objects.filter(conversation_id=self.pk).update(
+            last_read_id=models.Case(
+                models.When(is_sender, then=Greatest(F("last_read_id"), message.pk)),
+                default=F("last_read_id"), output_field=models.BigIntegerField(),
+            ),
+            unread_count=models.Case(models.When(is_sender, then=0), default=F("unread_count") + 1),
+            read_at=models.Case(models.When(is_sender, then=models.Value(now)), default=F("read_at")),
+        )
+
     def other_for(self, user):
         return self.participants.exclude(pk=user.pk).first()
 
@@ -18,30 +108,300 @@ class Conversation(models.Model):
         return f"Conversation ({names})"
 
 
+class ParticipantManager(models.Manager):
+    def mark_read(self, conversation_id, user_id, message_id=None):
+        """
+        Move the member's read watermark up to ``message_id`` (default: the
+        latest message). It never moves backwards. Returns the number of
+        messages still unread, or None if the user isn't a member.
+
+        Reading up to the latest message is a single-row UPDATE. The
+        conversation row is locked first, so a concurrent send is counted
+        either before the watermark moves or after it, never lost.
+        """
+        member = self.filter(conversation_id=conversation_id, user_id=user_id)
+        with transaction.atomic():
+            latest = (
+                Conversation.objects.select_for_update().filter(pk=conversation_id)
+                .values_list("last_message_id", flat=True).first()
+            )
+            if latest is not None:
+                if message_id is None or message_id >= latest:
+                    message_id, unread = latest, 0
+                else:
+                    unread = (
+                        Message.objects.filter(conversation_id=conversation_id, pk__gt=message_id)
+                        .exclude(sender_id=user_id).count()
+                    )
+                if member.filter(last_read_id__lt=message_id).update(
+                    last_read_id=message_id, unread_count=unread, read_at=timezone.now(),
+                ):
+                    return unread
+            try:
+                return member.values_list("unread_count", flat=True).get()
+            except Participant.DoesNotExist:
+                return None
+
+
+class Participant(models.Model):
+    """
+    Membership of a conversation, with the member's read state: every
+    message up to ``last_read_id`` has been read. It is a plain id, not a
+    foreign key, so archiving old messages leaves it alone.
+    ``unread_count`` counts the later messages sent by others.
+    """
+    id = models.AutoField(primary_key=True)
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="members")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="conversation_memberships")
+    last_read_id = models.BigIntegerField(default=0)
+    unread_count = models.PositiveIntegerField(default=0)
+    # when last_read_id last moved
+    read_at = models.DateTimeField(blank=True, null=True)
+
+    objects = ParticipantManager()
+
+    class Meta:
+        # the table the implicit participants many-to-many used to create
+        db_table = "messaging_conversation_participants"
+        unique_together = [("conversation", "user")]
+
+    def __str__(self):
+        return f"{self.user_id} in conversation {self.conversation_id}"
+
+
 class Message(models.Model):
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sent_messages")
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["conversation", "created_at", "id"], name="message_conv_created"),
+            # the retention scan walks the oldest rows first
+            models.Index(fields=["created_at", "id"], name="message_created"),
+        ]
 
     def __str__(self):
         return f"Message {self.id} by {self.sender}"
 
 
+class ArchivedMessage(models.Model):
+    """
+    A Message moved out of the hot table by ``manage.py apply_retention``.
+    It keeps its original id, so cursors and client-side keys stay valid.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name="archived_messages")
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    text = models.TextField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["conversation", "created_at", "id"], name="archived_message_conv_created"),
+        ]
+
+    def __str__(self):
+        return f"Archived message {self.id} by {self.sender_id}"
+
+
+class NotificationManager(models.Manager):
+    def notify(self, user_id, verb, target, actor_ids, url=None):
+        """Record that ``actor_ids`` did ``verb`` to ``target`` (owned by ``user_id``)."""
+        return self.notify_many((user_id, actor_id, verb, target, url) for actor_id in actor_ids)
+
+    def notify_many(self, events):
+        """
+        Record a batch of ``(user_id, actor_id, verb, target, url)`` events.
+
+        Events for the same (recipient, verb, target) are collapsed into one
+        row. If that recipient already has an unread row for the target that
+        was touched within NOTIFICATION_COALESCE_WINDOW, it is updated in place
+        ("alice and 41 others liked your post"). Remaining rows are inserted
+        with a single bulk_create.
+
+        actor_count counts distinct people. Every actor folded into a row is
+        recorded in NotificationActor, and a coalesced row only grows by the
+        actors it doesn't have yet: liking, unliking and liking again
+        changes nothing.
+        """
+        groups = {}
+        for user_id, actor_id, verb, target, url in events:
+            ct = ContentType.objects.get_for_model(target)
+            key = (user_id, verb, ct.pk, target.pk)
+            group = groups.setdefault(key, {"actors": {}, "url": url})
+            group["actors"].pop(actor_id, None)
+            group["actors"][actor_id] = None  # kept in order, so the latest actor is last
+        if not groups:
+            return 0
+
+        now = timezone.now()
+        window = getattr(settings, "NOTIFICATION_COALESCE_WINDOW", 6 * 3600)
+        touched = []
+        with transaction.atomic():
+            if window:
+                # locked, so two workers can't both fold the same actor into a row
+                candidates = self.select_for_update().filter(
+                    read=False,
+                    updated_at__gte=now - timedelta(seconds=window),
+                    user_id__in={k[0] for k in groups},
+                    verb__in={k[1] for k in groups},
+                    target_object_id__in={k[3] for k in groups},
+                ).values_list("pk", "user_id", "verb", "target_content_type_id", "target_object_id")
+                coalesce = {}
+                for pk, *key in candidates:
+                    group = groups.pop(tuple(key), None)
+                    if group is not None:
+                        coalesce[pk] = group
+                folded = set(
+                    NotificationActor.objects.filter(notification_id__in=coalesce)
+                    .values_list("notification_id", "actor_id")
+                )
+                for pk, group in coalesce.items():
+                    new = [a for a in group["actors"] if (pk, a) not in folded]
+                    if not new:
+                        continue
+                    self.filter(pk=pk).update(
+                        actor_id=new[-1],
+                        actor_count=F("actor_count") + len(new),
+                        updated_at=now,
+                    )
+                    NotificationActor.objects.bulk_create(
+                        [NotificationActor(notification_id=pk, actor_id=a) for a in new], ignore_conflicts=True,
+                    )
+                    touched.append(pk)
+            created = self.bulk_create([
+                self.model(
+                    user_id=user_id,
+                    actor_id=list(group["actors"])[-1],
+                    verb=verb,
+                    target_content_type_id=ct_id,
+                    target_object_id=obj_id,
+                    actor_count=len(group["actors"]),
+                    url=group["url"],
+                )
+                for (user_id, verb, ct_id, obj_id), group in groups.items()
+            ])
+            NotificationActor.objects.bulk_create([
+                NotificationActor(notification_id=n.pk, actor_id=a)
+                for n, group in zip(created, groups.values())
+                for a in group["actors"]
+            ])
+            touched += [n.pk for n in created]
+            # coalesced rows were already unread; only brand-new rows raise the badge
+            new_unread = Counter(n.user_id for n in created)
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(user_id=uid) for uid in new_unread], ignore_conflicts=True,
+            )
+            _adjust_unread(new_unread)
+            self._publish(touched)
+        return len(touched)
+
+    def unread_count(self, user_id):
+        """Unread notifications for ``user_id``: one primary-key read of its counter, no COUNT."""
+        try:
+            return NotificationCounter.objects.values_list("unread", flat=True).get(user_id=user_id)
+        except NotificationCounter.DoesNotExist:
+            return 0
+
+    def recount_unread(self, user_id):
+        """Reset the counter from the rows, after an edit that doesn't go through mark_read()."""
+        NotificationCounter.objects.update_or_create(
+            user_id=user_id, defaults={"unread": self.filter(user_id=user_id, read=False).count()},
+        )
+
+    def mark_read(self, user_id, ids=None):
+        """Mark ``ids`` (or everything when None) read with one UPDATE. Returns rows changed."""
+        qs = self.filter(user_id=user_id, read=False)
+        if ids is not None:
+            qs = qs.filter(pk__in=ids)
+        with transaction.atomic():
+            changed = qs.update(read=True)
+            # subtract rather than zero, so a notification created meanwhile still counts
+            _adjust_unread({user_id: -changed})
+        return changed
+
+    def _publish(self, pks):
+        """Push the new/updated rows to their recipients' realtime streams."""
+        from apps.realtime.broker import publish_to_users
+        from .serializers import NotificationSerializer
+
+        rows = self.filter(pk__in=pks).select_related("actor", "target_content_type")
+        for n in rows:
+            publish_to_users([n.user_id], "notification", NotificationSerializer(n).data)
+
+
 class Notification(models.Model):
+    VERB_LIKE = "like"
+    VERB_COMMENT = "comment"
+    VERB_CHOICES = [
+        (VERB_LIKE, "liked"),
+        (VERB_COMMENT, "commented on"),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")
+    # most recent actor; actor_count includes everyone folded into this row
     actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
-    text = models.CharField(max_length=255)
+    actor_count = models.PositiveIntegerField(default=1)
+    verb = models.CharField(max_length=20, choices=VERB_CHOICES, blank=True)
+    target_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
+    target_object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    target = GenericForeignKey("target_content_type", "target_object_id")
+    # free text for legacy / ad-hoc notifications; structured ones render from verb
+    text = models.CharField(max_length=255, blank=True, default="")
     url = models.CharField(max_length=255, blank=True, null=True)
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = NotificationManager()
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-updated_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "verb", "target_content_type", "target_object_id"],
+                name="notification_coalesce",
+            ),
+            models.Index(fields=["user", "-updated_at", "-id"], name="notification_user_recent"),
+            # unread_count / mark_all_read only ever touch unread rows
+            models.Index(fields=["user"], condition=models.Q(read=False), name="notification_user_unread"),
+            # retention deletes old read rows, oldest first
+            models.Index(fields=["updated_at", "id"], condition=models.Q(read=True), name="notification_read_age"),
+        ]
+
+    def render_text(self):
+        if not self.verb:
+            return self.text
+        who = self.actor.username if self.actor else "Someone"
+        if self.actor_count > 1:
+            others = self.actor_count - 1
+            who = f"{who} and {others} other{'s' if others > 1 else ''}"
+        target = self.target_content_type.model if self.target_content_type_id else "item"
+        return f"{who} {self.get_verb_display()} your {target}"
 
     def __str__(self):
-        return f"Notification to {self.user}: {self.text[:40]}"
+        return f"Notification to {self.user}: {self.render_text()[:40]}"
+
+
+class NotificationCounter(models.Model):
+    """
+    A user's unread notification count, changed in the same transaction as
+    the rows it counts. Every process reads the same value, including
+    notifications created by run_workers.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    unread = models.PositiveIntegerField(default=0)
+
+
+class NotificationActor(models.Model):
+    """One row per person folded into a coalesced notification; keeps actor_count distinct."""
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="actors")
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        unique_together = [("notification", "actor")]
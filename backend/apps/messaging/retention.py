@@ -0,0 +1,93 @@
+# backend/apps/messaging/retention.py
+"""
+Retention for the two tables that only ever grow.
+
+- Read notifications last touched more than NOTIFICATION_RETENTION_DAYS ago
+  are deleted. Unread ones are kept whatever their age.
+- Messages older than MESSAGE_ARCHIVE_DAYS move to ArchivedMessage. The
+  thread's history stays readable through
+  /api/messaging/conversations/<id>/messages/?archived=1.
+
+Both work oldest-first in batches of RETENTION_BATCH_SIZE rows. Each
+batch is picked with a range scan on its own index (notification_read_age,
+message_created) and handled in its own short transaction, so locks are
+held for one batch at a time and requests keep flowing in between. An
+interrupted run simply resumes where it stopped.
+
+A conversation's current last_message is never archived, because the
+inbox summary points at it.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ArchivedMessage, Conversation, Message, Notification
+
+
+def _batches(queryset, batch_size, pause, apply):
+    """Call ``apply(rows)`` on successive oldest-first batches until none are left."""
+    done = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset[:batch_size])
+            if not rows:
+                return done
+            apply(rows)
+        done += len(rows)
+        if pause:
+            time.sleep(pause)
+
+
+def expired_notifications(now=None):
+    days = settings.NOTIFICATION_RETENTION_DAYS
+    if not days:
+        return Notification.objects.none()
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Notification.objects.filter(read=True, updated_at__lt=cutoff).order_by("updated_at", "id")
+
+
+def archivable_messages(now=None):
+    days = settings.MESSAGE_ARCHIVE_DAYS
+    if not days:
+        return Message.objects.none()
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return (
+        Message.objects.filter(created_at__lt=cutoff)
+        .exclude(Exists(Conversation.objects.filter(last_message=OuterRef("pk"))))
+        .order_by("created_at", "id")
+    )
+
+
+def prune_notifications(batch_size=None, pause=0, now=None):
+    """Delete expired read notifications. Returns the number deleted."""
+    def delete(pks):
+        Notification.objects.filter(pk__in=pks).delete()
+
+    return _batches(
+        expired_notifications(now).values_list("pk", flat=True),
+        batch_size or settings.RETENTION_BATCH_SIZE, pause, delete,
+    )
+
+
+def archive_messages(batch_size=None, pause=0, now=None):
+    """Move old messages to ArchivedMessage. Returns the number moved."""
+    def move(messages):
+        ArchivedMessage.objects.bulk_create(
+            [
+                ArchivedMessage(
+                    id=m.pk, conversation_id=m.conversation_id, sender_id=m.sender_id,
+                    text=m.text, created_at=m.created_at,
+                )
+                for m in messages
+            ],
+            ignore_conflicts=True,
+        )
+        Message.objects.filter(pk__in=[m.pk for m in messages]).delete()
+        # versions the threads' cached message pages (see MessagesListAPIView)
+        Conversation.objects.filter(pk__in={m.conversation_id for m in messages}).update(archived_at=timezone.now())
+
+    return _batches(archivable_messages(now), batch_size or settings.RETENTION_BATCH_SIZE, pause, move)
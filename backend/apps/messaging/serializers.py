@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from .models import Conversation, Message,Notification
+from .models import ArchivedMessage, Conversation, Message,Notification
 from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
+from config.sparse import SparseFieldsMixin
 
 User = get_user_model()
 
@@ -12,20 +13,27 @@ class UserMiniSerializer(serializers.ModelSerializer):
 
 class MessageSerializer(serializers.ModelSerializer):
     sender = UserMiniSerializer(read_only=True)
+    # read by the requesting user: at or below their watermark (context["last_read_id"])
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
         model = Message
         fields = ["id", "sender", "text", "created_at", "is_read"]
 
-class ConversationSerializer(serializers.ModelSerializer):
-    participants = UserMiniSerializer(many=True, read_only=True)
-    last_message = serializers.SerializerMethodField()
+    def get_is_read(self, obj):
+        return obj.pk <= self.context.get("last_read_id", 0)
+
+class ArchivedMessageSerializer(MessageSerializer):
+    class Meta(MessageSerializer.Meta):
+        model = ArchivedMessage
 
-    def get_last_message(self, obj):
-        msg = obj.messages.order_by("-created_at").first()
-        if msg:
-            return MessageSerializer(msg).data
-        return None
+class ConversationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    participants = UserMiniSerializer(many=True, read_only=True)
+    # denormalized pointer; select_related("last_message__sender") to avoid a query per row
+    last_message = MessageSerializer(read_only=True)
+    # the requesting member's read state, annotated by views.inbox()
+    unread_count = serializers.IntegerField(read_only=True)
+    last_read_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Conversation
@@ -34,7 +42,20 @@ class ConversationSerializer(serializers.ModelSerializer):
             "participants",
             "updated_at",
             "last_message",
+            "last_message_preview",
+            "last_message_at",
+            "unread_count",
+            "last_read_id",
         ]
+        sparse_requires = {"unread_count": (), "last_read_id": ()}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # the nested message shares the page's context, so judge it against this row's watermark
+        last_read_id = getattr(instance, "last_read_id", None)
+        if data.get("last_message") and last_read_id is not None:
+            data["last_message"]["is_read"] = instance.last_message_id <= last_read_id
+        return data
 
 
 class UserSimpleSerializer(serializers.ModelSerializer):
@@ -44,8 +65,14 @@ class UserSimpleSerializer(serializers.ModelSerializer):
 
 class NotificationSerializer(serializers.ModelSerializer):
     actor = UserSimpleSerializer(read_only=True)
+    text = serializers.CharField(source="render_text", read_only=True)
+    target_type = serializers.SlugRelatedField(source="target_content_type", slug_field="model", read_only=True)
+    target_id = serializers.IntegerField(source="target_object_id", read_only=True)
 
     class Meta:
         model = Notification
-        fields = ("id", "actor", "text", "url", "read", "created_at")
-        read_only_fields = ("id", "actor", "created_at")
\ No newline at end of file
+        fields = (
+            "id", "actor", "actor_count", "verb", "target_type", "target_id",
+            "text", "url", "read", "created_at", "updated_at",
+        )
+        read_only_fields = ("id", "actor", "actor_count", "verb", "created_at", "updated_at")
\ No newline at end of file
@@ -0,0 +1,20 @@
+# backend/apps/messaging/tasks.py
+from django.apps import apps
+
+from apps.jobs.queue import task
+from .models import Notification
+
+
+@task("messaging.notify", batch=True)
+def deliver_notifications(payloads):
+    """
+    Each payload is {"events": [[user_id, actor_id, verb, "app_label.model", target_id, url], ...]}.
+    Every claimed payload is flushed through one notify_many() call so bursts coalesce.
+    """
+    events = []
+    for payload in payloads:
+        for user_id, actor_id, verb, label, target_id, url in payload["events"]:
+            # notify_many only needs the target's class and pk, no need to load it
+            target = apps.get_model(label)(pk=target_id)
+            events.append((user_id, actor_id, verb, target, url))
+    Notification.objects.notify_many(events)
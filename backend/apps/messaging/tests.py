@@ -1,3 +1,363 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.posts.models import Post, Comment
+from config.explain import QueryPlanTestMixin
+from .models import ArchivedMessage, Conversation, Message, Notification, NotificationCounter, Participant
+
+
+@override_settings(JOBS_EAGER=True)
+class CoalescedNotificationTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.fans = [User.objects.create_user(f"fan{i}", password="pw123456") for i in range(4)]
+        self.post = Post.objects.create(author=self.author, content="hello")
+
+    def test_likes_collapse_into_one_row(self):
+        self.post.likes.add(self.fans[0])
+        self.post.likes.add(*self.fans[1:])
+        n = Notification.objects.get(user=self.author)
+        self.assertEqual((n.verb, n.actor_count, n.target), ("like", 4, self.post))
+        self.assertEqual(n.render_text(), f"{n.actor.username} and 3 others liked your post")
+
+    def test_actor_count_is_distinct_people(self):
+        self.post.likes.add(self.fans[0])
+        self.post.likes.remove(self.fans[0])
+        self.post.likes.add(self.fans[0])
+        Comment.objects.create(post=self.post, author=self.fans[1], content="a")
+        Comment.objects.create(post=self.post, author=self.fans[1], content="b")
+        self.assertEqual(
+            sorted(Notification.objects.values_list("verb", "actor_count")), [("comment", 1), ("like", 1)],
+        )
+        Notification.objects.notify_many(
+            (self.author.pk, fan.pk, "like", self.post, None) for fan in (self.fans[1], self.fans[0], self.fans[1])
+        )
+        n = Notification.objects.get(verb="like")
+        self.assertEqual((n.actor_count, n.actor_id, n.actors.count()), (2, self.fans[1].pk, 2))
+
+    def test_read_rows_are_not_reused(self):
+        self.post.likes.add(self.fans[0])
+        Notification.objects.update(read=True)
+        self.post.likes.add(self.fans[1])
+        self.assertEqual(Notification.objects.filter(user=self.author).count(), 2)
+
+    @override_settings(NOTIFICATION_COALESCE_WINDOW=0)
+    def test_window_zero_disables_coalescing(self):
+        self.post.likes.add(self.fans[0])
+        self.post.likes.add(self.fans[1])
+        self.assertEqual(Notification.objects.filter(user=self.author).count(), 2)
+
+    def test_reverse_add_and_comments(self):
+        other = Post.objects.create(author=self.fans[1], content="x")
+        self.fans[0].liked_posts.add(self.post, other)
+        Comment.objects.create(post=self.post, author=self.fans[2], content="hi")
+        self.assertEqual(
+            sorted(Notification.objects.values_list("user__username", "verb")),
+            [("author", "comment"), ("author", "like"), ("fan1", "like")],
+        )
+
+    def test_self_like_is_silent(self):
+        self.post.likes.add(self.author)
+        self.assertFalse(Notification.objects.exists())
+
+
+@override_settings(JOBS_EAGER=True, NOTIFICATION_COALESCE_WINDOW=0)
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.fan = User.objects.create_user("fan", password="pw123456")
+        self.posts = [Post.objects.create(author=self.author, content=str(i)) for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            for post in self.posts:
+                post.likes.add(self.fan)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        self.url = "/api/messaging/notifications/"
+
+    def unread(self):
+        return self.client.get(self.url + "unread_count/").data["unread_count"]
+
+    def test_counter_is_one_read_and_maintained(self):
+        self.assertEqual(self.unread(), 3)
+        with self.assertNumQueries(1):
+            self.assertEqual(Notification.objects.unread_count(self.author.pk), 3)
+        Comment.objects.create(post=self.posts[0], author=self.fan, content="hi")
+        self.assertEqual(self.unread(), 4)
+
+    def test_counter_is_shared_by_every_process(self):
+        # nothing lives in process memory: a write from another process (run_workers) is seen at once
+        NotificationCounter.objects.filter(user=self.author).update(unread=7)
+        self.assertEqual(self.unread(), 7)
+
+    def test_bulk_mark_read_is_one_update(self):
+        ids = list(Notification.objects.values_list("pk", flat=True)[:2])
+        with CaptureQueriesContext(connection) as ctx:
+            Notification.objects.mark_read(self.author.pk, ids=ids)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)  # the rows and the counter, in one transaction
+        self.assertEqual(self.unread(), 1)
+
+        res = self.client.post(self.url + "mark_all_read/")
+        self.assertEqual(res.data, {"updated": 1})
+        self.assertEqual(self.unread(), 0)
+
+        n = Notification.objects.first()
+        self.client.patch(f"{self.url}{n.pk}/", {"read": False})
+        self.assertEqual(self.unread(), 1)
+
+    def test_bulk_endpoint_validates_and_scopes_to_owner(self):
+        other = Notification.objects.create(user=self.fan, text="not yours")
+        res = self.client.post(self.url + "mark_read/", {"ids": [other.pk]}, format="json")
+        self.assertEqual(res.data, {"updated": 0})
+        res = self.client.post(self.url + "mark_read/", {"ids": "nope"}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+
+class InboxTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create_user("me", password="pw123456")
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def start_and_send(self, other, text):
+        conv = Conversation.objects.create()
+        conv.participants.add(self.me, other)
+        self.client.post(f"/api/messaging/conversations/{conv.pk}/messages/send/", {"text": text})
+        return conv
+
+    def test_send_updates_summary_and_inbox_is_fixed_cost(self):
+        for i in range(3):
+            other = User.objects.create_user(f"u{i}", password="pw123456")
+            self.start_and_send(other, f"hello {i}")
+        conv = self.start_and_send(User.objects.create_user("last", password="pw123456"), "x" * 200)
+        conv.refresh_from_db()
+        self.assertEqual(len(conv.last_message_preview), 140)
+
+        with self.assertNumQueries(2):
+            res = self.client.get("/api/messaging/conversations/")
+        rows = res.data["results"]
+        self.assertEqual(rows[0]["id"], conv.pk)
+        self.assertEqual(rows[0]["last_message"]["sender"]["username"], "me")
+        self.assertEqual(rows[-1]["last_message_preview"], "hello 0")
+        self.assertEqual(len(rows[0]["participants"]), 2)
+
+    def test_late_commit_does_not_rewind_summary(self):
+        other = User.objects.create_user("other", password="pw123456")
+        conv = Conversation.objects.create()
+        conv.participants.add(self.me, other)
+        older = conv.messages.create(sender=other, text="older")
+        newer = conv.messages.create(sender=self.me, text="newer")
+        conv.record_message(newer)
+        # the older send's transaction commits last
+        Conversation.objects.get(pk=conv.pk).record_message(older)
+        conv.refresh_from_db()
+        self.assertEqual((conv.last_message_id, conv.last_message_preview), (newer.pk, "newer"))
+        self.assertEqual(conv.members.get(user=self.me).last_read_id, newer.pk)
+
+    def test_sparse_inbox_skips_the_participants_prefetch(self):
+        self.start_and_send(User.objects.create_user("other", password="pw123456"), "hi")
+        with self.assertNumQueries(1):
+            res = self.client.get("/api/messaging/conversations/?fields=id,last_message_preview")
+        self.assertEqual(list(res.data["results"][0]), ["id", "last_message_preview"])
+
+
+class DirectConversationTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create_user("me", password="pw123456")
+        self.you = User.objects.create_user("you", password="pw123456")
+
+    def test_start_is_idempotent_and_ignores_groups(self):
+        group = Conversation.objects.create(title="group")
+        group.participants.add(self.me, self.you)
+
+        client = APIClient()
+        client.force_authenticate(self.me)
+        first = client.post("/api/messaging/conversations/start/", {"username": "you"}).data["id"]
+        client.force_authenticate(self.you)
+        second = client.post("/api/messaging/conversations/start/", {"username": "me"}).data["id"]
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, group.pk)
+        self.assertEqual(Conversation.objects.get(pk=first).direct_key, f"{self.me.pk}:{self.you.pk}")
+
+    def test_lost_race_returns_existing_row(self):
+        existing = Conversation.objects.create(direct_key=Conversation.direct_key_for(self.me, self.you))
+        with mock.patch.object(Conversation.objects, "get", side_effect=[Conversation.DoesNotExist, existing]):
+            conv, created = Conversation.get_or_create_direct(self.me, self.you)
+        self.assertEqual((conv, created), (existing, False))
+
+
+@override_settings(JOBS_EAGER=True, NOTIFICATION_COALESCE_WINDOW=0)
+class QueryPlanTests(QueryPlanTestMixin, TestCase):
+    """List endpoints must be index range reads: no full scans, no temp sorts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = User.objects.create_user("me")
+        for i in range(20):
+            other = User.objects.create_user(f"u{i}")
+            conv, _ = Conversation.get_or_create_direct(cls.me, other)
+            for j in range(5):
+                conv.record_message(conv.messages.create(sender=other, text=str(j)))
+            Post.objects.create(author=cls.me, content="x").likes.add(other)
+        cls.conv = conv
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+
+    def test_notifications(self):
+        self.assertEfficientPlans(lambda: self.client.get("/api/messaging/notifications/"))
+        self.assertEfficientPlans(lambda: self.client.get("/api/messaging/notifications/unread_count/"))
+
+    def test_messages(self):
+        self.assertEfficientPlans(lambda: self.client.get(f"/api/messaging/conversations/{self.conv.pk}/messages/"))
+        self.assertEfficientPlans(
+            lambda: self.client.get(f"/api/messaging/conversations/{self.conv.pk}/messages/?archived=1")
+        )
+
+    def test_inbox(self):
+        # The inbox is ordered by Conversation.updated_at but filtered through the
+        # participants join, so SQLite sorts the user's own conversations. That is
+        # bounded by one user's conversation count, not by table size.
+        self.assertEfficientPlans(
+            lambda: self.client.get("/api/messaging/conversations/"),
+            allow=("USE TEMP B-TREE FOR ORDER BY",),
+        )
+
+
+class ConditionalMessagesTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create_user("me")
+        self.other = User.objects.create_user("other")
+        self.conv, _ = Conversation.get_or_create_direct(self.me, self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+        self.url = f"/api/messaging/conversations/{self.conv.pk}/messages/"
+        self.client.post(f"{self.url}send/", {"text": "hi"})
+
+    def test_unchanged_thread_is_304_without_reading_messages(self):
+        first = self.client.get(self.url)
+        self.assertIn("Last-Modified", first)
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+        self.client.post(f"{self.url}send/", {"text": "again"})
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([m["text"] for m in res.data["results"]], ["hi", "again"])
+
+
+class ReadWatermarkTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob, self.carol = (User.objects.create_user(name) for name in ("alice", "bob", "carol"))
+        self.conv = Conversation.objects.create(title="group")
+        self.conv.participants.add(self.alice, self.bob, self.carol)
+        self.url = f"/api/messaging/conversations/{self.conv.pk}/"
+        self.clients = {}
+        for user in (self.alice, self.bob, self.carol):
+            self.clients[user.username] = client = APIClient()
+            client.force_authenticate(user)
+        for i in range(3):
+            self.clients["alice"].post(f"{self.url}messages/send/", {"text": f"m{i}"})
+
+    def unread(self, name):
+        return self.clients[name].get("/api/messaging/conversations/").data["results"][0]["unread_count"]
+
+    def test_unread_counts_are_per_member(self):
+        self.assertEqual([self.unread(n) for n in ("alice", "bob", "carol")], [0, 3, 3])
+        self.clients["bob"].post(f"{self.url}messages/send/", {"text": "hi"})
+        self.assertEqual([self.unread(n) for n in ("alice", "bob", "carol")], [1, 0, 4])
+
+    def test_mark_read_is_one_row(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.clients["bob"].post(f"{self.url}read/")
+        self.assertEqual(res.data, {"unread_count": 0})
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"user_id" = %d' % self.bob.pk, updates[0])
+        self.assertEqual(self.unread("carol"), 3)
+
+        messages = self.clients["bob"].get(f"{self.url}messages/").data["results"]
+        self.assertTrue(all(m["is_read"] for m in messages))
+        self.assertFalse(any(m["is_read"] for m in self.clients["carol"].get(f"{self.url}messages/").data["results"]))
+
+    def test_partial_read_and_etag(self):
+        etag = self.clients["carol"].get(f"{self.url}messages/")["ETag"]
+        second = Message.objects.order_by("id")[1].pk
+        self.assertEqual(self.clients["carol"].post(f"{self.url}read/", {"message_id": second}).data, {"unread_count": 1})
+        # the watermark never moves backwards
+        self.assertEqual(self.clients["carol"].post(f"{self.url}read/", {"message_id": 0}).data, {"unread_count": 1})
+        res = self.clients["carol"].get(f"{self.url}messages/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([m["is_read"] for m in res.data["results"]], [True, True, False])
+
+    def test_non_members_get_404(self):
+        stranger = APIClient()
+        stranger.force_authenticate(User.objects.create_user("mallory"))
+        self.assertEqual(stranger.get(f"{self.url}messages/").status_code, 404)
+        self.assertEqual(stranger.post(f"{self.url}read/").status_code, 404)
+        self.assertEqual(stranger.post(f"{self.url}messages/send/", {"text": "hi"}).status_code, 404)
+        self.assertEqual(Message.objects.count(), 3)
+        self.assertEqual(Participant.objects.get(conversation=self.conv, user=self.bob).unread_count, 3)
+
+
+@override_settings(NOTIFICATION_RETENTION_DAYS=90, MESSAGE_ARCHIVE_DAYS=30)
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.me = User.objects.create_user("me")
+        self.other = User.objects.create_user("other")
+        self.conv, _ = Conversation.get_or_create_direct(self.me, self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.me)
+        self.url = f"/api/messaging/conversations/{self.conv.pk}/messages/"
+
+    def age(self, model, days, **filters):
+        then = timezone.now() - timedelta(days=days)
+        fields = {"updated_at": then} if model is Notification else {"created_at": then}
+        model.objects.filter(**filters).update(**fields)
+
+    def test_old_read_notifications_are_deleted(self):
+        for i in range(3):
+            Notification.objects.create(user=self.me, text=f"n{i}", read=i > 0)
+        self.age(Notification, 100)
+        Notification.objects.create(user=self.me, text="fresh", read=True)
+        call_command("apply_retention", "--batch-size=1", "--pause=0", stdout=StringIO())
+        self.assertEqual(sorted(Notification.objects.values_list("text", flat=True)), ["fresh", "n0"])
+
+    def test_messages_are_archived_and_still_readable(self):
+        for i in range(5):
+            self.client.post(f"{self.url}send/", {"text": f"m{i}"})
+        self.age(Message, 60, text__in=["m0", "m1", "m2"])
+        etag = self.client.get(self.url)["ETag"]
+
+        out = StringIO()
+        call_command("apply_retention", "--only=messages", "--batch-size=2", "--pause=0", stdout=out)
+        self.assertIn("archived 3", out.getvalue())
+        self.assertEqual(ArchivedMessage.objects.count(), 3)
+
+        res = self.client.get(f"{self.url}?page_size=1", HTTP_IF_NONE_MATCH=etag)
+        texts = [m["text"] for m in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            texts = [m["text"] for m in res.data["results"]] + texts
+        self.assertEqual(texts, ["m0", "m1", "m2", "m3", "m4"])
+
+    def test_last_message_is_never_archived(self):
+        self.client.post(f"{self.url}send/", {"text": "only"})
+        self.age(Message, 60)
+        call_command("apply_retention", "--pause=0", stdout=StringIO())
+        self.assertEqual(Message.objects.count(), 1)
+        self.assertEqual(self.client.get("/api/messaging/conversations/").data["results"][0]["last_message"]["text"], "only")
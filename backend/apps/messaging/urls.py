@@ -1,11 +1,14 @@
 from django.urls import path
+from rest_framework.routers import DefaultRouter
 from . import views
 
-
+router = DefaultRouter()
+router.register(r"notifications", views.NotificationViewSet, basename="notification")
 
 urlpatterns = [
     path("conversations/", views.ConversationsListAPIView.as_view()),
     path("conversations/start/", views.start_conversation),
     path("conversations/<int:conversation_id>/messages/", views.MessagesListAPIView.as_view()),
     path("conversations/<int:conversation_id>/messages/send/", views.send_message),
-]
+    path("conversations/<int:conversation_id>/read/", views.mark_conversation_read),
+] + router.urls
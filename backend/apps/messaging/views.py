@@ -1,74 +1,212 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from .models import Conversation, Message
-from .serializers import ConversationSerializer, MessageSerializer
-from rest_framework.decorators import api_view, permission_classes
+from django.db import transaction
+from django.db.models import F, Prefetch
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .models import ArchivedMessage, Conversation, Message, Participant
+from .serializers import ArchivedMessageSerializer, ConversationSerializer, MessageSerializer
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
+from apps.realtime.broker import publish_to_users
+
 from .models import Notification
 from .serializers import NotificationSerializer
+from config.conditional import ConditionalGetMixin
+from config.db import ReplicaReadMixin
+from config.pagination import ChronologicalPagination, RecentlyUpdatedPagination
+from config.sparse import narrow
+from config.throttling import bucket_throttles
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
-    queryset = Notification.objects.all().select_related("actor")
+class NotificationViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = Notification.objects.all().select_related("actor", "target_content_type")
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # coalesced rows move to the top when they gain new actors
+    pagination_class = RecentlyUpdatedPagination
 
     def get_queryset(self):
         # return only notifications for the logged-in user
-        return Notification.objects.filter(user=self.request.user).order_by("-created_at")
+        return self.queryset.filter(user=self.request.user).order_by("-updated_at")
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        Notification.objects.recount_unread(self.request.user.pk)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        Notification.objects.recount_unread(self.request.user.pk)
+
+    @action(detail=False, methods=["get"])
+    def unread_count(self, request):
+        return Response({"unread_count": Notification.objects.unread_count(request.user.pk)})
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def mark_read(self, request, pk=None):
-        n = get_object_or_404(Notification, pk=pk, user=request.user)
-        n.read = True
-        n.save(update_fields=["read"])
+        get_object_or_404(Notification, pk=pk, user=request.user)
+        Notification.objects.mark_read(request.user.pk, ids=[pk])
         return Response({"ok": True})
 
+    @action(detail=False, methods=["post"], url_path="mark_read", url_name="mark-read-bulk")
+    def mark_read_bulk(self, request):
+        """POST {"ids": [1, 2, 3]} -> mark those read with a single UPDATE."""
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return Response({"error": "ids must be a list of integers"}, status=400)
+        changed = Notification.objects.mark_read(request.user.pk, ids=ids)
+        return Response({"updated": changed})
+
+    @action(detail=False, methods=["post"])
+    def mark_all_read(self, request):
+        changed = Notification.objects.mark_read(request.user.pk)
+        return Response({"updated": changed})
+
+def inbox(user):
+    """``user``'s conversations, annotated with their unread_count and last_read_id from the same join."""
+    return Conversation.objects.filter(members__user=user).annotate(
+        unread_count=F("members__unread_count"), last_read_id=F("members__last_read_id"),
+    )
+
+
 # GET all conversations of current user
-class ConversationsListAPIView(generics.ListAPIView):
+class ConversationsListAPIView(ReplicaReadMixin, generics.ListAPIView):
     serializer_class = ConversationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RecentlyUpdatedPagination
 
     def get_queryset(self):
-        return Conversation.objects.filter(participants=self.request.user).order_by("-updated_at")
+        # 1 query for the page (unread counts included) + 1 prefetch for all participants
+        conversations = (
+            inbox(self.request.user)
+            .select_related("last_message__sender")
+            .prefetch_related(Prefetch("participants", queryset=User.objects.only("id", "username")))
+            .order_by("-updated_at")
+        )
+        return narrow(conversations, self.get_serializer(), columns=("updated_at",))
 
 
 # GET all messages in one conversation
-class MessagesListAPIView(generics.ListAPIView):
+class MessagesListAPIView(ConditionalGetMixin, ReplicaReadMixin, generics.ListAPIView):
+    """
+    Latest messages first; ``next`` loads earlier ones. Once the hot table
+    runs out, ``next`` continues into the archive (?archived=1), which pages
+    the same way. Archived messages are all older than the ones left in
+    the hot table.
+    """
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ChronologicalPagination
+    conversation = None
+
+    @property
+    def archived(self):
+        return self.request.query_params.get("archived") == "1"
+
+    def get_serializer_class(self):
+        return ArchivedMessageSerializer if self.archived else MessageSerializer
 
     def get_queryset(self):
+        model = ArchivedMessage if self.archived else Message
         conversation_id = self.kwargs["conversation_id"]
-        return Message.objects.filter(conversation_id=conversation_id).order_by("created_at")
+        return model.objects.filter(conversation_id=conversation_id).select_related("sender").order_by("created_at")
+
+    def list(self, request, *args, **kwargs):
+        # Messages are never edited, and record_message() moves the conversation's
+        # last_message / updated_at on every send, so one lookup of the caller's
+        # membership versions every page of the thread without touching the
+        # messages table. Archiving moves archived_at; reading moves the
+        # caller's watermark (is_read).
+        try:
+            self.conversation = conv = (
+                Participant.objects.filter(conversation_id=self.kwargs["conversation_id"], user=request.user)
+                .values(
+                    "last_read_id", "read_at", last_message_id=F("conversation__last_message_id"),
+                    updated_at=F("conversation__updated_at"), archived_at=F("conversation__archived_at"),
+                ).get()
+            )
+        except Participant.DoesNotExist:
+            raise NotFound("Conversation not found")
+        changed = max(filter(None, (conv["updated_at"], conv["archived_at"], conv["read_at"])))
+        not_modified = self.not_modified(
+            request, (conv["last_message_id"], conv["archived_at"], conv["last_read_id"]), last_modified=changed
+        )
+        if not_modified:
+            return not_modified
+        return super().list(request, *args, **kwargs)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.conversation is not None:
+            context["last_read_id"] = self.conversation["last_read_id"]
+        return context
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if response.data["next"] is None and not self.archived and self.conversation["archived_at"]:
+            # the earliest hot page: carry on with the newest archived messages
+            url = remove_query_param(self.paginator.base_url, self.paginator.cursor_query_param)
+            response.data["next"] = replace_query_param(url, "archived", "1")
+        return response
 
 
 # Send a message
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
+@throttle_classes(bucket_throttles("messages"))
 def send_message(request, conversation_id):
     text = request.data.get("text")
     if not text:
         return Response({"error": "Message text required"}, status=400)
 
+    # only members may post; anyone else gets the same 404 as the message list
     try:
-        conv = Conversation.objects.get(id=conversation_id)
+        conv = Conversation.objects.get(id=conversation_id, members__user=request.user)
     except Conversation.DoesNotExist:
         return Response({"error": "Conversation not found"}, status=404)
 
-    msg = Message.objects.create(
-        conversation=conv,
-        sender=request.user,
-        text=text,
+    with transaction.atomic():
+        msg = Message.objects.create(
+            conversation=conv,
+            sender=request.user,
+            text=text,
+        )
+        conv.record_message(msg)  # inbox summary, updated_at, unread counts
+    # unread for everyone else; the sender's watermark has moved past it
+    data = MessageSerializer(msg).data
+    publish_to_users(
+        conv.participants.values_list("pk", flat=True),
+        "message",
+        dict(data, conversation=conv.pk),
     )
+    return Response(dict(data, is_read=True))
 
-    conv.save()  # updates updated_at
-    return Response(MessageSerializer(msg).data)
+
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+def mark_conversation_read(request, conversation_id):
+    """
+    POST /api/messaging/conversations/<id>/read/ {"message_id": 123}
+    Mark the thread read up to message_id, or to the latest message when
+    it is omitted. The caller's own membership row is the only row written.
+    """
+    message_id = request.data.get("message_id")
+    if message_id is not None:
+        try:
+            message_id = int(message_id)
+        except (TypeError, ValueError):
+            return Response({"error": "message_id must be an integer"}, status=400)
+    unread = Participant.objects.mark_read(conversation_id, request.user.pk, message_id)
+    if unread is None:
+        return Response({"error": "Conversation not found"}, status=404)
+    return Response({"unread_count": unread})
 
 
 # Start a new conversation with another user
@@ -85,14 +223,7 @@ def start_conversation(request):
         return Response({"error": "User not found"}, status=404)
 
     # if conversation already exists return it
-    conv = (
-        Conversation.objects.filter(participants=request.user)
-        .filter(participants=other)
-        .first()
-    )
-
-    if not conv:
-        conv = Conversation.objects.create()
-        conv.participants.add(request.user, other)
+    conv, _ = Conversation.get_or_create_direct(request.user, other)
+    conv = inbox(request.user).select_related("last_message__sender").get(pk=conv.pk)
 
     return Response(ConversationSerializer(conv).data)
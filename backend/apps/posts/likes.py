@@ -0,0 +1,117 @@
+# backend/apps/posts/likes.py
+"""
+Write-behind buffer for likes.
+
+PUT / DELETE /api/posts/<id>/like/ only record the state the user wants as a
+"posts.like" job and answer straight away; the request never writes the
+likes table or the post row, so a burst of taps on one viral post doesn't
+queue up behind that row's lock.
+
+The worker folds every claimed job into one ``flush()``:
+
+- the last write per (post, user) wins, so like/unlike/like nets out;
+- one SELECT of the rows that already exist, one
+  ``bulk_create(ignore_conflicts=True)`` for new likes and one DELETE for
+  removed ones;
+- one UPDATE per distinct counter delta (usually one for the whole batch);
+- one notification job and one response-cache bump for the batch.
+
+The touched posts are locked once per flush (not once per like), so two
+workers can't both count the same new like. Until the flush runs, other
+readers see the previous likes_count and is_liked. The user who tapped sees
+their own change: buffer_like() also keeps the wanted state in the cache for
+PENDING_TTL seconds, and ``pending_likes()`` lays it over the stored rows
+when their posts are serialized.
+
+The buffer is the Job table, so every request still writes one small row
+(on SQLite that serializes with other writers). What it avoids is the
+likes-table insert and the hot post-row update.
+"""
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.core.cache import cache
+from django.db.models import F, Q
+
+from apps.jobs.queue import enqueue
+from config.response_cache import bump
+from .models import Post
+
+Like = Post.likes.through
+
+# long enough to outlast a normal queue delay; after that the flushed rows speak
+PENDING_TTL = 120
+
+
+def _pending_key(user_id, post_id):
+    return f"likes:pending:{user_id}:{post_id}"
+
+
+def buffer_like(post_id, user_id, liked):
+    enqueue("posts.like", {"post_id": post_id, "user_id": user_id, "liked": liked})
+    cache.set(_pending_key(user_id, post_id), liked, PENDING_TTL)
+
+
+def pending_likes(user_id, post_ids):
+    """{post_id: liked} for the user's recent like/unlike requests, flushed or not."""
+    keys = {_pending_key(user_id, post_id): post_id for post_id in post_ids}
+    return {keys[key]: liked for key, liked in cache.get_many(keys).items()}
+
+
+def flush(payloads):
+    """Apply a batch of buffered like/unlike requests. Returns (added, removed)."""
+    wanted = {}
+    for payload in payloads:
+        wanted[(payload["post_id"], payload["user_id"])] = payload["liked"]
+
+    authors = dict(
+        Post.objects.select_for_update()
+        .filter(pk__in={post_id for post_id, _ in wanted})
+        .values_list("pk", "author_id")
+    )
+    # posts deleted since the request simply drop out
+    wanted = {key: liked for key, liked in wanted.items() if key[0] in authors}
+    if not wanted:
+        return 0, 0
+
+    existing = set(
+        Like.objects.filter(
+            post_id__in={post_id for post_id, _ in wanted},
+            user_id__in={user_id for _, user_id in wanted},
+        ).values_list("post_id", "user_id")
+    )
+    added = [key for key, liked in wanted.items() if liked and key not in existing]
+    removed = [key for key, liked in wanted.items() if not liked and key in existing]
+
+    Like.objects.bulk_create(
+        [Like(post_id=post_id, user_id=user_id) for post_id, user_id in added], ignore_conflicts=True
+    )
+    if removed:
+        Like.objects.filter(
+            reduce(or_, (Q(post_id=post_id, user_id=user_id) for post_id, user_id in removed))
+        ).delete()
+
+    delta = defaultdict(int)
+    for post_id, _ in added:
+        delta[post_id] += 1
+    for post_id, _ in removed:
+        delta[post_id] -= 1
+    by_delta = defaultdict(list)
+    for post_id, n in delta.items():
+        if n:
+            by_delta[n].append(post_id)
+    for n, post_ids in by_delta.items():
+        Post.objects.filter(pk__in=post_ids, likes_count__gte=max(-n, 0)).update(likes_count=F("likes_count") + n)
+
+    from apps.messaging.models import Notification
+
+    events = [
+        (authors[post_id], user_id, Notification.VERB_LIKE, "posts.post", post_id, f"/posts/{post_id}/")
+        for post_id, user_id in added if user_id != authors[post_id]
+    ]
+    if events:
+        enqueue("messaging.notify", {"events": events})
+    if added or removed:
+        bump(("posts",), *[("post", post_id) for post_id in delta])
+    return len(added), len(removed)
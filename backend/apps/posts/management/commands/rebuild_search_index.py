@@ -0,0 +1,17 @@
+# backend/apps/posts/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.posts.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the post full-text index (needed after bulk inserts that skip signals)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, database, **options):
+        with transaction.atomic(using=database):
+            rebuild_index(using=database)
+        self.stdout.write(self.style.SUCCESS("Post search index rebuilt."))
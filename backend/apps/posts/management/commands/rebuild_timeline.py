@@ -0,0 +1,23 @@
+# backend/apps/posts/management/commands/rebuild_timeline.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.posts.timeline import rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = "Rebuild one user's materialized home timeline from the follow graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--limit", type=int, default=500, help="Max posts to materialize.")
+
+    def handle(self, *args, username, limit, **options):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{username}' not found")
+        with transaction.atomic():
+            written = rebuild_timeline(user, limit=limit)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt timeline for {username}: {written} entries."))
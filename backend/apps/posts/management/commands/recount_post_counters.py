@@ -0,0 +1,62 @@
+# backend/apps/posts/management/commands/recount_post_counters.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.posts.models import Post, Comment
+
+
+def _count_subquery(queryset):
+    """Correlated COUNT(*) for the outer Post row (0 when there are no rows)."""
+    counted = (
+        queryset.filter(post_id=OuterRef("pk"))
+        .order_by()
+        .values("post_id")
+        .annotate(n=Count("*"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = "Backfill / reconcile Post.likes_count and Post.comments_count in primary-key chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing.")
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        likes_real = _count_subquery(Post.likes.through.objects.all())
+        comments_real = _count_subquery(Comment.objects.all())
+
+        last_pk = 0
+        scanned = fixed = 0
+        while True:
+            ids = list(
+                Post.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            last_pk = ids[-1]
+            scanned += len(ids)
+
+            drifted = list(
+                Post.objects.filter(pk__in=ids)
+                .annotate(real_likes=likes_real, real_comments=comments_real)
+                .filter(~Q(likes_count=F("real_likes")) | ~Q(comments_count=F("real_comments")))
+                .values_list("pk", flat=True)
+            )
+            fixed += len(drifted)
+            if not drifted or dry_run:
+                continue
+
+            # each chunk is its own short transaction so we never hold long write locks
+            with transaction.atomic():
+                Post.objects.filter(pk__in=drifted).update(
+                    likes_count=likes_real,
+                    comments_count=comments_real,
+                )
+
+        verb = "would fix" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"Scanned {scanned} posts, {verb} {fixed} drifted counters."))
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_post_fts USING fts5(content, tokenize='unicode61')",
+    "INSERT INTO posts_post_fts (rowid, content) SELECT id, content FROM posts_post",
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS posts_post_fts"]
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE posts_post ADD COLUMN search_vector tsvector"
+    " GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED",
+    "CREATE INDEX post_search_vector ON posts_post USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS post_search_vector",
+    "ALTER TABLE posts_post DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+    """Full-text index for post search; see apps/posts/search.py."""
+
+    dependencies = [
+        ('posts', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
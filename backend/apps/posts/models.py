@@ -7,12 +7,24 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
     content = models.TextField()
     image = models.ImageField(upload_to="posts/", blank=True, null=True)
+    # deduplicated upload + resized variants, see apps.images
+    image_asset = models.ForeignKey(
+        "images.ImageAsset", on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
     likes = models.ManyToManyField(User, related_name="liked_posts", blank=True)
+    # denormalized counters, kept in sync by apps.posts.signals
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # global list and a user's posts, both paged on (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="post_recent"),
+            models.Index(fields=["author", "-created_at", "-id"], name="post_author_recent"),
+        ]
 
     def __str__(self):
         return f"Post {self.id} by {self.author}"
@@ -25,6 +37,33 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["post", "created_at", "id"], name="comment_post_created"),
+        ]
 
     def __str__(self):
         return f"Comment {self.id} by {self.author}"
+
+
+class TimelineEntry(models.Model):
+    """
+    Materialized home timeline row: ``post`` is visible in ``user``'s feed.
+    ``created_at`` and ``author`` are copies of the post's so the feed can be
+    paged straight off the (user, created_at) index.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="timeline")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="timeline_entries")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "post"], name="unique_timeline_entry"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-post"], name="timeline_user_recent"),
+            models.Index(fields=["user", "author"], name="timeline_user_author"),
+        ]
+
+    def __str__(self):
+        return f"Timeline {self.user_id}: post {self.post_id}"
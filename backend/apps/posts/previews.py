@@ -0,0 +1,50 @@
+# backend/apps/posts/previews.py
+"""
+Latest comments for many posts at once.
+
+A feed that shows a few comments under each post would otherwise ask
+``/api/comments/?post=<id>`` once per card. ``latest_comments()`` fetches
+them for a whole page in one query. ROW_NUMBER() is partitioned by post
+and ordered newest first, and only the first ``limit`` rows of each
+partition are kept. Each partition is read from the
+(post, created_at, id) index.
+
+Comments come back oldest-first within a post, the same way
+/api/comments/ displays its latest page.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Comment
+
+# upper bounds for what a client may ask for
+MAX_LIMIT = 20
+MAX_POSTS = 100
+
+
+def preview_size():
+    return getattr(settings, "COMMENT_PREVIEW_SIZE", 3)
+
+
+def latest_comments(post_ids, limit=None):
+    """{post_id: [Comment, ...]} with at most ``limit`` comments per post."""
+    limit = preview_size() if limit is None else limit
+    post_ids = list(post_ids)
+    if not post_ids or limit <= 0:
+        return {}
+    rows = (
+        Comment.objects.filter(post_id__in=post_ids)
+        .annotate(rank=Window(
+            RowNumber(), partition_by=F("post_id"), order_by=(F("created_at").desc(), F("id").desc()),
+        ))
+        .filter(rank__lte=limit)
+        .select_related("author")
+        .order_by("post_id", "created_at", "id")
+    )
+    by_post = defaultdict(list)
+    for comment in rows:
+        by_post[comment.post_id].append(comment)
+    return by_post
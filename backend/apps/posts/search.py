@@ -0,0 +1,148 @@
+# backend/apps/posts/search.py
+"""
+Full-text search over post content.
+
+- SQLite: an FTS5 table ``posts_post_fts`` (rowid = post id), written by the
+  post_save / post_delete receivers in signals.py and ranked with bm25.
+- PostgreSQL: a generated ``search_vector`` tsvector column on posts_post
+  with a GIN index, ranked with ts_rank_cd. The database keeps it current,
+  so the receivers have nothing to do.
+
+Both are created by migration 0005_post_search. Pages are keyset reads on
+(score, id) so deep pages cost the same as the first; the score of one
+query is stable as long as the matching set doesn't change between pages.
+"""
+import re
+
+from django.db import connections, router
+
+from .models import Post
+
+FTS_TABLE = "posts_post_fts"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH string: every word must appear, the last
+    one as a prefix ("hel" finds "hello"). Quoting each token means user input
+    can never be parsed as FTS syntax. Returns "" when there is nothing to search.
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return ""
+    return " ".join(f'"{t}"' for t in tokens) + "*"
+
+
+class SQLiteBackend:
+    def index(self, connection, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, content) VALUES (%s, %s)",
+                [post.pk, post.content],
+            )
+
+    def remove(self, connection, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [post_id])
+
+    def rebuild(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, content) SELECT id, content FROM posts_post")
+
+    def matches(self, connection, query):
+        expr = match_expression(query)
+        if not expr:
+            return None
+        # bm25() is lower-is-better; negate it so both backends sort score DESC
+        return (
+            f"SELECT rowid AS id, -bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [expr],
+        )
+
+
+class PostgresBackend:
+    def index(self, connection, post):
+        pass  # search_vector is a generated column
+
+    def remove(self, connection, post_id):
+        pass
+
+    def rebuild(self, connection):
+        pass
+
+    def matches(self, connection, query):
+        if not TOKEN_RE.search(query):
+            return None
+        # float8 so the score survives the round trip through the cursor exactly
+        return (
+            "SELECT p.id, ts_rank_cd(p.search_vector, q)::float8 AS score"
+            " FROM posts_post p, websearch_to_tsquery('english', %s) q"
+            " WHERE p.search_vector @@ q",
+            [query],
+        )
+
+
+BACKENDS = {"sqlite": SQLiteBackend(), "postgresql": PostgresBackend()}
+
+
+def backend_for(connection):
+    try:
+        return BACKENDS[connection.vendor]
+    except KeyError:
+        raise NotImplementedError(f"Post search is not available on {connection.vendor}")
+
+
+def index_post(post, using="default"):
+    connection = connections[using]
+    backend_for(connection).index(connection, post)
+
+
+def remove_post(post_id, using="default"):
+    connection = connections[using]
+    backend_for(connection).remove(connection, post_id)
+
+
+def rebuild_index(using="default"):
+    """Re-index every post, e.g. after rows were written with bulk_create()/update()."""
+    connection = connections[using]
+    backend_for(connection).rebuild(connection)
+
+
+def search_page(paginator, query):
+    """
+    One page of posts matching ``query``, best match first. Each post gets a
+    ``search_rank`` attribute, which RelevancePagination uses for its cursor.
+    """
+    connection = connections[router.db_for_read(Post)]
+    matches = backend_for(connection).matches(connection, query)
+    if matches is None:
+        return paginator.finish([])
+
+    sql, params = matches
+    op, direction = ("<", "DESC") if paginator.walk_desc else (">", "ASC")
+    where = ""
+    if paginator.cursor:
+        value, pk = paginator.cursor["v"], paginator.cursor["i"]
+        where = f" WHERE m.score {op} %s OR (m.score = %s AND m.id {op} %s)"
+        params = params + [value, value, pk]
+    sql = (
+        f"SELECT m.id, m.score FROM ({sql}) m{where}"
+        f" ORDER BY m.score {direction}, m.id {direction} LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [paginator.page_size + 1])
+        ranked = cursor.fetchall()
+
+    posts = (
+        Post.objects.using(connection.alias).select_related("author", "image_asset").order_by()
+        .in_bulk([pk for pk, _ in ranked])
+    )
+    rows = []
+    for pk, score in ranked:
+        post = posts.get(pk)
+        if post is not None:
+            post.search_rank = score
+            rows.append(post)
+    return paginator.finish(rows)
@@ -1,13 +1,45 @@
+from django.db import models
 from rest_framework import serializers
+from apps.images.serializers import ImageUploadMixin, ImageVariantsField
+from config.sparse import SparseFieldsMixin
+from .likes import Like, pending_likes
 from .models import Post, Comment
+from .previews import latest_comments
 from django.contrib.auth import get_user_model
 User = get_user_model()
 
+
+def liked_post_ids(request, posts):
+    """
+    Ids among ``posts`` liked by the requesting user, in one query. The
+    user's likes still in the write-behind buffer count too, and their
+    ``likes_count`` is adjusted to match.
+    """
+    if not request or not request.user.is_authenticated or not posts:
+        return set()
+    ids = [p.pk for p in posts]
+    stored = set(Like.objects.filter(user_id=request.user.pk, post_id__in=ids).values_list("post_id", flat=True))
+    pending = pending_likes(request.user.pk, ids)
+    for post in posts:
+        liked = pending.get(post.pk)
+        if liked is not None and liked != (post.pk in stored):
+            # not flushed yet
+            post.likes_count = max(post.likes_count + (1 if liked else -1), 0)
+    return {pk for pk in ids if pending.get(pk, pk in stored)}
+
 class UserSimpleSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("id", "username")
 
+class AuthorSerializer(serializers.ModelSerializer):
+    """The fuller author shown with ?expand=author."""
+    avatar_variants = ImageVariantsField(source="profile.avatar_asset", allow_null=True)
+
+    class Meta:
+        model = User
+        fields = ("id", "username", "first_name", "last_name", "avatar_variants")
+
 class CommentSerializer(serializers.ModelSerializer):
     author = UserSimpleSerializer(read_only=True)
     class Meta:
@@ -15,28 +47,56 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ("id","post","author","content","created_at")
         read_only_fields = ("id","author","created_at")
 
-class PostSerializer(serializers.ModelSerializer):
+class LatestCommentsField(serializers.Field):
+    """The post's latest comments (?expand=latest_comments), oldest first."""
+
+    def __init__(self, **kwargs):
+        kwargs.update(source="*", read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, post):
+        previews = getattr(self.parent, "comment_previews", None)
+        if previews is None:
+            previews = latest_comments([post.pk])
+        return CommentSerializer(previews.get(post.pk, []), many=True, context=self.context).data
+
+class PostListSerializer(serializers.ListSerializer):
+    """Resolves is_liked (and comment previews) for the whole page up front instead of once per post."""
+
+    def to_representation(self, data):
+        posts = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if "is_liked" in self.child.fields:
+            self.child.liked_ids = liked_post_ids(self.context.get("request"), posts)
+        if isinstance(self.child.fields.get("author"), AuthorSerializer):
+            # no-op where the queryset already select_related() them
+            models.prefetch_related_objects(posts, "author__profile__avatar_asset")
+        if "latest_comments" in self.child.fields:
+            self.child.comment_previews = latest_comments([p.pk for p in posts])
+        return super().to_representation(posts)
+
+class PostSerializer(SparseFieldsMixin, ImageUploadMixin, serializers.ModelSerializer):
     author = UserSimpleSerializer(read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source="image_asset")
+    image_asset_fields = {"image": "image_asset"}
 
     class Meta:
         model = Post
-        fields = ("id","author","content","image","likes_count","comments_count","is_liked","created_at","updated_at")
+        fields = ("id","author","content","image","image_variants","likes_count","comments_count","is_liked","created_at","updated_at")
         read_only_fields = ("id","author","likes_count","comments_count","is_liked","created_at","updated_at")
+        list_serializer_class = PostListSerializer
+        expandable_fields = {"author": (AuthorSerializer, {}), "latest_comments": (LatestCommentsField, {})}
+        # read from other tables, not from columns of the post
+        sparse_requires = {"is_liked": (), "latest_comments": ()}
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    def to_representation(self, instance):
+        if "is_liked" in self.fields and not isinstance(self.parent, PostListSerializer):
+            # single object (retrieve / create): before likes_count renders, which it may adjust
+            self.liked_ids = liked_post_ids(self.context.get("request"), [instance])
+        return super().to_representation(instance)
 
     def get_is_liked(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return False
-        return obj.likes.filter(pk=request.user.pk).exists()
+        return obj.pk in self.liked_ids
 
     def create(self, validated_data):
         request = self.context.get("request")
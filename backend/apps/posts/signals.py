@@ -1,8 +1,13 @@
 # backend/apps/posts/signals.py
-from django.db.models.signals import m2m_changed, post_save
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
 from django.apps import apps
 
+from apps.images.signals import variants_ready
+from apps.jobs.queue import enqueue
+from config.response_cache import bump
+
 def get_notification_model():
     """
     Try to find the Notification model in installed apps.
@@ -62,6 +67,23 @@ User = get_user_model()
 
 # Register m2m_changed using Post.likes.through if Post exists
 if Post is not None:
+    @receiver(post_save, sender=Post)
+    def post_created_fanout(sender, instance, created, **kwargs):
+        """Push new posts into followers' materialized home timelines."""
+        if created:
+            from .timeline import fan_out_post
+            fan_out_post(instance)
+
+    @receiver(post_save, sender=Post)
+    def post_search_index(sender, instance, using, **kwargs):
+        from .search import index_post
+        index_post(instance, using=using)
+
+    @receiver(post_delete, sender=Post)
+    def post_search_unindex(sender, instance, using, **kwargs):
+        from .search import remove_post
+        remove_post(instance.pk, using=using)
+
     try:
         LikesThrough = Post.likes.through
     except Exception:
@@ -69,39 +91,88 @@ if Post is not None:
 
     if LikesThrough:
         @receiver(m2m_changed, sender=LikesThrough)
-        def post_likes_changed(sender, instance, action, pk_set, **kwargs):
+        def post_likes_counter(sender, instance, action, reverse, pk_set, **kwargs):
+            """
+            Keep Post.likes_count in sync with the likes table using F() updates.
+            Removals and clears are measured in the pre_* phase so only rows that
+            actually existed are subtracted.
+            """
+            if action == "post_add" and pk_set:
+                if reverse:
+                    # user.liked_posts.add(*posts)
+                    Post.objects.filter(pk__in=pk_set).update(likes_count=F("likes_count") + 1)
+                else:
+                    Post.objects.filter(pk=instance.pk).update(likes_count=F("likes_count") + len(pk_set))
+            elif action == "pre_remove" and pk_set:
+                if reverse:
+                    instance._unliked_post_ids = list(
+                        sender.objects.filter(user_id=instance.pk, post_id__in=pk_set).values_list("post_id", flat=True)
+                    )
+                else:
+                    instance._unliked_count = sender.objects.filter(post_id=instance.pk, user_id__in=pk_set).count()
+            elif action == "pre_clear":
+                if reverse:
+                    instance._unliked_post_ids = list(
+                        sender.objects.filter(user_id=instance.pk).values_list("post_id", flat=True)
+                    )
+            elif action in ("post_remove", "post_clear"):
+                if reverse:
+                    post_ids = getattr(instance, "_unliked_post_ids", None)
+                    if post_ids:
+                        Post.objects.filter(pk__in=post_ids, likes_count__gt=0).update(likes_count=F("likes_count") - 1)
+                    instance._unliked_post_ids = None
+                elif action == "post_clear":
+                    Post.objects.filter(pk=instance.pk).update(likes_count=0)
+                else:
+                    removed = getattr(instance, "_unliked_count", 0)
+                    if removed:
+                        Post.objects.filter(pk=instance.pk, likes_count__gte=removed).update(
+                            likes_count=F("likes_count") - removed
+                        )
+                    instance._unliked_count = 0
+
+        @receiver(m2m_changed, sender=LikesThrough)
+        def post_likes_changed(sender, instance, action, reverse, pk_set, **kwargs):
             """
-            When users are added to Post.likes (action 'post_add'), create notifications
-            for the post author for each user who liked the post.
+            When users are added to Post.likes (action 'post_add'), queue one job
+            notifying the post author(s). The worker coalesces them into existing
+            unread rows, so the like request itself does no notification work.
             """
-            if action != "post_add":
+            if action != "post_add" or not pk_set:
                 return
 
             Notification = get_notification_model()
-            if Notification is None or User is None:
+            if Notification is None:
                 return
 
-            for user_id in pk_set or []:
-                try:
-                    actor = User.objects.get(pk=user_id)
-                except User.DoesNotExist:
-                    continue
-                author = getattr(instance, "author", None)
-                if not author or author.pk == actor.pk:
-                    continue
-                try:
-                    Notification.objects.create(
-                        user=author,
-                        actor=actor,
-                        text=f"{actor.username} liked your post",
-                        url=f"/posts/{instance.id}/",
-                    )
-                except Exception:
-                    # swallow errors to avoid crashing startup or the like action
-                    pass
+            if reverse:
+                # user.liked_posts.add(*posts): one actor, many posts
+                posts = Post.objects.filter(pk__in=pk_set).values_list("pk", "author_id")
+                events = [
+                    (author_id, instance.pk, Notification.VERB_LIKE, "posts.post", post_id, f"/posts/{post_id}/")
+                    for post_id, author_id in posts if author_id != instance.pk
+                ]
+            else:
+                events = [
+                    (instance.author_id, user_id, Notification.VERB_LIKE, "posts.post", instance.pk, f"/posts/{instance.pk}/")
+                    for user_id in pk_set if user_id != instance.author_id
+                ]
+            if events:
+                enqueue("messaging.notify", {"events": events})
 
 # Register comment created signal
 if Comment is not None:
+    @receiver(post_save, sender=Comment)
+    def comment_counter_incr(sender, instance, created, **kwargs):
+        if created:
+            Post.objects.filter(pk=instance.post_id).update(comments_count=F("comments_count") + 1)
+
+    @receiver(post_delete, sender=Comment)
+    def comment_counter_decr(sender, instance, **kwargs):
+        Post.objects.filter(pk=instance.post_id, comments_count__gt=0).update(
+            comments_count=F("comments_count") - 1
+        )
+
     @receiver(post_save, sender=Comment)
     def comment_created(sender, instance, created, **kwargs):
         """
@@ -111,26 +182,46 @@ if Comment is not None:
             return
 
         Notification = get_notification_model()
-        if Notification is None or User is None:
+        if Notification is None:
             return
 
-        try:
-            post = instance.post
-            author = getattr(post, "author", None)
-            actor = getattr(instance, "author", None)
-        except Exception:
+        post = instance.post
+        if post.author_id == instance.author_id:
             return
 
-        if not author or not actor or author.pk == actor.pk:
-            return
+        enqueue("messaging.notify", {"events": [
+            (post.author_id, instance.author_id, Notification.VERB_COMMENT, "posts.post", post.pk, f"/posts/{post.pk}/"),
+        ]})
 
-        try:
-            Notification.objects.create(
-                user=author,
-                actor=actor,
-                text=f'{actor.username} commented on your post: "{(instance.content[:80])}"',
-                url=f"/posts/{post.id}/",
-            )
-        except Exception:
-            # swallow to avoid bubbling up unexpected errors
-            pass
+
+# ---- response cache invalidation (config/response_cache.py) ----
+if Post is not None:
+    @receiver(post_save, sender=Post)
+    @receiver(post_delete, sender=Post)
+    def post_changed_bump(sender, instance, **kwargs):
+        bump(("post", instance.pk), ("posts",))
+
+    @receiver(variants_ready)
+    def post_image_ready_bump(sender, asset, **kwargs):
+        post_ids = Post.objects.filter(image_asset=asset).values_list("pk", flat=True)
+        bump(("posts",), *[("post", pk) for pk in post_ids])
+
+    if LikesThrough:
+        @receiver(m2m_changed, sender=LikesThrough)
+        def post_likes_bump(sender, instance, action, reverse, pk_set, **kwargs):
+            if action not in ("post_add", "pre_remove", "pre_clear"):
+                return
+            if not reverse:
+                post_ids = [instance.pk]
+            elif action == "pre_clear":
+                post_ids = list(sender.objects.filter(user_id=instance.pk).values_list("post_id", flat=True))
+            else:
+                post_ids = pk_set or ()
+            bump(("posts",), *[("post", pk) for pk in post_ids])
+
+if Comment is not None:
+    @receiver(post_save, sender=Comment)
+    @receiver(post_delete, sender=Comment)
+    def comment_changed_bump(sender, instance, **kwargs):
+        # comments_count is part of the post representation
+        bump(("post", instance.post_id), ("posts",))
@@ -0,0 +1,18 @@
+# backend/apps/posts/tasks.py
+from apps.jobs.queue import task
+from .likes import flush as flush_likes
+from .models import Post
+from .timeline import fan_out_to_followers
+
+
+@task("posts.fan_out")
+def fan_out(payload):
+    post = Post.objects.filter(pk=payload["post_id"]).first()
+    if post is not None:  # deleted before the worker got to it
+        fan_out_to_followers(post)
+
+
+@task("posts.like", batch=True)
+def apply_likes(payloads):
+    """Every claimed like/unlike is written in one flush (see likes.py)."""
+    flush_likes(payloads)
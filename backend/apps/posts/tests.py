@@ -1,3 +1,655 @@
-from django.test import TestCase
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from config import metrics, response_cache
+from config.explain import QueryPlanTestMixin
+from config.throttling import TokenBucketThrottle
+from apps.accounts.models import Profile
+from apps.images.models import ImageAsset
+from apps.jobs.models import Job
+from apps.jobs.queue import run_batch
+from .models import Post, Comment, TimelineEntry
+
+
+class PostCounterTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.fan = User.objects.create_user("fan", password="pw123456")
+        self.post = Post.objects.create(author=self.author, content="hello")
+        self.client = APIClient()
+        self.client.force_authenticate(self.fan)
+
+    def test_like_toggle_updates_counter(self):
+        res = self.client.post(f"/api/posts/{self.post.pk}/like/")
+        self.assertEqual(res.data, {"liked": True, "likes_count": 1})
+        res = self.client.post(f"/api/posts/{self.post.pk}/like/")
+        self.assertEqual(res.data, {"liked": False, "likes_count": 0})
+
+    def test_reverse_and_clear_keep_counter_in_sync(self):
+        self.fan.liked_posts.add(self.post)
+        self.post.likes.add(self.author)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
+        self.fan.liked_posts.clear()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.post.likes.remove(self.fan)  # not a liker any more, must not decrement
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_comment_create_and_delete(self):
+        res = self.client.post("/api/comments/", {"post": self.post.pk, "content": "nice"})
+        self.assertEqual(res.status_code, 201)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+        self.client.delete(f"/api/comments/{res.data['id']}/")
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_list_does_not_touch_likes_or_comments(self):
+        self.post.likes.add(self.fan)
+        Comment.objects.create(post=self.post, author=self.fan, content="c")
+        self.client.force_authenticate(None)
+        with self.assertNumQueries(1):
+            res = self.client.get("/api/posts/")
+        row = (res.data.get("results") if isinstance(res.data, dict) else res.data)[0]
+        self.assertEqual((row["likes_count"], row["comments_count"]), (1, 1))
+
+    def test_is_liked_costs_one_query_per_page(self):
+        for i in range(5):
+            post = Post.objects.create(author=self.author, content=str(i))
+            if i % 2:
+                post.likes.add(self.fan)
+        with self.assertNumQueries(2):
+            res = self.client.get("/api/posts/")
+        liked = {p["id"]: p["is_liked"] for p in res.data["results"]}
+        self.assertEqual(liked, {p.pk: p.likes_count == 1 for p in Post.objects.all()})
+
+    def test_recount_command_fixes_drift(self):
+        self.post.likes.add(self.fan)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=3)
+        call_command("recount_post_counters", chunk_size=1, stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.likes_count, self.post.comments_count), (1, 0))
+
+
+_RATES = {"likes.user": "2/min", "likes.ip": "3/min", "login.ip": "1/min", "login.username": "2/min"}
+
+
+@override_settings(REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=_RATES))
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(author=User.objects.create_user("author", password="pw123456"), content="x")
+        self.url = f"/api/posts/{self.post.pk}/like/"
+        self.users = [User.objects.create_user(f"u{i}", password="pw123456") for i in range(2)]
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(TokenBucketThrottle, "timer", lambda _: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def like(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.put(self.url)
+
+    def test_user_bucket_refills_and_sends_retry_after(self):
+        self.assertEqual([self.like(self.users[0]).status_code for _ in range(2)], [200, 200])
+        res = self.like(self.users[0])
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res["Retry-After"], "30")
+        self.assertEqual(self.like(self.users[0]).status_code, 429)  # rejections don't drain the bucket
+
+        self.now += 30
+        self.assertEqual(self.like(self.users[0]).status_code, 200)
+        self.assertEqual(self.like(self.users[0]).status_code, 429)
+
+    def test_ip_bucket_is_shared_between_users(self):
+        codes = [self.like(user).status_code for user in (self.users[0], self.users[1], self.users[1])]
+        self.assertEqual(codes, [200, 200, 200])
+        self.assertEqual(self.like(self.users[1]).status_code, 429)  # u1 still has a token, the IP doesn't
+        self.now += 60
+        self.assertEqual(self.like(self.users[0]).status_code, 200)
+
+    def test_login_is_limited_per_ip(self):
+        self.assertEqual(self.client.post("/api/accounts/login/", {"username": "u0", "password": "bad"}).status_code, 401)
+        res = self.client.post("/api/accounts/login/", {"username": "u0", "password": "pw123456"})
+        self.assertEqual(res.status_code, 429)
+        self.assertIn("Retry-After", res)
+
+    def test_login_ignores_forwarded_for(self):
+        def login(forwarded):
+            return self.client.post(
+                "/api/accounts/login/", {"username": "u0", "password": "bad"}, HTTP_X_FORWARDED_FOR=forwarded,
+            ).status_code
+
+        self.assertEqual(login("1.1.1.1"), 401)
+        self.assertEqual(login("2.2.2.2"), 429)  # the header doesn't pick a new IP bucket
+
+    @override_settings(REST_FRAMEWORK=dict(
+        settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES={"login.ip": "5/min", "login.username": "2/min"},
+    ))
+    def test_login_limits_each_username_per_address(self):
+        def login(ip, username="u0", password="bad"):
+            return self.client.post(
+                "/api/accounts/login/", {"username": username, "password": password}, REMOTE_ADDR=ip,
+            ).status_code
+
+        self.assertEqual([login("10.0.0.1") for _ in range(3)], [401, 401, 429])
+        self.assertEqual(login("10.0.0.1", username="u1"), 401)
+        # guessing from elsewhere doesn't lock the owner out
+        self.assertEqual(login("10.0.0.2", password="pw123456"), 200)
+
+
+class LikeBufferTests(TestCase):
+    def setUp(self):
+        cache.clear()  # pending likes
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.fans = [User.objects.create_user(f"fan{i}", password="pw123456") for i in range(4)]
+        self.post = Post.objects.create(author=self.author, content="viral")
+        self.url = f"/api/posts/{self.post.pk}/like/"
+
+    def as_user(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_requests_only_buffer_and_answer_with_new_state(self):
+        client = self.as_user(self.fans[0])
+        with self.assertNumQueries(3):  # post, own like row, job insert
+            res = client.put(self.url)
+        self.assertEqual(res.data, {"liked": True, "likes_count": 1})
+        self.assertFalse(self.post.likes.exists())
+        self.assertEqual(Job.objects.filter(name="posts.like").count(), 1)
+
+    def test_caller_reads_own_buffered_like(self):
+        client = self.as_user(self.fans[0])
+        detail = f"/api/posts/{self.post.pk}/"
+        etag = client.get(detail)["ETag"]
+        client.put(self.url)
+
+        def seen(c):
+            listed = c.get("/api/posts/").data["results"][0]
+            one = c.get(detail).data
+            return [(p["is_liked"], p["likes_count"]) for p in (listed, one)]
+
+        self.assertEqual(seen(client), [(True, 1), (True, 1)])
+        self.assertEqual(seen(self.as_user(self.fans[1])), [(False, 0), (False, 0)])
+        self.assertEqual(client.get(detail, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        run_batch()
+        self.assertEqual(seen(client), [(True, 1), (True, 1)])
+        client.delete(self.url)
+        self.assertEqual(seen(client), [(False, 0), (False, 0)])
+
+    def test_burst_is_flushed_in_bulk_with_last_write_winning(self):
+        for fan in self.fans:
+            self.as_user(fan).put(self.url)
+        self.as_user(self.fans[0]).put(self.url)  # idempotent
+        self.as_user(self.fans[1]).delete(self.url)
+
+        run_batch()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 3)
+        self.assertEqual(set(self.post.likes.values_list("username", flat=True)), {"fan0", "fan2", "fan3"})
+        # one coalesced notification job for the whole burst
+        self.assertEqual(len(Job.objects.get(name="messaging.notify").payload["events"]), 3)
+
+    def test_unlike_and_repeat_are_idempotent(self):
+        self.post.likes.add(self.fans[0])
+        client = self.as_user(self.fans[0])
+        self.assertEqual(client.put(self.url).data, {"liked": True, "likes_count": 1})
+        self.assertEqual(client.delete(self.url).data, {"liked": False, "likes_count": 0})
+        client.delete(self.url)
+        run_batch()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertFalse(self.post.likes.exists())
+
+    def test_flush_skips_deleted_posts(self):
+        self.as_user(self.fans[0]).put(self.url)
+        self.post.delete()
+        run_batch()
+        self.assertFalse(Job.objects.exists())
+
+    def test_anonymous_and_missing_post(self):
+        self.assertEqual(APIClient().put(self.url).status_code, 403)
+        self.assertEqual(self.as_user(self.fans[0]).put("/api/posts/999999/like/").status_code, 404)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.posts = [Post.objects.create(author=self.author, content=str(i)) for i in range(5)]
+        # force ties on created_at so the id tiebreaker is exercised
+        Post.objects.filter(pk__in=[p.pk for p in self.posts[1:4]]).update(created_at=self.posts[1].created_at)
+        self.client = APIClient()
+
+    def test_walks_forward_and_back_without_gaps(self):
+        res = self.client.get("/api/posts/?page_size=2")
+        seen = [p["id"] for p in res.data["results"]]
+        self.assertIsNone(res.data["previous"])
+        pages = [res.data]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            pages.append(res.data)
+            seen += [p["id"] for p in res.data["results"]]
+        expected = list(Post.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+        back = self.client.get(pages[1]["previous"])
+        self.assertEqual(back.data["results"], pages[0]["results"])
+
+    def test_garbage_cursor_is_404(self):
+        self.assertEqual(self.client.get("/api/posts/?cursor=nope").status_code, 404)
+
+    def test_comments_show_latest_slice_oldest_first(self):
+        post = self.posts[0]
+        comments = [Comment.objects.create(post=post, author=self.author, content=str(i)) for i in range(3)]
+        res = self.client.get(f"/api/comments/?post={post.pk}&page_size=2")
+        self.assertEqual([c["id"] for c in res.data["results"]], [comments[1].pk, comments[2].pk])
+        earlier = self.client.get(res.data["next"])
+        self.assertEqual([c["id"] for c in earlier.data["results"]], [comments[0].pk])
+
+
+@override_settings(TIMELINE_FANOUT_THRESHOLD=1, JOBS_EAGER=True)
+class HomeFeedTests(TestCase):
+    def setUp(self):
+        self.reader = User.objects.create_user("reader", password="pw123456")
+        self.friend = User.objects.create_user("friend", password="pw123456")
+        self.star = User.objects.create_user("star", password="pw123456")
+        self.stranger = User.objects.create_user("stranger", password="pw123456")
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+        self.client.post("/api/accounts/follow/friend/")
+        self.client.post("/api/accounts/follow/star/")
+        # a second follower pushes "star" over the threshold
+        other = APIClient()
+        other.force_authenticate(self.stranger)
+        other.post("/api/accounts/follow/star/")
+
+    def feed_ids(self):
+        return [p["id"] for p in self.client.get("/api/feed/").data["results"]]
+
+    def test_fan_out_on_write_and_read_merge(self):
+        mine = Post.objects.create(author=self.reader, content="me")
+        by_friend = Post.objects.create(author=self.friend, content="f")
+        by_star = Post.objects.create(author=self.star, content="s")
+        Post.objects.create(author=self.stranger, content="x")
+
+        self.assertTrue(TimelineEntry.objects.filter(user=self.reader, post=by_friend).exists())
+        self.assertFalse(TimelineEntry.objects.filter(post=by_star).exclude(user=self.star).exists())
+        self.assertEqual(self.feed_ids(), [by_star.pk, by_friend.pk, mine.pk])
+
+    def test_follow_state(self):
+        self.assertEqual(self.client.get("/api/accounts/follow/friend/").data, {"following": True})
+        self.client.delete("/api/accounts/follow/friend/")
+        self.assertEqual(self.client.get("/api/accounts/follow/friend/").data, {"following": False})
+        self.assertEqual(APIClient().get("/api/accounts/follow/friend/").status_code, 403)
+
+    def test_unfollow_and_rebuild(self):
+        by_friend = Post.objects.create(author=self.friend, content="f")
+        self.client.delete("/api/accounts/follow/friend/")
+        self.assertNotIn(by_friend.pk, self.feed_ids())
+
+        self.client.post("/api/accounts/follow/friend/")
+        TimelineEntry.objects.filter(user=self.reader).delete()
+        call_command("rebuild_timeline", "reader", stdout=StringIO())
+        self.assertEqual(self.feed_ids(), [by_friend.pk])
+
+
+@override_settings(JOBS_EAGER=True)
+class QueryPlanTests(QueryPlanTestMixin, TestCase):
+    """List endpoints must be index range reads: no full scans, no temp sorts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f"u{i}") for i in range(10)]
+        for i in range(100):
+            post = Post.objects.create(author=cls.users[i % 10], content="x")
+            Comment.objects.create(post=post, author=cls.users[(i + 1) % 10], content="c")
+            post.likes.add(cls.users[(i + 2) % 10])
+        cls.post = post
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def test_post_lists(self):
+        first = self.assertEfficientPlans(lambda: self.client.get("/api/posts/?page_size=5"))
+        self.assertEfficientPlans(lambda: self.client.get(first.data["next"]))
+        self.assertEfficientPlans(lambda: self.client.get(f"/api/posts/?author={self.users[3].pk}"))
+        self.assertEfficientPlans(lambda: self.client.get("/api/feed/"))
+
+    def test_comments_for_post(self):
+        self.assertEfficientPlans(lambda: self.client.get(f"/api/comments/?post={self.post.pk}"))
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.post = Post.objects.create(author=self.author, content="hello")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_post_list_and_detail(self):
+        for url in ("/api/posts/", f"/api/posts/{self.post.pk}/"):
+            etag = self.client.get(url)["ETag"]
+            with self.assertNumQueries(1):  # the rows themselves; no is_liked lookup, no serializing
+                res = self.revalidate(url, etag)
+            self.assertEqual(res.status_code, 304)
+            self.assertEqual(res["ETag"], etag)
+
+            # a like moves the counter but not updated_at
+            self.post.likes.add(self.author)
+            res = self.revalidate(url, etag)
+            self.assertEqual(res.status_code, 200)
+            self.assertTrue(res.data)
+            self.post.likes.remove(self.author)
+
+    def test_list_etag_follows_the_cursor(self):
+        Post.objects.create(author=self.author, content="second")
+        first = self.client.get("/api/posts/?page_size=1")
+        self.assertEqual(self.revalidate(first.data["next"], first["ETag"]).status_code, 200)
+
+    def test_profile(self):
+        url = "/api/accounts/profile/author/"
+        Profile.objects.create(user=self.author, bio="hi")
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+        self.client.patch("/api/accounts/profile/", {"bio": "changed"})
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        caches["responses"].clear()
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.fan = User.objects.create_user("fan", password="pw123456")
+        Profile.objects.create(user=self.author)
+        self.post = Post.objects.create(author=self.author, content="hello")
+        self.anon = APIClient()
+        self.client = APIClient()
+        self.client.force_authenticate(self.fan)
+
+    def test_anonymous_reads_are_served_from_cache(self):
+        before = response_cache.stats()
+        for url in ("/api/posts/", f"/api/posts/{self.post.pk}/", "/api/accounts/profile/author/"):
+            self.anon.get(url)
+            with self.assertNumQueries(0):
+                res = self.anon.get(url)
+            self.assertEqual(res.status_code, 200)
+        after = response_cache.stats()
+        self.assertEqual((after["hits"] - before["hits"], after["misses"] - before["misses"]), (3, 3))
+
+    def test_writes_invalidate(self):
+        detail = f"/api/posts/{self.post.pk}/"
+        self.anon.get("/api/posts/")
+        self.anon.get(detail)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{detail}like/")
+            self.client.post("/api/comments/", {"post": self.post.pk, "content": "c"})
+        self.assertEqual(self.anon.get("/api/posts/").data["results"][0]["likes_count"], 1)
+        self.assertEqual(self.anon.get(detail).data["comments_count"], 1)
+
+        self.anon.get("/api/accounts/profile/author/")
+        self.client.post("/api/accounts/follow/author/")
+        self.assertEqual(self.anon.get("/api/accounts/profile/author/").data["followers_count"], 1)
+
+    def test_rename_invalidates_posts_and_old_profile(self):
+        detail = f"/api/posts/{self.post.pk}/"
+        for url in ("/api/posts/", detail, "/api/accounts/profile/author/"):
+            self.anon.get(url)
+        etag = self.client.get(detail)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.username = "renamed"
+            self.author.save()
+        self.assertEqual(self.anon.get("/api/posts/").data["results"][0]["author"]["username"], "renamed")
+        self.assertEqual(self.anon.get(detail).data["author"]["username"], "renamed")
+        self.assertEqual(self.anon.get("/api/accounts/profile/author/").status_code, 404)
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_expanded_author_changes_invalidate(self):
+        url = "/api/posts/?expand=author"
+        self.anon.get(url)
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.first_name = "New"
+            self.author.save()
+        self.assertEqual(self.anon.get(url).data["results"][0]["author"]["first_name"], "New")
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+        asset = ImageAsset.objects.create(sha256="a" * 64, original="a.png", format="PNG", width=1, height=1, size=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = self.author.profile
+            profile.avatar_asset = asset
+            profile.save()
+        self.assertEqual(self.anon.get(url).data["results"][0]["author"]["avatar_variants"], {})  # pending, no longer null
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code, 200)
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as tmp, self.settings(CACHES=dict(
+            settings.CACHES,
+            responses={"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": tmp},
+        )):
+            self.anon.get("/api/posts/")
+            with self.assertNumQueries(0):
+                self.anon.get("/api/posts/")
+            self.post.delete()
+            self.assertEqual(self.anon.get("/api/posts/").data["results"], [])
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456", first_name="Ada")
+        Profile.objects.create(user=self.author)
+        Post.objects.create(author=self.author, content="hello")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_fields_prunes_output_and_columns(self):
+        with CaptureQueriesContext(connections["default"]) as ctx:
+            res = self.client.get("/api/posts/?fields=id,author.username,likes_count")
+        self.assertEqual(res.data["results"], [{"id": res.data["results"][0]["id"], "author": {"username": "author"}, "likes_count": 0}])
+        page_sql = ctx.captured_queries[0]["sql"]
+        self.assertNotIn('"content"', page_sql)
+        self.assertNotIn('"email"', page_sql)
+        # is_liked wasn't asked for, so there is no likes lookup either
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_expand_author(self):
+        with self.assertNumQueries(2):  # page + is_liked; the profile comes with the page
+            res = self.client.get("/api/posts/?expand=author")
+        post = res.data["results"][0]
+        self.assertEqual(post["author"]["first_name"], "Ada")
+        self.assertIsNone(post["author"]["avatar_variants"])
+        self.assertIn("content", post)
+        self.assertEqual(self.client.get("/api/feed/?expand=author").data["results"][0]["author"]["first_name"], "Ada")
+
+    def test_writes_ignore_fields(self):
+        res = self.client.post("/api/posts/?fields=id", {"content": "new"})
+        self.assertEqual(res.data["content"], "new")
+
+    def test_fast_renderer_matches_drf(self):
+        from rest_framework.renderers import JSONRenderer
+        from config import renderers
+
+        data = self.client.get("/api/posts/").data
+        fast = renderers.FastJSONRenderer().render(data)
+        self.assertEqual(fast, JSONRenderer().render(data))
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(renderers.FastJSONRenderer().render(data), fast)
+        self.assertEqual(self.client.post("/api/posts/", "{nope", content_type="application/json").status_code, 400)
+
+
+@override_settings(COMMENT_PREVIEW_SIZE=2)
+class CommentPreviewTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.posts = [Post.objects.create(author=self.author, content=f"p{i}") for i in range(3)]
+        for post in self.posts[:2]:
+            for i in range(3):
+                Comment.objects.create(post=post, author=self.author, content=f"{post.content}-c{i}")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_feed_embeds_latest_comments_in_one_query(self):
+        self.client.get("/api/feed/?expand=latest_comments")
+        with self.assertNumQueries(4):  # page + celebrity follows + is_liked + every post's previews
+            res = self.client.get("/api/feed/?expand=latest_comments")
+        previews = {p["content"]: [c["content"] for c in p["latest_comments"]] for p in res.data["results"]}
+        self.assertEqual(previews, {"p0": ["p0-c1", "p0-c2"], "p1": ["p1-c1", "p1-c2"], "p2": []})
+        self.assertNotIn("latest_comments", self.client.get("/api/feed/").data["results"][0])
+
+    def test_edited_comment_changes_the_etag(self):
+        url = f"/api/posts/{self.posts[0].pk}/?expand=latest_comments"
+        etag = self.client.get(url)["ETag"]
+        comment = self.posts[0].comments.last()
+        self.client.patch(f"/api/comments/{comment.pk}/", {"content": "edited"})
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["latest_comments"][-1]["content"], "edited")
+
+    def test_batch_endpoint(self):
+        ids = ",".join(str(p.pk) for p in self.posts)
+        with self.assertNumQueries(1):
+            res = self.client.get(f"/api/comments/batch/?posts={ids}&limit=1")
+        self.assertEqual(
+            {k: [c["content"] for c in v] for k, v in res.data.items()},
+            {str(self.posts[0].pk): ["p0-c2"], str(self.posts[1].pk): ["p1-c2"], str(self.posts[2].pk): []},
+        )
+        self.assertEqual(self.client.get("/api/comments/batch/").status_code, 400)
+
+
+@override_settings(METRICS_TOKEN="s3cret")
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        self.author = User.objects.create_user("author", password="pw123456")
+        Post.objects.create(author=self.author, content="hello")
+
+    def scrape(self, **headers):
+        return self.client.get("/api/metrics/", **headers)
+
+    def test_routes_are_recorded_and_protected(self):
+        self.client.get("/api/posts/")
+        self.client.get("/api/posts/999/")
+        self.assertEqual(self.scrape().status_code, 403)
+
+        body = self.scrape(HTTP_AUTHORIZATION="Bearer s3cret").content.decode()
+        self.assertIn('http_request_duration_seconds_count{route="api/posts/",method="GET"} 1', body)
+        self.assertIn('http_requests_total{route="api/posts/<pk>/",method="GET",status="404"} 1', body)
+        self.assertIn('db_queries_per_request_bucket{route="api/posts/",method="GET",le="1"} 1', body)
+
+        staff = User.objects.create_user("ops", password="pw123456", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.scrape().status_code, 200)
+
+    def test_repeated_query_shape_is_flagged(self):
+        def n_plus_one(request):
+            for post in Post.objects.all():
+                list(User.objects.filter(pk__in=[post.author_id, post.pk]))
+            return HttpResponse()
+
+        for i in range(5):
+            Post.objects.create(author=self.author, content=str(i))
+        middleware = metrics.MetricsMiddleware(n_plus_one)
+        with self.assertLogs("config.metrics", "WARNING") as logs:
+            middleware(RequestFactory().get("/x"))
+        self.assertIn("Probable N+1", logs.output[0])
+        self.assertIn(
+            'db_n_plus_one_requests_total{route="<unmatched>",method="GET"} 1',
+            metrics.REGISTRY.render(),
+        )
+
+
+class PostSearchTests(QueryPlanTestMixin, TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.client = APIClient()
+
+    def search(self, url):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return res.data
+
+    def test_ranked_and_paginated(self):
+        weak = Post.objects.create(author=self.author, content="a long post that mentions django once among many other words")
+        strong = Post.objects.create(author=self.author, content="django django django")
+        Post.objects.create(author=self.author, content="nothing to see")
+        extra = [Post.objects.create(author=self.author, content=f"django tip {i} and more words") for i in range(3)]
+
+        # matching is an FTS index lookup; only the matched rows get sorted by score
+        data = self.assertEfficientPlans(
+            lambda: self.search("/api/posts/search/?q=Django&page_size=2"),
+            allow=("USE TEMP B-TREE FOR ORDER BY",),
+        )
+        self.assertEqual(data["results"][0]["id"], strong.pk)
+        seen = [p["id"] for p in data["results"]]
+        while data["next"]:
+            data = self.search(data["next"])
+            seen += [p["id"] for p in data["results"]]
+        self.assertEqual(sorted(seen), sorted([weak.pk, strong.pk] + [p.pk for p in extra]))
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(seen[-1], weak.pk)
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.create(author=self.author, content="hello world")
+        self.assertEqual([p["id"] for p in self.search("/api/posts/search/?q=wor")["results"]], [post.pk])
+        post.content = "goodbye"
+        post.save()
+        self.assertEqual(self.search("/api/posts/search/?q=world")["results"], [])
+        post.delete()
+        self.assertEqual(self.search("/api/posts/search/?q=goodbye")["results"], [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        Post.objects.create(author=self.author, content="quotes and parens are fine")
+        self.assertEqual(len(self.search('/api/posts/search/?q="quotes" AND (')["results"]), 1)
+        self.assertEqual(self.client.get("/api/posts/search/?q=").status_code, 400)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(TransactionTestCase):
+    # the mirrored alias is a second connection, so rows must really be committed
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.author = User.objects.create_user("author", password="pw123456")
+        self.post = Post.objects.create(author=self.author, content="hello")
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def queries_on(self, method, url, **kwargs):
+        with CaptureQueriesContext(connections["default"]) as primary, \
+                CaptureQueriesContext(connections["replica"]) as replica:
+            getattr(self.client, method)(url, **kwargs)
+        return len(primary), len(replica)
+
+    def test_safe_reads_use_replica(self):
+        self.assertEqual(self.queries_on("get", "/api/posts/")[0], 0)
+        self.assertGreater(self.queries_on("get", f"/api/posts/{self.post.pk}/")[1], 0)
+        # not opted in
+        self.assertEqual(self.queries_on("get", "/api/feed/")[1], 0)
+
+    def test_writes_pin_client_to_primary(self):
+        _, replica = self.queries_on("post", "/api/comments/", data={"post": self.post.pk, "content": "c"})
+        self.assertEqual(replica, 0)
+        self.assertIn("db_pin", self.client.cookies)
+        self.assertEqual(self.queries_on("get", f"/api/comments/?post={self.post.pk}")[1], 0)
+
+        self.client.cookies.pop("db_pin")
+        self.assertEqual(self.queries_on("get", f"/api/comments/?post={self.post.pk}")[0], 0)
@@ -0,0 +1,134 @@
+# backend/apps/posts/timeline.py
+"""
+Home timeline maintenance.
+
+Posts by normal authors are pushed into each follower's TimelineEntry rows
+when they are created (fan-out-on-write). Authors with more followers than
+TIMELINE_FANOUT_THRESHOLD are skipped at write time and merged in when the
+feed is read (fan-out-on-read), so one celebrity post never means a million
+inserts.
+"""
+from django.conf import settings
+
+from apps.accounts.models import Follow, Profile
+from .models import Post, TimelineEntry
+
+BATCH_SIZE = 1000
+# how many of a newly followed author's posts to copy into the timeline
+FOLLOW_BACKFILL = 50
+
+
+def fanout_threshold():
+    return getattr(settings, "TIMELINE_FANOUT_THRESHOLD", 5000)
+
+
+def is_celebrity(user_id):
+    """True when the author has more followers than the fan-out threshold."""
+    return Profile.objects.filter(user_id=user_id, followers_count__gt=fanout_threshold()).exists()
+
+
+def celebrity_followees(user):
+    """Ids of the authors ``user`` follows whose posts are merged at read time."""
+    return list(
+        Follow.objects.filter(follower=user, followee__profile__followers_count__gt=fanout_threshold())
+        .values_list("followee_id", flat=True)
+    )
+
+
+def _entries(user_ids, post):
+    return [
+        TimelineEntry(user_id=uid, post_id=post.pk, author_id=post.author_id, created_at=post.created_at)
+        for uid in user_ids
+    ]
+
+
+def fan_out_post(post):
+    """
+    Put a new post in the author's own timeline right away (read-your-writes)
+    and queue the follower fan-out as a background job.
+    """
+    from apps.jobs.queue import enqueue
+
+    TimelineEntry.objects.bulk_create(_entries([post.author_id], post), ignore_conflicts=True)
+    if not is_celebrity(post.author_id):
+        enqueue("posts.fan_out", {"post_id": post.pk})
+
+
+def fan_out_to_followers(post):
+    """Push ``post`` into every follower's timeline in batches."""
+
+    follower_ids = Follow.objects.filter(followee_id=post.author_id).values_list("follower_id", flat=True)
+    batch = []
+    for uid in follower_ids.iterator(chunk_size=BATCH_SIZE):
+        batch.append(uid)
+        if len(batch) >= BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(_entries(batch, post), ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(_entries(batch, post), ignore_conflicts=True)
+
+
+def on_follow(follower, followee):
+    """Copy the followee's recent posts into the follower's timeline (unless read-merged)."""
+    if is_celebrity(followee.pk):
+        return
+    posts = Post.objects.filter(author=followee).order_by("-created_at")[:FOLLOW_BACKFILL]
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=follower.pk, post_id=p.pk, author_id=followee.pk, created_at=p.created_at)
+            for p in posts
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def on_unfollow(follower, followee):
+    TimelineEntry.objects.filter(user=follower, author=followee).delete()
+
+
+def home_feed_page(paginator, user):
+    """
+    Rows for one page of ``user``'s home feed: the materialized timeline merged
+    with the newest posts of celebrity followees. Each source is a single
+    keyset range read of page_size + 1 rows, so cost is O(page).
+    """
+    limit = paginator.page_size + 1
+    entries = paginator.seek(TimelineEntry.objects.filter(user=user), tiebreak_field="post_id")
+    candidates = [e.post for e in entries.select_related("post__author", "post__image_asset")[:limit]]
+
+    celebs = celebrity_followees(user)
+    if celebs:
+        pulled = paginator.seek(Post.objects.filter(author_id__in=celebs)).select_related("author", "image_asset")
+        candidates += list(pulled[:limit])
+
+    # an author who crossed the threshold may be in both sources
+    unique = {p.pk: p for p in candidates}.values()
+    rows = sorted(unique, key=lambda p: (p.created_at, p.pk), reverse=paginator.walk_desc)
+    return paginator.finish(rows[:limit])
+
+
+def rebuild_timeline(user, limit=500):
+    """
+    Recreate ``user``'s materialized timeline from scratch: their own posts plus
+    the most recent posts of every non-celebrity author they follow.
+    Returns the number of rows written.
+    """
+    celebs = set(celebrity_followees(user))
+    author_ids = [
+        uid for uid in Follow.objects.filter(follower=user).values_list("followee_id", flat=True)
+        if uid not in celebs
+    ]
+    author_ids.append(user.pk)
+
+    TimelineEntry.objects.filter(user=user).delete()
+    posts = (
+        Post.objects.filter(author_id__in=author_ids)
+        .order_by("-created_at", "-id")
+        .values_list("pk", "author_id", "created_at")[:limit]
+    )
+    rows = [
+        TimelineEntry(user_id=user.pk, post_id=pk, author_id=author_id, created_at=created_at)
+        for pk, author_id, created_at in posts
+    ]
+    TimelineEntry.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    return len(rows)
@@ -1,8 +1,11 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet, CommentViewSet
+from .views import PostViewSet, CommentViewSet, HomeFeedAPIView
 
 router = DefaultRouter()
 router.register(r"posts", PostViewSet, basename="post")
 router.register(r"comments", CommentViewSet, basename="comment")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("feed/", HomeFeedAPIView.as_view(), name="home-feed"),
+] + router.urls
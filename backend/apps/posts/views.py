@@ -1,8 +1,19 @@
-from rest_framework import viewsets, permissions
+from django.db import models, transaction
+from rest_framework import generics, viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from config.conditional import ConditionalGetMixin
+from config.db import ReplicaReadMixin
+from config.response_cache import ResponseCacheMixin, current_versions
+from config.sparse import narrow
+from config.throttling import bucket_throttles
+from config.pagination import ChronologicalPagination, NewestFirstPagination, RelevancePagination
+from .likes import Like, buffer_like, pending_likes
 from .models import Post, Comment
-from .serializers import PostSerializer, CommentSerializer
+from .previews import MAX_LIMIT, MAX_POSTS, latest_comments
+from .serializers import AuthorSerializer, PostSerializer, CommentSerializer
+from .search import search_page
+from .timeline import home_feed_page
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -10,37 +21,185 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
             return True
         return obj.author == request.user
 
-class PostViewSet(viewsets.ModelViewSet):
-    queryset = Post.objects.all().select_related("author").prefetch_related("likes","comments")
+class PostViewSet(ResponseCacheMixin, ConditionalGetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    # likes_count / comments_count are denormalized columns, no need to prefetch
+    queryset = Post.objects.all().select_related("author", "image_asset")
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
+    replica_actions = ("list", "retrieve", "search")
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        author_id = self.request.query_params.get("author")
+        if author_id and author_id.isdigit():
+            # a profile's posts, served by the (author, created_at, id) index
+            qs = qs.filter(author_id=author_id)
+        # ?fields= / ?expand=: load only what is rendered, plus what version() and the paginator read
+        return narrow(
+            qs, self.get_serializer(),
+            columns=("created_at", "updated_at", "likes_count", "comments_count", "author__username"),
+            related=("image_asset", "author"),
+        )
+
+    @staticmethod
+    def version(post):
+        # everything in PostSerializer that can change; counters and renames don't bump updated_at
+        asset_status = post.image_asset.status if post.image_asset_id else None
+        return (post.pk, post.updated_at, post.likes_count, post.comments_count, asset_status, post.author.username)
+
+    @staticmethod
+    def author_version(author):
+        # what AuthorSerializer adds for ?expand=author
+        profile = getattr(author, "profile", None)
+        asset = profile.avatar_asset if profile is not None and profile.avatar_asset_id else None
+        return (author.first_name, author.last_name, asset and asset.pk, asset and asset.status)
+
+    def versions(self, posts):
+        versions = [self.version(post) for post in posts]
+        if isinstance(self.get_serializer().fields.get("author"), AuthorSerializer):
+            # no-op where the queryset already select_related() them
+            models.prefetch_related_objects(posts, "author__profile__avatar_asset")
+            versions.append([self.author_version(post.author) for post in posts])
+        if "latest_comments" in self.get_serializer().fields:
+            # an edited comment doesn't move comments_count, but it does bump ("post", pk)
+            versions.append(current_versions([("post", post.pk) for post in posts]))
+        if self.request.user.is_authenticated:
+            # the caller's own buffered likes show in is_liked and likes_count
+            versions.append(pending_likes(self.request.user.pk, [post.pk for post in posts]))
+        return versions
+
+    def fetch_page(self):
+        return self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+
+    def serialize_page(self, page):
+        return self.get_paginated_response(self.get_serializer(page, many=True).data).data
+
+    def list(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            # is_liked is false for every anonymous reader, so they can share one copy
+            return self.cached_response(request, [("posts",)], lambda: self.serialize_page(self.fetch_page()))
+        page = self.fetch_page()
+        return self.not_modified(request, self.versions(page)) or Response(self.serialize_page(page))
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs[self.lookup_field]
+        if not request.user.is_authenticated and pk.isdigit():
+            return self.cached_response(
+                request, [("post", int(pk))], lambda: self.get_serializer(self.get_object()).data
+            )
+        post = self.get_object()
+        return self.not_modified(request, self.versions([post])) or Response(self.get_serializer(post).data)
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @action(
+        detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated],
+        throttle_classes=bucket_throttles("likes"),
+    )
     def like(self, request, pk=None):
         post = self.get_object()
         user = request.user
-        if post.likes.filter(pk=user.pk).exists():
-            post.likes.remove(user)
-            return Response({"liked": False, "likes_count": post.likes.count()})
-        else:
-            post.likes.add(user)
-            return Response({"liked": True, "likes_count": post.likes.count()})
-
-class CommentViewSet(viewsets.ModelViewSet):
+        with transaction.atomic():
+            # likes_count is adjusted by the m2m_changed receiver in signals.py
+            liked = not post.likes.filter(pk=user.pk).exists()
+            if liked:
+                post.likes.add(user)
+            else:
+                post.likes.remove(user)
+            post.refresh_from_db(fields=["likes_count"])
+        return Response({"liked": liked, "likes_count": post.likes_count})
+
+    @like.mapping.put
+    def put_like(self, request, pk=None):
+        """PUT /api/posts/<id>/like/ — idempotent like, written behind (see likes.py)."""
+        return self.set_like(request, pk, True)
+
+    @like.mapping.delete
+    def delete_like(self, request, pk=None):
+        """DELETE /api/posts/<id>/like/ — idempotent unlike."""
+        return self.set_like(request, pk, False)
+
+    def set_like(self, request, pk, liked):
+        post = generics.get_object_or_404(Post.objects.only("pk", "likes_count"), pk=pk)
+        was_liked = Like.objects.filter(post_id=post.pk, user_id=request.user.pk).exists()
+        # always queued: an opposite request may still be waiting in the buffer
+        buffer_like(post.pk, request.user.pk, liked)
+        # the caller's view of the count; other pending likes land with the flush
+        likes_count = max(post.likes_count + int(liked) - int(was_liked), 0)
+        return Response({"liked": liked, "likes_count": likes_count})
+
+    @action(detail=False, methods=["get"], pagination_class=RelevancePagination)
+    def search(self, request):
+        """GET /api/posts/search/?q=... — full-text search, best match first."""
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "q is required"}, status=400)
+        self.paginator.start(request)
+        page = search_page(self.paginator, query)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+class HomeFeedAPIView(generics.ListAPIView):
+    """
+    GET /api/feed/ — posts by the current user and the people they follow,
+    newest first, read from the materialized timeline.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NewestFirstPagination
+
+    def list(self, request, *args, **kwargs):
+        self.paginator.start(request)
+        page = home_feed_page(self.paginator, request.user)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+class CommentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all().select_related("author","post")
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
+    pagination_class = ChronologicalPagination
+    replica_actions = ("list", "retrieve", "batch")
 
     def get_queryset(self):
         qs = super().get_queryset()
         post_id = self.request.query_params.get("post")
         if post_id:
-            qs = qs.filter(post_id=post_id).order_by("created_at")
+            # ordering is applied by the keyset paginator
+            qs = qs.filter(post_id=post_id)
         return qs
 
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def batch(self, request):
+        """
+        GET /api/comments/batch/?posts=1,2,3&limit=3 — the latest ``limit``
+        comments of each post, in one query: {"1": [...], "2": [...], "3": []}.
+        """
+        post_ids = list(dict.fromkeys(
+            int(part) for part in request.query_params.get("posts", "").split(",") if part.strip().isdigit()
+        ))
+        if not post_ids:
+            return Response({"error": "posts is required"}, status=400)
+        if len(post_ids) > MAX_POSTS:
+            return Response({"error": f"at most {MAX_POSTS} posts per request"}, status=400)
+        limit = request.query_params.get("limit", "")
+        limit = min(int(limit), MAX_LIMIT) if limit.isdigit() else None
+        previews = latest_comments(post_ids, limit)
+        return Response({
+            str(post_id): self.get_serializer(previews.get(post_id, []), many=True).data for post_id in post_ids
+        })
+
+    def get_throttles(self):
+        if self.action == "create":
+            return [throttle() for throttle in bucket_throttles("comments")]
+        return super().get_throttles()
+
+    @transaction.atomic
     def perform_create(self, serializer):
+        # comments_count is bumped by the post_save receiver in the same transaction
         serializer.save(author=self.request.user)
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
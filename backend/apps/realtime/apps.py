@@ -0,0 +1,7 @@
+# backend/apps/realtime/apps.py
+from django.apps import AppConfig
+
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.realtime"
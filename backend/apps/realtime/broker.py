@@ -0,0 +1,227 @@
+# backend/apps/realtime/broker.py
+"""
+Pub/sub used to push events (new notifications, messages) to connected clients.
+
+The broker is chosen with ``REALTIME_BROKER`` (dotted path). The default,
+``DatabaseBroker``, passes events through a table, so anything published by
+``run_workers`` or another web process reaches every subscriber.
+``InMemoryBroker`` only reaches subscribers in the same process, which is
+enough for a single ASGI worker with JOBS_EAGER. Brokers backed by other
+shared infrastructure (Redis pub/sub, Postgres LISTEN/NOTIFY...) subclass
+``BaseBroker``.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Event
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Handle returned by ``BaseBroker.subscribe``; consumed by the SSE view."""
+
+    def __init__(self, broker, channel, max_pending=100):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.max_pending = max_pending
+
+    def offer(self, message):
+        # called on the subscriber's loop; slow clients drop events rather than grow unbounded
+        if self.queue.qsize() < self.max_pending:
+            self.queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Next message, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    def publish(self, channel, message):
+        """Deliver ``message`` (JSON-serializable dict) to every subscriber of ``channel``."""
+        raise NotImplementedError
+
+    def publish_many(self, channels, message):
+        """Deliver the same ``message`` on each of ``channels``."""
+        for channel in channels:
+            self.publish(channel, message)
+
+    def subscribe(self, channel):
+        """Return a Subscription for ``channel``. Must be called from a running event loop."""
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    """Process-local broker. publish() is thread-safe and may be called from sync code."""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for sub in subscribers:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, message)
+            except RuntimeError:
+                # loop already closed; the subscription is being torn down
+                pass
+
+    def subscribe(self, channel):
+        sub = Subscription(self, channel)
+        with self._lock:
+            self._subscribers[channel].add(sub)
+        return sub
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subs = self._subscribers.get(subscription.channel)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[subscription.channel]
+
+    def has_subscribers(self):
+        with self._lock:
+            return bool(self._subscribers)
+
+
+class DatabaseBroker(BaseBroker):
+    """
+    Cross-process broker on the Event table.
+
+    publish() inserts a row, publish_many() one row per channel in a single
+    INSERT. Each process with subscribers runs one poller thread that reads
+    the rows created since its previous read every ``poll_interval`` seconds
+    (a range scan on created_at) and hands them to an InMemoryBroker for its
+    own connections. The thread exits when the last subscriber leaves and
+    the next subscribe() starts a new one. Each read starts ``lookback``
+    earlier and skips rows it already delivered, so a row that commits
+    shortly after a later one isn't missed. Publishers delete rows older than
+    REALTIME_EVENT_TTL seconds, at most once per TTL.
+    """
+    poll_interval = 1.0
+    lookback = timedelta(seconds=5)
+
+    def __init__(self):
+        self.local = InMemoryBroker()
+        self._lock = threading.Lock()
+        self._poller = None
+        self._since = None
+        self._seen = {}
+        self._pruned_at = None
+
+    def publish(self, channel, message):
+        Event.objects.create(channel=channel, payload=message)
+        self._prune()
+
+    def publish_many(self, channels, message):
+        Event.objects.bulk_create([Event(channel=channel, payload=message) for channel in channels])
+        self._prune()
+
+    def subscribe(self, channel):
+        sub = self.local.subscribe(channel)
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._run, name="realtime-poller", daemon=True)
+                self._poller.start()
+        return sub
+
+    def unsubscribe(self, subscription):
+        self.local.unsubscribe(subscription)
+
+    def poll(self):
+        """Deliver the events published since the previous call. The first call only sets the starting point."""
+        now = timezone.now()
+        if self._since is None:
+            self._since = now
+            return 0
+        rows = (
+            Event.objects.filter(created_at__gte=self._since - self.lookback)
+            .order_by("id").values_list("id", "channel", "payload")
+        )
+        delivered = 0
+        for pk, channel, payload in rows:
+            if pk in self._seen:
+                continue
+            self._seen[pk] = now
+            self.local.publish(channel, payload)
+            delivered += 1
+        self._since = now
+        self._seen = {pk: at for pk, at in self._seen.items() if at >= now - 2 * self.lookback}
+        return delivered
+
+    def _run(self):
+        while True:
+            with self._lock:
+                # checked under the lock subscribe() starts pollers with, so a
+                # subscriber arriving now either keeps this thread or starts the next
+                if not self.local.has_subscribers():
+                    self._poller = None
+                    self._since = None
+                    self._seen = {}
+                    return
+            try:
+                self.poll()
+            except Exception:
+                logger.warning("realtime poll failed", exc_info=True)
+            finally:
+                close_old_connections()
+            time.sleep(self.poll_interval)
+
+    def _prune(self):
+        ttl = getattr(settings, "REALTIME_EVENT_TTL", 60)
+        now = time.monotonic()
+        if self._pruned_at is not None and now - self._pruned_at < ttl:
+            return
+        self._pruned_at = now
+        Event.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=ttl)).delete()
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        path = getattr(settings, "REALTIME_BROKER", "apps.realtime.broker.DatabaseBroker")
+        _broker = import_string(path)()
+    return _broker
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def publish_to_users(user_ids, event, data):
+    """Push ``event`` to each user once the current transaction commits."""
+    user_ids = list(user_ids)
+
+    def send():
+        try:
+            get_broker().publish_many([user_channel(uid) for uid in user_ids], {"event": event, "data": data})
+        except Exception:
+            logger.warning("realtime publish failed for users %s", user_ids, exc_info=True)
+
+    transaction.on_commit(send)
@@ -0,0 +1,16 @@
+# backend/apps/realtime/models.py
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Event(models.Model):
+    """A published realtime event, kept for REALTIME_EVENT_TTL seconds (see broker.DatabaseBroker)."""
+    channel = models.CharField(max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # pollers read the last few seconds; pruning deletes the oldest
+            models.Index(fields=["created_at"], name="realtime_event_created"),
+        ]
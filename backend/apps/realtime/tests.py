@@ -0,0 +1,113 @@
+import asyncio
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.messaging.models import Conversation
+from apps.posts.models import Post
+from .broker import BaseBroker, DatabaseBroker, InMemoryBroker
+from .models import Event
+
+
+class RecordingBroker(BaseBroker):
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, channel, message):
+        self.sent.append((channel, message["event"]))
+
+
+class InMemoryBrokerTests(SimpleTestCase):
+    def test_roundtrip_and_unsubscribe(self):
+        async def scenario():
+            broker = InMemoryBroker()
+            sub = broker.subscribe("user:1")
+            broker.publish("user:1", {"event": "x", "data": 1})
+            broker.publish("user:2", {"event": "y", "data": 2})
+            first = await sub.get(timeout=1)
+            second = await sub.get(timeout=0.01)
+            sub.close()
+            return first, second, dict(broker._subscribers)
+
+        first, second, remaining = asyncio.run(scenario())
+        self.assertEqual(first, {"event": "x", "data": 1})
+        self.assertIsNone(second)
+        self.assertEqual(remaining, {})
+
+
+class DatabaseBrokerTests(TestCase):
+    def test_events_from_other_processes_are_delivered_once(self):
+        broker = DatabaseBroker()
+        broker.local = RecordingBroker()
+        broker.poll()  # start point
+        DatabaseBroker().publish("user:1", {"event": "x", "data": 1})  # e.g. run_workers
+        self.assertEqual(broker.poll(), 1)
+        self.assertEqual(broker.poll(), 0)
+        self.assertEqual(broker.local.sent, [("user:1", "x")])
+
+    @override_settings(REALTIME_EVENT_TTL=60)
+    def test_publish_prunes_expired_events(self):
+        old = Event.objects.create(channel="user:1", payload={})
+        Event.objects.filter(pk=old.pk).update(created_at=old.created_at - timedelta(minutes=5))
+        DatabaseBroker().publish("user:1", {"event": "x", "data": 1})
+        self.assertEqual(Event.objects.count(), 1)
+
+
+    def test_publish_many_is_one_insert(self):
+        with self.assertNumQueries(2):  # the INSERT and the first prune
+            DatabaseBroker().publish_many(["user:1", "user:2", "user:3"], {"event": "x", "data": 1})
+        self.assertEqual(sorted(Event.objects.values_list("channel", flat=True)), ["user:1", "user:2", "user:3"])
+
+    def test_poller_stops_with_the_last_subscriber(self):
+        broker = DatabaseBroker()
+        broker.poll_interval = 0.01
+
+        async def scenario():
+            with mock.patch.object(broker, "poll"):
+                sub = broker.subscribe("user:1")
+                poller = broker._poller
+                sub.close()
+                await asyncio.to_thread(poller.join, 5)
+            return poller
+
+        self.assertFalse(asyncio.run(scenario()).is_alive())
+        self.assertIsNone(broker._poller)
+
+
+class PublishHookTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user("alice", password="pw123456")
+        self.bob = User.objects.create_user("bob", password="pw123456")
+        self.broker = RecordingBroker()
+        patcher = mock.patch("apps.realtime.broker.get_broker", return_value=self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_send_message_pushes_to_participants(self):
+        conv = Conversation.objects.create()
+        conv.participants.add(self.alice, self.bob)
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(f"/api/messaging/conversations/{conv.pk}/messages/send/", {"text": "hi"})
+        self.assertEqual(
+            sorted(self.broker.sent),
+            [(f"user:{self.alice.pk}", "message"), (f"user:{self.bob.pk}", "message")],
+        )
+
+    @override_settings(JOBS_EAGER=True)
+    def test_new_notification_is_pushed_to_recipient(self):
+        post = Post.objects.create(author=self.alice, content="x")
+        with self.captureOnCommitCallbacks(execute=True):
+            post.likes.add(self.bob)
+        self.assertEqual(self.broker.sent, [(f"user:{self.alice.pk}", "notification")])
+
+    def test_stream_requires_login(self):
+        self.assertEqual(self.client.get("/api/realtime/stream/").status_code, 401)
+
+    def test_stream_refuses_wsgi(self):
+        self.client.force_login(self.alice)
+        self.assertEqual(self.client.get("/api/realtime/stream/").status_code, 503)
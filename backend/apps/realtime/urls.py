@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("stream/", views.event_stream, name="realtime-stream"),
+]
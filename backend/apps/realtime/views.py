@@ -0,0 +1,51 @@
+# backend/apps/realtime/views.py
+import json
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+
+from .broker import get_broker, user_channel
+
+HEARTBEAT_SECONDS = 15
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def event_stream(request):
+    """
+    GET /api/realtime/stream/ — Server-Sent Events for the logged-in user.
+    Emits ``notification`` and ``message`` events as rows are created, plus a
+    comment line every HEARTBEAT_SECONDS to keep proxies from closing the
+    connection.
+
+    Needs an ASGI server (uvicorn config.asgi:application). Under WSGI an
+    endless stream would hold the worker forever and never reach the client,
+    so the view answers 503 instead. EventSource doesn't retry after that,
+    and the client polls.
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Not authenticated"}, status=401)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "Realtime stream needs an ASGI server."}, status=503)
+
+    async def stream():
+        sub = get_broker().subscribe(user_channel(user.pk))
+        try:
+            yield _sse("ready", {"user": user.pk})
+            while True:
+                message = await sub.get(timeout=HEARTBEAT_SECONDS)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield _sse(message["event"], message["data"])
+        finally:
+            sub.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # disable nginx buffering
+    return response
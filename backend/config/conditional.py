@@ -0,0 +1,53 @@
+# backend/config/conditional.py
+"""
+Conditional GET for DRF views.
+
+A view computes a fingerprint of what it is about to return from values it
+has to load anyway (row timestamps, counters, ids) or from one cheap
+aggregate lookup, and calls ``not_modified()`` before serializing. If the
+client's If-None-Match / If-Modified-Since still match, the view returns
+the 304 straight away and skips serialization (and any per-page lookups the
+serializer would do). Otherwise the validators are attached to the full
+response in ``finalize_response``.
+
+Last-Modified is only sent when the caller passes a timestamp that moves on
+*every* change to the representation. For posts that isn't true (likes and
+comments don't touch updated_at), so those views rely on the ETag alone.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def fingerprint(*parts):
+    """Weak ETag over ``parts`` (anything with a stable repr)."""
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return "W/" + quote_etag(digest)
+
+
+class ConditionalGetMixin:
+    _validators = None
+
+    def not_modified(self, request, parts, last_modified=None):
+        """
+        Return a 304 response if the client already has this representation,
+        else None. ``parts`` should cover everything the body depends on; the
+        requesting user and the full path (cursor, filters) are always added.
+        """
+        user_id = request.user.pk if request.user.is_authenticated else None
+        etag = fingerprint(user_id, request.get_full_path(), parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        self._validators = (etag, timestamp)
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._validators and response.status_code in (200, 304):
+            etag, timestamp = self._validators
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            # let browsers keep the body but always revalidate it
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,101 @@
+# backend/config/db.py
+"""
+Read-replica routing.
+
+Writes always go to ``default``. Reads go to one of ``DATABASE_REPLICAS``
+only while a view that opted in with ``ReplicaReadMixin`` is handling a
+safe-method list/retrieve request, and never when:
+
+- the client wrote something within the last ``REPLICA_PIN_SECONDS``
+  (a short-lived cookie set by ``ReplicaPinMiddleware``), so a user always
+  sees their own posts, comments and messages despite replication lag;
+- the current request already wrote (``db_for_write`` pins it);
+- a transaction is open on ``default``.
+
+Everything else (auth, sessions, admin, jobs, management commands) reads
+from the primary. With no replicas configured the router is a no-op.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework import permissions
+
+PIN_COOKIE = "db_pin"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside this block, whatever the view opted into."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if not aliases or not _replica_reads.get() or _pinned.get():
+            return "default"
+        if connections["default"].in_atomic_block:
+            return "default"
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        # anything read after a write in the same request must see it
+        _pinned.set(True)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replicas()
+
+
+class ReplicaPinMiddleware:
+    """Scopes routing state to the request and pins recent writers to the primary."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reads_token = _replica_reads.set(False)
+        pin_token = _pinned.set(PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(reads_token)
+            _pinned.reset(pin_token)
+        if request.method not in permissions.SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE, "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 5),
+                httponly=True, samesite="Lax",
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """DRF view mixin: serve safe ``replica_actions`` from a read replica."""
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        # authentication runs in super().initial() and stays on the primary
+        super().initial(request, *args, **kwargs)
+        action = getattr(self, "action", None) or "list"
+        if request.method in permissions.SAFE_METHODS and action in self.replica_actions:
+            _replica_reads.set(True)
@@ -0,0 +1,69 @@
+# backend/config/explain.py
+"""
+Query-plan checks for tests.
+
+    class MyTests(QueryPlanTestMixin, TestCase):
+        def test_list(self):
+            self.assertEfficientPlans(lambda: self.client.get("/api/posts/"))
+
+Every SELECT the callable runs is captured and re-run through EXPLAIN. The
+assertion fails if any plan contains a full table scan or a temporary sort.
+An ordered index walk ("SCAN t USING INDEX i" on SQLite) is fine because
+keyset pages stop after LIMIT rows.
+"""
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+SQLITE_BAD = ("USE TEMP B-TREE",)
+POSTGRES_BAD = ("Seq Scan", "Sort  (", "Sort (")
+
+
+def explain(sql, using="default"):
+    """Return the plan for ``sql`` as a list of text lines."""
+    connection = connections[using]
+    prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        rows = cursor.fetchall()
+    if connection.vendor == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def plan_problems(plan, vendor, allow=()):
+    """Lines of ``plan`` that indicate a full scan or a temp sort (minus ``allow`` substrings)."""
+    problems = []
+    for line in plan:
+        if vendor == "sqlite":
+            full_scan = line.startswith("SCAN ") and "INDEX" not in line and "CONSTANT ROW" not in line
+            bad = full_scan or any(marker in line for marker in SQLITE_BAD)
+        else:
+            bad = any(marker in line for marker in POSTGRES_BAD)
+        if bad and not any(a in line for a in allow):
+            problems.append(line)
+    return problems
+
+
+class QueryPlanTestMixin:
+    """TestCase mixin adding assertEfficientPlans()."""
+
+    def assertEfficientPlans(self, func, using="default", allow=()):
+        """
+        Run ``func`` and EXPLAIN every SELECT it issued. ``allow`` lists plan
+        substrings to tolerate, for known and bounded exceptions.
+        """
+        connection = connections[using]
+        with CaptureQueriesContext(connection) as ctx:
+            result = func()
+        failures = []
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            problems = plan_problems(explain(sql, using=using), connection.vendor, allow)
+            if problems:
+                failures.append(f"{sql}\n  -> " + "\n  -> ".join(problems))
+        if failures:
+            self.fail("Inefficient query plans:\n\n" + "\n\n".join(failures))
+        return result
@@ -0,0 +1,234 @@
+# backend/config/metrics.py
+"""
+Per-route request metrics, exposed in Prometheus text format.
+
+``MetricsMiddleware`` times every request and wraps each database connection
+with ``execute_wrapper`` to count queries and DB time. A SQL shape (the
+statement with its ``IN (...)`` lists collapsed) that runs
+METRICS_N_PLUS_ONE_THRESHOLD or more times in one request is counted as a
+probable N+1 and logged once per route and shape.
+
+Aggregates live in this process (a dict of fixed-bucket histograms behind a
+lock). Per request that costs two clock reads per query and one short
+locked update, which is cheap enough to leave on. With several worker
+processes, scrape each process or sum on the Prometheus side.
+
+GET /api/metrics/ requires a staff session or ``Authorization: Bearer
+<METRICS_TOKEN>``.
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from config.response_cache import stats as response_cache_stats
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+MAX_LOGGED_SHAPES = 1000
+# anything else is reported as OTHER so clients can't mint new label values
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+_IN_LIST = re.compile(r"\((?:%s|\?)(?:, (?:%s|\?))*\)")
+_NAMED_GROUP = re.compile(r"\(\?P<(\w+)>[^)]*\)")
+
+
+@lru_cache(maxsize=2048)
+def sql_shape(sql):
+    return _IN_LIST.sub("(...)", sql)
+
+
+def route_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.route:
+        return "<unmatched>"
+    # router regexes -> "api/posts/<pk>/"
+    return _NAMED_GROUP.sub(r"<\1>", match.route).replace("^", "").replace("$", "")
+
+
+def n_plus_one_threshold():
+    return getattr(settings, "METRICS_N_PLUS_ONE_THRESHOLD", 5)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, n in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += n
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class RouteStats:
+    __slots__ = ("duration", "queries", "db_seconds", "n_plus_one", "statuses")
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_seconds = 0.0
+        self.n_plus_one = 0
+        self.statuses = Counter()
+
+
+class QueryRecorder:
+    """execute_wrapper counting queries, DB time and repeated shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold):
+        return [(shape, n) for shape, n in self.shapes.items() if n >= threshold]
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._logged = set()
+
+    def observe(self, route, method, status, duration, recorder):
+        repeated = recorder.repeated(n_plus_one_threshold())
+        with self._lock:
+            stats = self._routes.get((route, method))
+            if stats is None:
+                stats = self._routes[(route, method)] = RouteStats()
+            stats.duration.observe(duration)
+            stats.queries.observe(recorder.count)
+            stats.db_seconds += recorder.seconds
+            stats.statuses[status] += 1
+            if repeated:
+                stats.n_plus_one += 1
+            to_log = []
+            for shape, n in repeated:
+                key = (route, method, shape)
+                if key not in self._logged and len(self._logged) < MAX_LOGGED_SHAPES:
+                    self._logged.add(key)
+                    to_log.append((shape, n))
+        for shape, n in to_log:
+            logger.warning("Probable N+1 on %s %s: %d x %s", method, route, n, shape)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._logged.clear()
+
+    def render(self):
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP http_request_duration_seconds Request latency by route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (route, method), stats in routes:
+                lines.extend(stats.duration.samples("http_request_duration_seconds", _labels(route, method)))
+            lines += [
+                "# HELP http_requests_total Requests by route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (route, method), stats in routes:
+                for status, n in sorted(stats.statuses.items()):
+                    lines.append(f'http_requests_total{{{_labels(route, method)},status="{status}"}} {n}')
+            lines += [
+                "# HELP db_queries_per_request Database queries issued per request.",
+                "# TYPE db_queries_per_request histogram",
+            ]
+            for (route, method), stats in routes:
+                lines.extend(stats.queries.samples("db_queries_per_request", _labels(route, method)))
+            lines += [
+                "# HELP db_query_seconds_total Time spent in database queries.",
+                "# TYPE db_query_seconds_total counter",
+            ]
+            for (route, method), stats in routes:
+                lines.append(f"db_query_seconds_total{{{_labels(route, method)}}} {stats.db_seconds:.6f}")
+            lines += [
+                "# HELP db_n_plus_one_requests_total Requests that repeated one SQL shape at least the N+1 threshold.",
+                "# TYPE db_n_plus_one_requests_total counter",
+            ]
+            for (route, method), stats in routes:
+                lines.append(f"db_n_plus_one_requests_total{{{_labels(route, method)}}} {stats.n_plus_one}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(route, method):
+    return f'route="{_escape(route)}",method="{method}"'
+
+
+REGISTRY = Registry()
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+        method = request.method if request.method in METHODS else "OTHER"
+        REGISTRY.observe(route_label(request), method, response.status_code, duration, recorder)
+        return response
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    bearer = request.headers.get("Authorization", "")
+    allowed = (request.user.is_authenticated and request.user.is_staff) or (
+        token and constant_time_compare(bearer, f"Bearer {token}")
+    )
+    if not allowed:
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    body = REGISTRY.render()
+    cache = response_cache_stats()
+    body += (
+        "# HELP response_cache_events_total Response cache lookups by outcome.\n"
+        "# TYPE response_cache_events_total counter\n"
+        f'response_cache_events_total{{outcome="hit"}} {cache["hits"]}\n'
+        f'response_cache_events_total{{outcome="miss"}} {cache["misses"]}\n'
+    )
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,181 @@
+# backend/config/pagination.py
+"""
+Keyset ("seek") pagination shared by every list endpoint.
+
+Pages are addressed by an opaque cursor holding the (timestamp, id) of the
+row at the edge of the previous page, so each page is a single indexed
+range query and no OFFSET is ever issued.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination keyed on (<ordering_field>, id).
+
+    - ``descending``: direction the pages walk (True = newest first).
+    - ``reverse_display``: flip each page before returning it. With
+      ``descending`` this gives chat-like lists where the first page is the
+      most recent slice, shown oldest-first, and ``next`` means "load earlier".
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    ordering_field = "created_at"
+    descending = True
+    reverse_display = False
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.start(request)
+        rows = list(self.seek(queryset)[: self.page_size + 1])
+        return self.finish(rows)
+
+    def start(self, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        # walk "backwards" when following a previous link
+        self.reverse = bool(self.cursor and self.cursor["r"])
+        self.walk_desc = self.descending != self.reverse
+
+    def seek(self, queryset, tiebreak_field="id"):
+        """Apply the cursor range filter and walk ordering (caller slices page_size + 1)."""
+        if self.cursor:
+            queryset = queryset.filter(self._seek_filter(self.cursor, tiebreak_field))
+        prefix = "-" if self.walk_desc else ""
+        return queryset.order_by(f"{prefix}{self.ordering_field}", f"{prefix}{tiebreak_field}")
+
+    def finish(self, rows):
+        """Take rows in walk order (up to page_size + 1) and return the page to serialize."""
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        # rows are now in canonical order (as if walking forward)
+        self.has_next = has_more if not self.reverse else self.cursor is not None
+        self.has_previous = has_more if self.reverse else self.cursor is not None
+        self.first = rows[0] if rows else None
+        self.last = rows[-1] if rows else None
+
+        if self.reverse_display:
+            rows.reverse()
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self._link_for(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            # stepped past the end, the previous page starts at the current cursor
+            cursor = self.cursor
+            return self._encode_link({"v": self.encode_value(cursor["v"]), "i": cursor["i"], "r": not cursor["r"]})
+        return self._link_for(self.first, reverse=True)
+
+    # ---- cursor helpers ----
+
+    def _seek_filter(self, cursor, tiebreak_field):
+        op = "lt" if self.walk_desc else "gt"
+        value = cursor["v"]
+        return Q(**{f"{self.ordering_field}__{op}": value}) | Q(
+            **{self.ordering_field: value, f"{tiebreak_field}__{op}": cursor["i"]}
+        )
+
+    def _link_for(self, obj, reverse):
+        value = getattr(obj, self.ordering_field)
+        return self._encode_link({"v": self.encode_value(value), "i": obj.pk, "r": reverse})
+
+    def _encode_link(self, cursor):
+        raw = json.dumps(cursor, separators=(",", ":")).encode()
+        token = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            cursor = json.loads(raw)
+            return {"v": self.decode_value(cursor["v"]), "i": int(cursor["i"]), "r": bool(cursor.get("r"))}
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_value(self, value):
+        return value.isoformat()
+
+    def decode_value(self, raw):
+        value = parse_datetime(raw)
+        if value is None:
+            raise ValueError
+        return value
+
+    def to_html(self):
+        return ""
+
+
+class NewestFirstPagination(KeysetCursorPagination):
+    """Default: newest rows first (posts, notifications)."""
+
+
+class ChronologicalPagination(KeysetCursorPagination):
+    """Latest slice first, shown oldest-first; ``next`` loads earlier rows (messages, comments)."""
+    reverse_display = True
+
+
+class RecentlyUpdatedPagination(KeysetCursorPagination):
+    """Inbox ordering on updated_at."""
+    ordering_field = "updated_at"
+
+
+class RelevancePagination(KeysetCursorPagination):
+    """Search results, best match first, keyed on the float ``search_rank`` set by the search backend."""
+    ordering_field = "search_rank"
+
+    def encode_value(self, value):
+        return value
+
+    def decode_value(self, raw):
+        return float(raw)
@@ -0,0 +1,131 @@
+# backend/config/response_cache.py
+"""
+Versioned cache for public read responses.
+
+Every cacheable resource has a version number stored in the "responses"
+cache, e.g. ("post", 42), ("posts",) for post lists, ("profile", "alice").
+A cached response's key embeds the current versions of everything it was
+built from, so invalidation is one ``bump()`` per write: old entries
+become unreachable and simply expire. Bumps are repeated on transaction
+commit, so pre-write data cached under a new version can't outlive the write.
+
+A version that was evicted is re-seeded from the clock rather than from 1,
+so it can't collide with a number an old entry was stored under.
+
+``locmem`` keeps entries (and versions) per process and is only correct
+with a single process that also runs the jobs (JOBS_EAGER): bumps made by
+``run_workers`` never reach it. ``file`` shares them between the processes
+of one host and ``redis`` between hosts. Unless jobs run inline, the default
+RESPONSE_CACHE_BACKEND is a shared one.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from config.db import use_primary
+
+CACHE_ALIAS = "responses"
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(resource):
+    return "rv:" + ":".join(str(part) for part in resource)
+
+
+def _seed():
+    return time.time_ns()
+
+
+def current_versions(resources):
+    cache = _cache()
+    keys = [_version_key(r) for r in resources]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _seed(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def bump(*resources):
+    """
+    Invalidate every cached response built from ``resources``: right away, and
+    again when the transaction commits, discarding anything a reader cached
+    from pre-commit rows in between.
+    """
+    keys = [_version_key(r) for r in resources]
+
+    def apply():
+        cache = _cache()
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _seed(), timeout=None)
+
+    if transaction.get_connection().in_atomic_block:
+        apply()
+    transaction.on_commit(apply)
+
+
+def record(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def stats():
+    with _stats_lock:
+        hits, misses = _stats["hit"], _stats["miss"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None}
+
+
+class ResponseCacheMixin:
+    """
+    View mixin for ConditionalGetMixin views. ``cached_response()`` answers
+    from the cache (or with a 304) without touching the database on a hit.
+    """
+
+    def cached_response(self, request, resources, build):
+        """``build()`` returns the response data to cache for this URL and these resource versions."""
+        versions = current_versions(resources)
+        raw = repr((request.build_absolute_uri(), resources, versions))
+        key = "resp:" + hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+        # the key already identifies this representation, so it doubles as the ETag
+        not_modified = self.not_modified(request, key)
+        if not_modified:
+            return not_modified
+
+        cache = _cache()
+        data = cache.get(key)
+        if data is not None:
+            record("hit")
+            return Response(data)
+        record("miss")
+        # a lagging replica could hand us pre-write rows right after the version moved
+        with use_primary():
+            data = build()
+        cache.set(key, data, getattr(settings, "RESPONSE_CACHE_TTL", 300))
+        return Response(data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Hit/miss counters of this process's response cache."""
+    return Response(dict(stats(), backend=settings.CACHES[CACHE_ALIAS]["BACKEND"]))
@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -19,9 +20,14 @@ INSTALLED_APPS = [
     "apps.accounts",
     "apps.posts",
     "apps.messaging",
+    "apps.jobs",
+    "apps.realtime",
+    "apps.images",
+    "apps.bench",
 ]
 
 MIDDLEWARE = [
+    "config.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -29,6 +35,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "config.db.ReplicaPinMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -53,13 +60,142 @@ DATABASES = {
     "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"}
 }
 
+# Aliases in DATABASES that serve replica reads (see config/db.py). Empty
+# means every query goes to "default".
+DATABASE_ROUTERS = ["config.db.ReplicaRouter"]
+DATABASE_REPLICAS = [a for a in os.environ.get("DATABASE_REPLICAS", "").split(",") if a]
+# After a write, the client reads from the primary for this many seconds.
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
+    # orjson when installed, DRF's stdlib json otherwise (config/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.NewestFirstPagination",
+    "PAGE_SIZE": 20,
+    # token buckets per endpoint scope, see config/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "login.ip": "10/min",
+        "login.username": "30/hour",
+        "likes.user": "120/min",
+        "likes.ip": "600/min",
+        "comments.user": "20/min",
+        "comments.ip": "120/min",
+        "messages.user": "60/min",
+        "messages.ip": "300/min",
+    },
+    # Trusted proxies in front of the app that append to X-Forwarded-For. With
+    # 0 the IP buckets key on REMOTE_ADDR and the header is ignored.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
 }
 
+# Authors with more followers than this are merged into home feeds at read
+# time instead of being fanned out to every follower's timeline on write.
+TIMELINE_FANOUT_THRESHOLD = int(os.environ.get("TIMELINE_FANOUT_THRESHOLD", 5000))
+
+# Retention enforced by `manage.py apply_retention`; 0 keeps rows forever.
+# Read notifications are deleted after NOTIFICATION_RETENTION_DAYS, messages
+# move to the archive table after MESSAGE_ARCHIVE_DAYS.
+NOTIFICATION_RETENTION_DAYS = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", 90))
+MESSAGE_ARCHIVE_DAYS = int(os.environ.get("MESSAGE_ARCHIVE_DAYS", 180))
+RETENTION_BATCH_SIZE = int(os.environ.get("RETENTION_BATCH_SIZE", 500))
+
+# Comments embedded per post with ?expand=latest_comments.
+COMMENT_PREVIEW_SIZE = int(os.environ.get("COMMENT_PREVIEW_SIZE", 3))
+
+# Unread like/comment notifications on the same target touched within this
+# many seconds are folded into one row ("alice and 41 others ..."). 0 disables.
+NOTIFICATION_COALESCE_WINDOW = int(os.environ.get("NOTIFICATION_COALESCE_WINDOW", 6 * 3600))
+
+# Run background jobs inline instead of queueing them for `manage.py run_workers`.
+JOBS_EAGER = os.environ.get("JOBS_EAGER", "") == "1"
+
+# Cache backends: "locmem" is per process, "file" is shared by the processes
+# of one host, "redis" by every host (REDIS_URL; needs the redis package).
+# A cache that `run_workers` writes and the web processes read must be
+# shared; locmem is only right for tests and for a single process running
+# jobs inline (JOBS_EAGER=1).
+TESTING = sys.argv[1:2] == ["test"]
+REDIS_URL = os.environ.get("REDIS_URL", "")
+SHARED_CACHE_BACKEND = "redis" if REDIS_URL else "file"
+
+
+def _cache(backend, name):
+    return {
+        "locmem": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": name,
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        },
+        "file": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": BASE_DIR / "cache" / name,
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        },
+        "redis": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL, "KEY_PREFIX": name},
+    }[backend]
+
+
+# Public read responses are cached under per-resource version numbers
+# (config/response_cache.py). The worker bumps them too (buffered likes,
+# finished image variants), so they are shared unless jobs run inline.
+RESPONSE_CACHE_BACKEND = os.environ.get(
+    "RESPONSE_CACHE_BACKEND", "locmem" if JOBS_EAGER or TESTING else SHARED_CACHE_BACKEND
+)
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", 300))
+# Same choice for the session cache in front of django_session. With
+# "locmem" a logout in one worker process isn't seen by the others.
+SESSION_CACHE_BACKEND = os.environ.get(
+    "SESSION_CACHE_BACKEND", "locmem" if JOBS_EAGER or TESTING else SHARED_CACHE_BACKEND
+)
+# Throttle buckets and users' pending likes; prod.py makes it shared.
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
+CACHES = {
+    "default": _cache(CACHE_BACKEND, "default"),
+    "responses": _cache(RESPONSE_CACHE_BACKEND, "responses"),
+    "sessions": _cache(SESSION_CACHE_BACKEND, "sessions"),
+}
+
+# Sessions are read from the cache and written through to the database;
+# the logged-in user is kept in process memory for AUTH_USER_CACHE_TTL
+# seconds (apps/accounts/backends.py). Together they make an authenticated
+# request cost no queries to identify the caller.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+AUTHENTICATION_BACKENDS = [
+    "apps.accounts.backends.CachedModelBackend",
+    # sessions created before the cached backend still name this one
+    "django.contrib.auth.backends.ModelBackend",
+]
+AUTH_USER_CACHE_TTL = int(os.environ.get("AUTH_USER_CACHE_TTL", 30))
+
+# Per-route latency / query metrics (config/metrics.py), scraped from
+# /api/metrics/ by staff sessions or with "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# Same SQL shape this many times in one request is reported as a probable N+1.
+METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get("METRICS_N_PLUS_ONE_THRESHOLD", 5))
+
+# Pub/sub used by the /api/realtime/stream/ SSE endpoint. The default goes
+# through the database, so events published by `run_workers` reach the web
+# processes; each process polls it once a second while it has subscribers.
+# "apps.realtime.broker.InMemoryBroker" only reaches clients connected to the
+# process that published (enough for one ASGI process with JOBS_EAGER=1).
+REALTIME_BROKER = os.environ.get("REALTIME_BROKER", "apps.realtime.broker.DatabaseBroker")
+# Published events are kept this many seconds for the pollers.
+REALTIME_EVENT_TTL = int(os.environ.get("REALTIME_EVENT_TTL", 60))
+
 # CORS settings for dev — allow frontend origin & credentials
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = [
@@ -83,4 +219,10 @@ STATIC_URL = "/static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads larger than this are spooled to a temp file instead of memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+# Limits enforced by apps.images.pipeline on post images and avatars.
+IMAGE_UPLOAD_MAX_BYTES = int(os.environ.get("IMAGE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+IMAGE_MAX_PIXELS = int(os.environ.get("IMAGE_MAX_PIXELS", 40_000_000))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
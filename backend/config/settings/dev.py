@@ -1,3 +1,8 @@
 from .base import *
 
 DEBUG = True
+
+# Stand-in replica for trying the router locally: a second connection to the
+# same SQLite file (i.e. a replica with zero lag). Enable it with
+# DATABASE_REPLICAS=replica. Tests treat it as a mirror of "default".
+DATABASES["replica"] = dict(DATABASES["default"], TEST={"MIRROR": "default"})
@@ -0,0 +1,52 @@
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *
+from .base import _cache
+
+DEBUG = False
+SECRET_KEY = os.environ["SECRET_KEY"]
+ALLOWED_HOSTS = [h for h in os.environ.get("ALLOWED_HOSTS", "").split(",") if h]
+
+
+def _postgres(host):
+    # requires psycopg; with PgBouncer in transaction mode set DB_CONN_MAX_AGE=0
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DB_NAME", "socialverse"),
+        "USER": os.environ.get("DB_USER", "socialverse"),
+        "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+        "HOST": host,
+        "PORT": os.environ.get("DB_PORT", "5432"),
+        # keep connections open across requests instead of reconnecting each time,
+        # and check them before reuse so a restarted server doesn't surface as a 500
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"connect_timeout": 5},
+    }
+
+
+# DB_REPLICA_HOSTS=replica-a,replica-b adds aliases "replica1", "replica2", ...
+DATABASES = {"default": _postgres(os.environ.get("DB_HOST", "localhost"))}
+for i, host in enumerate(h for h in os.environ.get("DB_REPLICA_HOSTS", "").split(",") if h):
+    DATABASES[f"replica{i + 1}"] = dict(_postgres(host), TEST={"MIRROR": "default"})
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Every worker process must see the same throttle buckets: a per-process
+# cache multiplies each limit by the number of processes.
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", SHARED_CACHE_BACKEND)
+CACHES["default"] = _cache(CACHE_BACKEND, "default")
+CACHES["sessions"] = _cache(os.environ.get("SESSION_CACHE_BACKEND", SHARED_CACHE_BACKEND), "sessions")
+
+# uvicorn and gunicorn read their worker count from WEB_CONCURRENCY. A
+# per-process cache with several workers would let a logged-out session
+# keep working in the other processes, so refuse to start.
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+_per_process = sorted(alias for alias, c in CACHES.items() if c["BACKEND"].endswith(".LocMemCache"))
+if _per_process and WEB_CONCURRENCY > 1:
+    raise ImproperlyConfigured(
+        f"WEB_CONCURRENCY={WEB_CONCURRENCY} with per-process (locmem) caches: {', '.join(_per_process)}. "
+        "Set REDIS_URL or use the file backend."
+    )
+
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
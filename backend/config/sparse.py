@@ -0,0 +1,165 @@
+# backend/config/sparse.py
+"""
+Sparse fieldsets for read requests.
+
+    ?fields=id,content,author.username
+        keep only these fields; a dotted name selects inside a nested object
+    ?expand=author
+        render a field listed in the serializer's ``Meta.expandable_fields``
+        (name -> (serializer class, kwargs)) with that fuller serializer;
+        expanded fields are always included
+
+Without either parameter the representation is unchanged. Unknown names are
+ignored, so clients can ask for fields a newer server will add.
+
+``narrow(queryset, serializer)`` then loads only what the pruned serializer
+reads: ``.only()`` on the columns, ``select_related`` for the nested
+objects it still renders, and just the prefetches it still needs. A
+serializer field whose source isn't a model field (a property or a method)
+must be listed in ``Meta.sparse_requires`` with the columns it reads, or
+the queryset is left as it was.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import permissions, serializers
+
+
+def parse_fields(value):
+    """"id,author.username" -> {"id": {}, "author": {"username": {}}}; {} means everything."""
+    tree = {}
+    for name in filter(None, (part.strip() for part in value.split(","))):
+        node = tree
+        for part in name.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _prune(serializer, tree):
+    inner = getattr(serializer, "child", serializer)
+    if not tree or not isinstance(inner, serializers.Serializer):
+        return
+    for name in list(inner.fields):
+        if name not in tree:
+            inner.fields.pop(name)
+        else:
+            _prune(inner.fields[name], tree[name])
+
+
+class SparseFieldsMixin:
+    """Serializer mixin reading ``fields`` / ``expand`` from the request of a safe method."""
+
+    is_sparse = False
+
+    def _sparse_params(self):
+        # only the top-level serializer (or the child of a top-level many=True) reads the query string
+        parent = self.parent
+        if parent is not None and not (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return None
+        request = self.context.get("request")
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return None
+        params = getattr(request, "query_params", request.GET)
+        fields, expand = params.get("fields"), params.get("expand")
+        if not fields and not expand:
+            return None
+        return parse_fields(fields or ""), {name.strip() for name in (expand or "").split(",")}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        params = self._sparse_params()
+        if params is None:
+            return fields
+        tree, expand = params
+        for name, (serializer_class, kwargs) in getattr(self.Meta, "expandable_fields", {}).items():
+            if name in expand:
+                fields[name] = serializer_class(read_only=True, **kwargs)
+                if tree:
+                    tree.setdefault(name, {})
+        if tree:
+            fields = {name: field for name, field in fields.items() if name in tree}
+            for name, field in fields.items():
+                _prune(field, tree[name])
+        self.is_sparse = True
+        return fields
+
+
+def _walk(model, source, prefix):
+    """(model field, lookup path, related paths on the way) for a dotted ``source``, or None."""
+    parts = source.split(".")
+    related = set()
+    for i, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        path = prefix + field.name
+        if i == len(parts) - 1:
+            return field, path, related
+        if not (field.many_to_one or field.one_to_one):
+            return None
+        related.add(path)
+        model, prefix = field.related_model, path + "__"
+
+
+def _plan(serializer, model, prefix=""):
+    """(columns, select_related paths, prefetch lookups) ``serializer`` reads, or None if unknown."""
+    serializer = getattr(serializer, "child", serializer)
+    requires = getattr(getattr(serializer, "Meta", None), "sparse_requires", {})
+    columns, related, prefetch = {prefix + model._meta.pk.name}, set(), set()
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in requires:
+            columns.update(prefix + column for column in requires[name])
+            continue
+        walked = _walk(model, field.source, prefix) if field.source != "*" else None
+        if walked is None:
+            return None
+        model_field, path, through = walked
+        related |= through
+        if model_field.many_to_many or model_field.one_to_many:
+            if through:
+                return None
+            prefetch.add(path)
+        elif model_field.is_relation:
+            related.add(path)
+            nested = getattr(field, "child", field)
+            if isinstance(nested, serializers.ModelSerializer):
+                sub = _plan(nested, model_field.related_model, path + "__")
+                if sub is None:
+                    continue  # the whole related row is loaded
+                columns.update(sub[0])
+                related.update(sub[1])
+                prefetch.update(sub[2])
+        else:
+            columns.add(path)
+    return columns, related, prefetch
+
+
+def narrow(queryset, serializer, columns=(), related=()):
+    """
+    Restrict ``queryset`` to what ``serializer`` renders, plus ``columns`` and
+    ``related`` the view itself reads (ordering keys, ETag versions).
+    """
+    serializer.fields  # evaluated lazily; decides is_sparse
+    if not getattr(serializer, "is_sparse", False):
+        return queryset
+    plan = _plan(serializer, queryset.model)
+    if plan is None:
+        return queryset
+    needed_columns, needed_related, needed_prefetch = plan
+    needed_related |= set(related)
+
+    kept = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, "prefetch_through", lookup).split("__")[0] in needed_prefetch
+    ]
+    kept_roots = {getattr(lookup, "prefetch_through", lookup).split("__")[0] for lookup in kept}
+    kept += sorted(needed_prefetch - kept_roots)
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if needed_related:
+        queryset = queryset.select_related(*sorted(needed_related))
+    if kept:
+        queryset = queryset.prefetch_related(*kept)
+    # a related object without columns of its own listed is loaded whole
+    return queryset.only(*sorted(needed_columns | needed_related | set(columns)))
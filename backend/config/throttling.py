@@ -0,0 +1,149 @@
+# backend/config/throttling.py
+"""
+Token-bucket throttles kept in the Django cache.
+
+Rates live in ``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]`` under
+"<scope>.user", "<scope>.ip" and "<scope>.username" (the username a login
+names, from one address), in DRF's "<requests>/<period>" format ("30/min").
+The bucket holds that many requests and refills evenly over the period. A
+scope without a rate for one of the keys simply isn't limited on it. Views
+pick their buckets with ``bucket_throttles(scope)``:
+
+    @action(..., throttle_classes=bucket_throttles("likes"))
+
+The bucket is stored as its "theoretical arrival time" (GCRA): the
+millisecond timestamp at which it will be full again. A check is one
+``cache.incr()`` that adds a request's worth of time. The request is
+allowed while that stays within one bucket of "now". Only the first request
+after an idle spell (the stored time is in the past) and a rejected request
+(its time is handed back) need a second cache call. On locmem and
+memcached ``incr`` is atomic, so concurrent requests can't both take the
+last token. The file cache's ``incr`` is a read and a write, so with it
+a burst can occasionally get a request past a full bucket. Use Redis
+(REDIS_URL) where that matters.
+
+The client address is REMOTE_ADDR unless ``REST_FRAMEWORK["NUM_PROXIES"]``
+says how many trusted proxies append to X-Forwarded-For. Otherwise a client
+could pick its own IP bucket by sending that header.
+
+Rejections are answered by DRF with 429 and a ``Retry-After`` header
+computed from ``wait()``.
+"""
+import hashlib
+import math
+import time
+from functools import lru_cache
+
+from django.core.cache import cache as default_cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# long enough that expiry never hands a busy client a fresh bucket; idle
+# buckets are reset by the next request anyway
+BUCKET_TTL = 24 * 3600
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """"30/min" -> (30, 60.0)."""
+    try:
+        num, period = rate.split("/")
+        return int(num), float(PERIODS[period[0]])
+    except (ValueError, KeyError, IndexError):
+        raise ImproperlyConfigured(f"Invalid throttle rate {rate!r}; use '<requests>/<s|min|hour|day>'.")
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+    kind = None  # "user" or "ip"
+    cache = default_cache
+    timer = time.time
+
+    def __init__(self):
+        self._wait = None
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f"{self.scope}.{self.kind}")
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        interval = max(int(period * 1000 / capacity), 1)  # ms per token
+        key = f"throttle:{self.scope}:{self.kind}:{ident}"
+        now = int(self.timer() * 1000)
+
+        try:
+            tat = self.cache.incr(key, interval)
+        except ValueError:  # first request, or the entry expired
+            self.cache.set(key, now + interval, BUCKET_TTL)
+            return True
+        if tat - interval < now:
+            # the bucket refilled completely while idle
+            self.cache.set(key, now + interval, BUCKET_TTL)
+            return True
+        if tat - now <= capacity * interval:
+            return True
+
+        # rejected requests don't use up tokens
+        self.cache.decr(key, interval)
+        self._wait = (tat - capacity * interval - now) / 1000
+        return False
+
+    def wait(self):
+        return None if self._wait is None else max(math.ceil(self._wait), 1)
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    """One bucket per signed-in user; anonymous requests are left to the IP bucket."""
+
+    kind = "user"
+
+    def get_ident_key(self, request):
+        user = request.user
+        return user.pk if user and user.is_authenticated else None
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    """One bucket per client address (honours NUM_PROXIES for X-Forwarded-For)."""
+
+    kind = "ip"
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class UsernameBucketThrottle(TokenBucketThrottle):
+    """
+    One bucket per username in the request body and client address. An
+    address that spends its guesses on one account can't go on guessing it,
+    and other addresses (the owner's) can still sign in to it.
+    """
+
+    kind = "username"
+
+    def get_ident_key(self, request):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        if not isinstance(username, str) or not username:
+            return None
+        # any string can arrive here; keep cache keys short and safe
+        key = f"{self.get_ident(request)}\0{username}"
+        return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def bucket_throttles(scope):
+    """The per-user, per-IP and per-username throttle classes for ``scope``."""
+    return tuple(
+        type(f"{base.__name__}[{scope}]", (base,), {"scope": scope})
+        for base in (UserBucketThrottle, IPBucketThrottle, UsernameBucketThrottle)
+    )
@@ -1,9 +1,17 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from config.metrics import metrics_view
+from config.response_cache import cache_stats
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/accounts/", include("apps.accounts.urls")),
     path("api/", include("apps.posts.urls")),  
     path("api/messaging/", include("apps.messaging.urls")),
-]
+    path("api/realtime/", include("apps.realtime.urls")),
+    path("api/cache/stats/", cache_stats, name="response-cache-stats"),
+    path("api/metrics/", metrics_view, name="metrics"),
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # DEBUG only
@@ -0,0 +1,49 @@
+// frontend/src/api/realtime.js
+// Single shared Server-Sent Events connection to /api/realtime/stream/.
+import api from "./axiosClient";
+
+let source = null;
+const listeners = {}; // event name -> Set(handler)
+const statusListeners = new Set();
+
+function emitStatus(connected) {
+  statusListeners.forEach((fn) => fn(connected));
+}
+
+function connect() {
+  if (source || typeof EventSource === "undefined") return;
+  source = new EventSource(`${api.defaults.baseURL}realtime/stream/`, { withCredentials: true });
+  source.addEventListener("ready", () => emitStatus(true));
+  source.onerror = () => emitStatus(false); // EventSource retries by itself
+  Object.keys(listeners).forEach(attach);
+}
+
+function attach(event) {
+  if (!source || listeners[event].attached) return;
+  source.addEventListener(event, (e) => {
+    const data = JSON.parse(e.data);
+    listeners[event].forEach((fn) => fn(data));
+  });
+  listeners[event].attached = true;
+}
+
+/**
+ * subscribe("notification", handler) -> unsubscribe()
+ * onStatus(handler) is called with true/false as the stream connects/drops,
+ * so callers can fall back to polling while it is down.
+ */
+export function subscribe(event, handler) {
+  if (!listeners[event]) listeners[event] = new Set();
+  listeners[event].add(handler);
+  connect();
+  attach(event);
+  return () => listeners[event].delete(handler);
+}
+
+export function onStatus(handler) {
+  statusListeners.add(handler);
+  connect();
+  return () => statusListeners.delete(handler);
+}
+
+export const isSupported = typeof EventSource !== "undefined";
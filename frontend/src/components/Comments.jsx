@@ -3,11 +3,16 @@ import api from "../api/axiosClient";
 import CommentItem from "./CommentItem";
 import CommentForm from "./CommentForm";
 
-export default function Comments({ postId, onClose, initialCount = 0, onCommentCreatedRemote }) {
-  const [comments, setComments] = useState([]);
-  const [loading, setLoading] = useState(true);
+export default function Comments({ postId, onClose, initialCount = 0, initialComments = null, onCommentCreatedRemote }) {
+  // the feed embeds the latest few comments (?expand=latest_comments); the rest load on demand
+  const [comments, setComments] = useState(initialComments ?? []);
+  const [loading, setLoading] = useState(initialComments === null);
   const [error, setError] = useState(null);
   const [refreshing, setRefreshing] = useState(false);
+  // comments come newest page first; `next` is the cursor to the page before it
+  const [nextUrl, setNextUrl] = useState(null);
+  const [paged, setPaged] = useState(false);
+  const [loadingEarlier, setLoadingEarlier] = useState(false);
 
   const fetchComments = async (showRefresh = false) => {
     if (showRefresh) {
@@ -20,6 +25,8 @@ export default function Comments({ postId, onClose, initialCount = 0, onCommentC
     try {
       const res = await api.get(`comments/?post=${postId}`);
       setComments(res.data.results ?? res.data);
+      setNextUrl(res.data.next ?? null);
+      setPaged(true);
     } catch (err) {
       console.error("fetch comments error", err);
       setError("Failed to load comments. Please try again.");
@@ -29,12 +36,31 @@ export default function Comments({ postId, onClose, initialCount = 0, onCommentC
     }
   };
 
+  // the embedded preview has no cursor: the first click loads the latest page
+  // (which contains it), later clicks follow `next` to older pages
+  const loadEarlier = async () => {
+    if (!paged) return fetchComments(true);
+    if (!nextUrl || loadingEarlier) return;
+    setLoadingEarlier(true);
+    try {
+      const res = await api.get(nextUrl);
+      setComments((c) => [...res.data.results, ...c]);
+      setNextUrl(res.data.next ?? null);
+    } catch (err) {
+      console.error("load earlier comments error", err);
+    } finally {
+      setLoadingEarlier(false);
+    }
+  };
+
+  const hasEarlier = paged ? Boolean(nextUrl) : comments.length < initialCount;
+
   useEffect(() => {
-    if (postId) fetchComments();
+    if (postId && initialComments === null) fetchComments();
   }, [postId]);
 
   const handleCreated = (newComment) => {
-    setComments((c) => [newComment, ...c]);
+    setComments((c) => [...c, newComment]);
     onCommentCreatedRemote?.();
   };
 
@@ -133,6 +159,18 @@ export default function Comments({ postId, onClose, initialCount = 0, onCommentC
               </div>
             )}
             
+            {hasEarlier && (
+              <div className="px-6 py-3 text-center">
+                <button
+                  onClick={loadEarlier}
+                  disabled={refreshing || loadingEarlier}
+                  className="text-sm font-medium text-blue-600 hover:text-blue-700"
+                >
+                  {loadingEarlier ? "Loading..." : "Load earlier comments"}
+                </button>
+              </div>
+            )}
+
             {comments.map((comment) => (
               <CommentItem 
                 key={comment.id} 
@@ -141,12 +179,14 @@ export default function Comments({ postId, onClose, initialCount = 0, onCommentC
               />
             ))}
             
-            {/* Loading more indicator */}
-            <div className="px-6 py-4 text-center">
-              <p className="text-sm text-gray-500">
-                You've reached the end of comments
-              </p>
-            </div>
+            {/* End of the thread */}
+            {!hasEarlier && (
+              <div className="px-6 py-4 text-center">
+                <p className="text-sm text-gray-500">
+                  You've reached the end of comments
+                </p>
+              </div>
+            )}
           </div>
         )}
       </div>
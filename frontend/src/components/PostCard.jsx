@@ -2,20 +2,35 @@ import React, { useState } from "react";
 import api from "../api/axiosClient";
 import Comments from "./Comments";
 
+// Feed-sized rendition (WebP with JPEG fallback); the original only until variants are ready.
+function PostImage({ post }) {
+  const v = post.image_variants?.medium;
+  if (!v) {
+    return <img src={post.image} alt="" loading="lazy" className="mt-3 rounded-xl w-full object-cover" />;
+  }
+  return (
+    <picture>
+      <source srcSet={v.webp} type="image/webp" />
+      <img src={v.jpeg} width={v.width} height={v.height} alt="" loading="lazy" className="mt-3 rounded-xl w-full h-auto object-cover" />
+    </picture>
+  );
+}
+
 export default function PostCard({ post, onAction }) {
   const [loading, setLoading] = useState(false);
   const [local, setLocal] = useState(post);
   const [showComments, setShowComments] = useState(false);
   const [animateLike, setAnimateLike] = useState(false);
 
-  // Toggle like/unlike
+  // Like/unlike: PUT and DELETE are idempotent, so repeated taps can't flip the state
   const toggleLike = async () => {
     if (!post?.id) return;
     setLoading(true);
     setAnimateLike(true);
     
     try {
-      const res = await api.post(`posts/${post.id}/like/`);
+      const url = `posts/${post.id}/like/`;
+      const res = local.is_liked ? await api.delete(url) : await api.put(url);
       setLocal((p) => ({
         ...p,
         likes_count: res.data.likes_count,
@@ -85,6 +100,7 @@ export default function PostCard({ post, onAction }) {
           <p className="text-gray-800 leading-relaxed whitespace-pre-wrap text-lg">
             {local.content}
           </p>
+          {local.image && <PostImage post={local} />}
         </div>
       </div>
 
@@ -152,6 +168,7 @@ export default function PostCard({ post, onAction }) {
           <Comments
             postId={local.id}
             initialCount={local.comments_count}
+            initialComments={local.latest_comments ?? null}
             onClose={() => setShowComments(false)}
             onCommentCreatedRemote={handleCommentCreatedRemote}
           />
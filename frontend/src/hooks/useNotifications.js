@@ -1,22 +1,36 @@
 // frontend/src/hooks/useNotifications.js
 import { useEffect, useState, useRef, useCallback } from "react";
 import api from "../api/axiosClient";
+import { subscribe, onStatus, isSupported } from "../api/realtime";
 
 /**
  * useNotifications
- * - polls /api/notifications/ periodically (default 10s)
+ * - loads /api/messaging/notifications/ once, then receives new ones over the realtime stream
+ * - unreadCount comes from the server-side counter, not the downloaded page
+ * - polls periodically (default 10s) only while the stream is unavailable, including
+ *   when it hasn't connected within connectTimeoutMs (e.g. the API isn't served over ASGI)
  * - exposes notifications array, unreadCount, refresh(), markRead(id)
  */
-export default function useNotifications({ intervalMs = 10000 } = {}) {
+export default function useNotifications({ intervalMs = 10000, connectTimeoutMs = 5000 } = {}) {
   const [notifications, setNotifications] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [unreadCount, setUnreadCount] = useState(0);
   const timerRef = useRef(null);
 
+  const fetchUnreadCount = useCallback(async () => {
+    try {
+      const res = await api.get("messaging/notifications/unread_count/");
+      setUnreadCount(res.data.unread_count);
+    } catch (err) {
+      // keep the last known count
+    }
+  }, []);
+
   const fetchNotifications = useCallback(async () => {
     try {
       setLoading(true);
-      const res = await api.get("notifications/");
+      const [res] = await Promise.all([api.get("messaging/notifications/"), fetchUnreadCount()]);
       // API returns array or paginated {results: []}
       const data = res.data.results ?? res.data;
       setNotifications(data);
@@ -27,31 +41,61 @@ export default function useNotifications({ intervalMs = 10000 } = {}) {
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [fetchUnreadCount]);
 
   useEffect(() => {
     fetchNotifications();
 
-    // set up polling
-    timerRef.current = setInterval(() => {
-      fetchNotifications();
-    }, intervalMs);
+    const startPolling = () => {
+      if (timerRef.current) return;
+      timerRef.current = setInterval(() => {
+        fetchNotifications();
+      }, intervalMs);
+    };
+    const stopPolling = () => {
+      if (timerRef.current) clearInterval(timerRef.current);
+      timerRef.current = null;
+    };
+
+    if (!isSupported) {
+      startPolling();
+      return stopPolling;
+    }
+
+    // coalesced notifications come back with the same id, so replace in place
+    const unsubscribe = subscribe("notification", (n) => {
+      setNotifications((prev) => [n, ...prev.filter((p) => p.id !== n.id)]);
+      fetchUnreadCount();
+    });
+    // poll until the stream says "ready"; a stream that never answers counts as down
+    const connectTimer = setTimeout(startPolling, connectTimeoutMs);
+    const unwatch = onStatus((connected) => {
+      clearTimeout(connectTimer);
+      if (connected) {
+        stopPolling();
+        fetchNotifications(); // catch up on anything missed while disconnected
+      } else {
+        startPolling();
+      }
+    });
 
     return () => {
-      if (timerRef.current) clearInterval(timerRef.current);
+      clearTimeout(connectTimer);
+      unsubscribe();
+      unwatch();
+      stopPolling();
     };
-  }, [fetchNotifications, intervalMs]);
+  }, [fetchNotifications, fetchUnreadCount, intervalMs, connectTimeoutMs]);
 
   const refresh = useCallback(() => fetchNotifications(), [fetchNotifications]);
 
-  const unreadCount = notifications.filter((n) => !n.read).length;
-
   const markRead = useCallback(
     async (id) => {
       try {
-        await api.post(`notifications/${id}/mark_read/`);
+        await api.post(`messaging/notifications/${id}/mark_read/`);
         // Optimistically update local state
         setNotifications((prev) => prev.map((n) => (n.id === id ? { ...n, read: true } : n)));
+        setUnreadCount((c) => Math.max(c - 1, 0));
       } catch (err) {
         console.error("Failed to mark notification as read", err);
       }
@@ -60,17 +104,16 @@ export default function useNotifications({ intervalMs = 10000 } = {}) {
   );
 
   const markAllRead = useCallback(async () => {
-    // mark unread ones locally and attempt backend calls (fire-and-forget)
-    const unread = notifications.filter((n) => !n.read);
+    // one UPDATE on the server; mirror it locally
     setNotifications((prev) => prev.map((n) => ({ ...n, read: true })));
+    setUnreadCount(0);
     try {
-      await Promise.all(
-        unread.map((n) => api.post(`notifications/${n.id}/mark_read/`).catch((e) => console.error(e)))
-      );
+      await api.post("messaging/notifications/mark_all_read/");
     } catch (e) {
-      // already handled per-item
+      console.error("Failed to mark all notifications as read", e);
+      fetchUnreadCount();
     }
-  }, [notifications]);
+  }, [fetchUnreadCount]);
 
   return {
     notifications,
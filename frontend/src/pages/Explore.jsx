@@ -7,21 +7,22 @@ export default function Explore() {
   const [q, setQ] = useState("");
   const [loading, setLoading] = useState(true);
   const [sort, setSort] = useState("newest"); // newest | popular
+  const [nextUrl, setNextUrl] = useState(null);
 
-  const fetchPosts = async () => {
-    setLoading(true);
+  const fetchPosts = async (url = null) => {
+    const append = url !== null;
+    const term = q.trim();
+    // searches hit the server-side full-text index and come back ranked by relevance
+    if (!append) url = term ? `posts/search/?q=${encodeURIComponent(term)}&expand=latest_comments` : "posts/?expand=latest_comments";
+    if (!append) setLoading(true);
     try {
-      const res = await api.get("posts/");
+      const res = await api.get(url);
+      setNextUrl(res.data.next ?? null);
       let data = res.data.results ?? res.data;
+      if (append) data = [...posts, ...data];
       // client-side sort for now
-      if (sort === "popular") {
+      if (!term && sort === "popular") {
         data = [...data].sort((a,b) => (b.likes_count||0) - (a.likes_count||0));
-      } else {
-        data = [...data].sort((a,b) => new Date(b.created_at) - new Date(a.created_at));
-      }
-      if (q.trim()) {
-        const term = q.toLowerCase();
-        data = data.filter(p => (p.content || "").toLowerCase().includes(term) || (p.author?.username||"").toLowerCase().includes(term));
       }
       setPosts(data);
     } catch (err) {
@@ -41,14 +42,15 @@ export default function Explore() {
         <input
           value={q}
           onChange={e => setQ(e.target.value)}
-          placeholder="Search posts, users..."
+          onKeyDown={e => e.key === "Enter" && fetchPosts()}
+          placeholder="Search posts..."
           className="flex-1 p-3 border rounded"
         />
         <select value={sort} onChange={e=>setSort(e.target.value)} className="p-2 border rounded">
           <option value="newest">Newest</option>
           <option value="popular">Most liked</option>
         </select>
-        <button onClick={fetchPosts} className="px-3 py-2 bg-blue-600 text-white rounded">Search</button>
+        <button onClick={() => fetchPosts()} className="px-3 py-2 bg-blue-600 text-white rounded">Search</button>
       </div>
 
       {loading ? (
@@ -57,7 +59,13 @@ export default function Explore() {
         <div className="py-10 text-center text-slate-500">No results</div>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
-          {posts.map(p => <PostCard key={p.id} post={p} onAction={fetchPosts} />)}
+          {posts.map(p => <PostCard key={p.id} post={p} onAction={() => fetchPosts()} />)}
+        </div>
+      )}
+
+      {!loading && nextUrl && (
+        <div className="py-6 text-center">
+          <button onClick={() => fetchPosts(nextUrl)} className="px-4 py-2 border rounded">Load more</button>
         </div>
       )}
     </div>
@@ -6,6 +6,8 @@ export default function Feed() {
   const [posts, setPosts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchPosts = async (showRefreshing = false) => {
     if (showRefreshing) {
@@ -15,8 +17,15 @@ export default function Feed() {
     }
     
     try {
-      const res = await api.get("posts/");
+      // home timeline: own posts + people you follow
+      // the latest comments of every post come with the page instead of one request per card
+      let res = await api.get("feed/?expand=latest_comments");
+      if ((res.data.results ?? res.data).length === 0) {
+        // follows nobody yet: show everyone's posts so there is someone to follow
+        res = await api.get("posts/?expand=latest_comments");
+      }
       setPosts(res.data.results ?? res.data);
+      setNextUrl(res.data.next ?? null);
     } catch (e) {
       console.error("Failed to fetch posts", e);
     } finally {
@@ -25,6 +34,21 @@ export default function Feed() {
     }
   };
 
+  // follow the opaque cursor returned by the API
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const res = await api.get(nextUrl);
+      setPosts((p) => [...p, ...res.data.results]);
+      setNextUrl(res.data.next);
+    } catch (e) {
+      console.error("Failed to load more posts", e);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchPosts();
   }, []);
@@ -106,6 +130,17 @@ export default function Feed() {
           {posts.map((post) => (
             <PostCard key={post.id} post={post} onAction={onRefresh} />
           ))}
+          {nextUrl && (
+            <div className="text-center">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="bg-white border border-gray-300 px-6 py-2 rounded-full text-sm font-medium hover:bg-gray-50 transition-colors duration-200 disabled:opacity-50"
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import api from "../api/axiosClient";
+import { subscribe } from "../api/realtime";
 
 function ConversationItem({ conv, onOpen }) {
   return (
@@ -9,7 +10,12 @@ function ConversationItem({ conv, onOpen }) {
         <div className="font-medium">{conv.other}</div>
         <div className="text-xs text-slate-500 truncate">{conv.lastMessage}</div>
       </div>
-      <div className="text-xs text-slate-400">{new Date(conv.updated_at).toLocaleTimeString()}</div>
+      <div className="flex flex-col items-end gap-1">
+        <div className="text-xs text-slate-400">{new Date(conv.updated_at).toLocaleTimeString()}</div>
+        {conv.unread_count > 0 && (
+          <span className="px-2 py-0.5 rounded-full bg-blue-600 text-white text-xs font-semibold">{conv.unread_count}</span>
+        )}
+      </div>
     </div>
   );
 }
@@ -23,7 +29,7 @@ export default function Messages() {
   // load convos — try API or fallback to mock
   const fetchConversations = async () => {
     try {
-      const res = await api.get("conversations/").catch(()=>null);
+      const res = await api.get("messaging/conversations/").catch(()=>null);
       if (res && res.data) {
         setConversations(res.data.results ?? res.data);
       } else {
@@ -42,9 +48,13 @@ export default function Messages() {
     setActive(conv);
     // try backend
     try {
-      const res = await api.get(`conversations/${conv.id}/messages/`).catch(()=>null);
+      const res = await api.get(`messaging/conversations/${conv.id}/messages/`).catch(()=>null);
       if (res && res.data) {
         setMessages(res.data.results ?? res.data);
+        // one watermark update server-side, however long the thread
+        api.post(`messaging/conversations/${conv.id}/read/`)
+          .then(() => setConversations(prev => prev.map(c => (c.id === conv.id ? { ...c, unread_count: 0 } : c))))
+          .catch(()=>null);
       } else {
         // mock messages
         setMessages([
@@ -59,9 +69,9 @@ export default function Messages() {
 
   const sendMessage = async () => {
     if (!text.trim() || !active) return;
-    const payload = { text, conversation: active.id };
+    const payload = { text };
     try {
-      const res = await api.post("messages/", payload).catch(()=>null);
+      const res = await api.post(`messaging/conversations/${active.id}/messages/send/`, payload).catch(()=>null);
       if (res && res.data) {
         setMessages(prev => [...prev, res.data]);
       } else {
@@ -75,6 +85,15 @@ export default function Messages() {
 
   useEffect(()=>{ fetchConversations(); }, []);
 
+  // live messages for the open conversation instead of re-fetching the thread
+  useEffect(() => {
+    if (!active) return;
+    return subscribe("message", (m) => {
+      if (m.conversation !== active.id) return;
+      setMessages(prev => (prev.some(p => p.id === m.id) ? prev : [...prev, m]));
+    });
+  }, [active]);
+
   return (
     <div className="max-w-6xl mx-auto grid grid-cols-1 md:grid-cols-3 gap-4">
       <div className="col-span-1 bg-white rounded shadow p-3">
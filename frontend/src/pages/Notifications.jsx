@@ -5,13 +5,13 @@ export default function Notifications() {
   const [items, setItems] = useState([]);
   const [loading, setLoading] = useState(true);
 
-  // If you add backend, swap fetch to GET /notifications/
+  // GET /api/messaging/notifications/
   const fetchNotifications = async () => {
     setLoading(true);
     try {
       // mock fallback: generate from recent posts liked/comments (if no backend)
       // try API, otherwise fallback to empty
-      const res = await api.get("notifications/").catch(()=>null);
+      const res = await api.get("messaging/notifications/").catch(()=>null);
       if (res && res.data) {
         setItems(res.data.results ?? res.data);
       } else {
@@ -31,7 +31,7 @@ export default function Notifications() {
 
   const markRead = async (id) => {
     try {
-      await api.post(`notifications/${id}/mark-read/`).catch(()=>null);
+      await api.post(`messaging/notifications/${id}/mark_read/`).catch(()=>null);
       setItems(prev => prev.map(x => x.id === id ? {...x, read: true} : x));
     } catch (err) {
       console.error("mark read", err);
@@ -6,6 +6,9 @@ export default function ProfilePage({ me, onLogout }) {
   const { username } = useParams();
   const [profile, setProfile] = useState(null);
   const [loading, setLoading] = useState(true);
+  // whether we follow them; null until known (or when signed out)
+  const [following, setFollowing] = useState(null);
+  const [followBusy, setFollowBusy] = useState(false);
   const isOwnProfile = !username || (me && me.username === username);
 
   useEffect(() => {
@@ -24,6 +27,32 @@ export default function ProfilePage({ me, onLogout }) {
     load();
   }, [username]);
 
+  useEffect(() => {
+    setFollowing(null);
+    if (isOwnProfile || !me) return;
+    api.get(`accounts/follow/${username}/`)
+      .then((res) => setFollowing(res.data.following))
+      .catch(() => setFollowing(null));
+  }, [username, me]);
+
+  const toggleFollow = async () => {
+    if (followBusy || following === null) return;
+    setFollowBusy(true);
+    try {
+      const url = `accounts/follow/${username}/`;
+      const res = following ? await api.delete(url) : await api.post(url);
+      const now = res.data.following;
+      if (now !== following) {
+        setProfile((p) => ({ ...p, followers_count: Math.max((p.followers_count ?? 0) + (now ? 1 : -1), 0) }));
+      }
+      setFollowing(now);
+    } catch (err) {
+      console.error("follow error", err);
+    } finally {
+      setFollowBusy(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="max-w-4xl mx-auto px-4 py-8">
@@ -79,7 +108,7 @@ export default function ProfilePage({ me, onLogout }) {
                 <div className="relative">
                   {profile.avatar ? (
                     <img 
-                      src={profile.avatar} 
+                      src={profile.avatar_variants?.thumb?.webp ?? profile.avatar} 
                       alt="avatar" 
                       className="w-32 h-32 rounded-full border-4 border-white shadow-lg object-cover"
                     />
@@ -134,11 +163,11 @@ export default function ProfilePage({ me, onLogout }) {
                   <div className="text-sm text-gray-600">Posts</div>
                 </div>
                 <div className="text-center p-4 bg-purple-50 rounded-lg">
-                  <div className="text-2xl font-bold text-purple-600">0</div>
+                  <div className="text-2xl font-bold text-purple-600">{profile.followers_count ?? 0}</div>
                   <div className="text-sm text-gray-600">Followers</div>
                 </div>
                 <div className="text-center p-4 bg-green-50 rounded-lg">
-                  <div className="text-2xl font-bold text-green-600">0</div>
+                  <div className="text-2xl font-bold text-green-600">{profile.following_count ?? 0}</div>
                   <div className="text-sm text-gray-600">Following</div>
                 </div>
               </div>
@@ -222,8 +251,14 @@ export default function ProfilePage({ me, onLogout }) {
 
               {/* Action Buttons for other users */}
               <div className="mt-6 space-y-3">
-                <button className="w-full bg-gradient-to-r from-blue-500 to-purple-600 text-white py-2 rounded-lg font-semibold hover:shadow-lg transition-all duration-200">
-                  Follow
+                <button
+                  onClick={toggleFollow}
+                  disabled={followBusy || following === null}
+                  className={following
+                    ? "w-full border border-gray-300 text-gray-700 py-2 rounded-lg font-semibold hover:bg-gray-50 transition-all duration-200"
+                    : "w-full bg-gradient-to-r from-blue-500 to-purple-600 text-white py-2 rounded-lg font-semibold hover:shadow-lg transition-all duration-200"}
+                >
+                  {following ? "Following" : "Follow"}
                 </button>
                 
                 <button className="w-full flex items-center justify-center space-x-2 border border-gray-300 text-gray-700 py-2 rounded-lg font-semibold hover:bg-gray-50 transition-all duration-200">